@@ -0,0 +1,234 @@
+"""
+GoFood Cluster Worker — eksekutor job dari `coordinator.py`
+===========================================================
+Worker me-lease job dari coordinator lewat HTTP/JSON, menjalankan step
+pipeline yang sesuai dengan satu browser, lalu meng-upload hasilnya:
+
+  - area job    → step 1 (session) + step 2 (discovery) → POST /result/area
+  - outlet job  → step 3 untuk batch outlet             → POST /result/outlets
+
+Thread heartbeat mengirim POST /heartbeat setiap `--heartbeat` detik selama
+worker hidup, sehingga lease tetap diperpanjang walau discovery berjalan lama.
+Tiap worker punya storage state sendiri (`output/session/workers/`).
+
+Usage:
+  python3 cluster_worker.py --coordinator http://127.0.0.1:8765
+  python3 cluster_worker.py --coordinator http://10.0.0.5:8765 --worker-id node2-a --headful
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from developer_test_scrapping import (
+    BROWSER_ARGS,
+    OUTPUT_DIR,
+    add_base_url_args,
+    add_cache_args,
+    ensure_session,
+    open_cache,
+    step2_outlet_discovery,
+    step3_batch_menu,
+    sync_playwright,
+)
+from discovery_checkpoint import add_checkpoint_args, open_checkpoint
+from metrics import add_metrics_args, open_metrics
+from rate_control import RateController
+from retry_engine import add_retry_args, open_retry
+from session_check import add_session_args, open_session_guard
+from work_queue import default_worker_id
+
+# ── Defaults ────────────────────────────────────────────────────────
+DEFAULT_HEARTBEAT_SECONDS = 15.0
+DEFAULT_IDLE_SECONDS = 10.0
+WORKER_SESSION_DIR = OUTPUT_DIR / "session" / "workers"
+
+
+class CoordinatorClient:
+    """Client JSON minimal (urllib) untuk endpoint coordinator."""
+
+    def __init__(self, base_url: str, worker_id: str, timeout: float = 60.0):
+        self.base_url = base_url.rstrip("/")
+        self.worker_id = worker_id
+        self.timeout = timeout
+
+    def post(self, path: str, **body) -> dict:
+        data = json.dumps({"worker": self.worker_id, **body}, ensure_ascii=False).encode("utf-8")
+        req = urllib.request.Request(
+            self.base_url + path, data=data, method="POST",
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            return json.loads(resp.read())
+
+    def post_retry(self, path: str, attempts: int = 5, **body) -> dict:
+        """POST dengan retry — hasil scraping tidak boleh hilang karena network blip."""
+        for attempt in range(1, attempts + 1):
+            try:
+                return self.post(path, **body)
+            except (urllib.error.URLError, OSError) as exc:
+                if attempt == attempts:
+                    raise
+                wait = min(60.0, 2 ** attempt)
+                print(f"  [WARN] {path} gagal ({exc}), retry {wait:.0f}s...")
+                time.sleep(wait)
+        return {}
+
+
+def _heartbeat_loop(client: CoordinatorClient, interval: float, stop: threading.Event) -> None:
+    while not stop.wait(interval):
+        try:
+            client.post("/heartbeat")
+        except (urllib.error.URLError, OSError) as exc:
+            print(f"  [WARN] Heartbeat gagal: {exc}")
+
+
+def run_area_job(
+    browser, job: dict, storage_state, args, cache, session_guard=None, metrics=None,
+) -> dict:
+    """Step 1 + step 2 untuk satu area. Return body upload /result/area."""
+    area, city = job["area"], job["city"]
+    listing_url = f"{args.base_url.rstrip('/')}/{city}/{area}"
+
+    ok, _ = ensure_session(browser, listing_url, storage_state, args.wait_ms, session_guard)
+    if not ok:
+        return {"area": area, "error": "session bootstrap gagal"}
+
+    outlets = step2_outlet_discovery(
+        browser=browser,
+        nearme_url=f"{listing_url}/near-me/",
+        service_area=city,
+        storage_state=storage_state,
+        max_scrolls=args.max_scrolls,
+        patience=args.patience,
+        scroll_delay=random.uniform(2.0, 4.0),
+        wait_ms=args.wait_ms,
+        cache=cache,
+        namespace=area,
+        checkpoint=open_checkpoint(args, area),
+        metrics=metrics,
+    )
+    return {"area": area, "outlets": outlets}
+
+
+def run_outlet_job(
+    browser, job: dict, storage_state, args, cache, rate=None, retry=None, breaker=None,
+    metrics=None,
+) -> dict:
+    """Step 3 untuk satu batch outlet. Return body upload /result/outlets."""
+    outlets = job["outlets"]
+    records = step3_batch_menu(
+        browser=browser,
+        outlets=outlets,
+        storage_state=storage_state,
+        limit=len(outlets),
+        wait_ms=args.wait_ms,
+        delay_min=args.delay_min,
+        delay_max=args.delay_max,
+        cache=cache,
+        namespace=job["area"],
+        rate=rate,
+        retry=retry,
+        breaker=breaker,
+        metrics=metrics,
+    )
+    # step3 tanpa queue mengembalikan satu record per target, urut sama
+    return {
+        "area": job["area"],
+        "results": [{"uid": o.get("uid"), "record": r} for o, r in zip(outlets, records)],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Worker scraping GoFood untuk coordinator.py.")
+    parser.add_argument("--coordinator", default="http://127.0.0.1:8765",
+                        help="Base URL coordinator (default: http://127.0.0.1:8765).")
+    parser.add_argument("--worker-id", default=None,
+                        help="ID unik worker (default: hostname:pid).")
+    parser.add_argument("--heartbeat", type=float, default=DEFAULT_HEARTBEAT_SECONDS,
+                        help=f"Interval heartbeat detik (default: {DEFAULT_HEARTBEAT_SECONDS:.0f}).")
+    parser.add_argument("--idle", type=float, default=DEFAULT_IDLE_SECONDS,
+                        help="Jeda saat belum ada job tapi run belum selesai (detik).")
+    parser.add_argument("--max-scrolls", type=int, default=500,
+                        help="Batas scroll saat outlet discovery (default: 500).")
+    parser.add_argument("--patience", type=int, default=8,
+                        help="Scroll tanpa data baru sebelum stop (default: 8).")
+    parser.add_argument("--wait-ms", type=int, default=8000,
+                        help="Extra wait setelah page load, ms (default: 8000).")
+    parser.add_argument("--delay-min", type=float, default=4.0,
+                        help="Batas bawah jeda adaptif antar outlet (detik).")
+    parser.add_argument("--delay-max", type=float, default=10.0,
+                        help="Batas atas jeda adaptif antar outlet (detik).")
+    parser.add_argument("--headful", action="store_true",
+                        help="Jalankan browser non-headless (visual).")
+    add_base_url_args(parser)
+    add_cache_args(parser)
+    add_retry_args(parser)
+    add_session_args(parser)
+    add_checkpoint_args(parser)
+    add_metrics_args(parser)
+    args = parser.parse_args()
+
+    worker_id = args.worker_id or default_worker_id()
+    client = CoordinatorClient(args.coordinator, worker_id)
+    storage_state = WORKER_SESSION_DIR / f"gofood_storage_state_{re.sub(r'[^A-Za-z0-9_.-]', '_', worker_id)}.json"
+    storage_state.parent.mkdir(parents=True, exist_ok=True)
+    cache = open_cache(args)
+
+    print(f"[INFO] Worker {worker_id} → {args.coordinator}")
+    stop = threading.Event()
+    beat = threading.Thread(
+        target=_heartbeat_loop, args=(client, args.heartbeat, stop), daemon=True,
+    )
+    beat.start()
+
+    jobs_done = 0
+    rate = RateController(args.delay_min, args.delay_max, name="step3")
+    retry, breaker = open_retry(args)
+    session_guard = open_session_guard(args)
+    metrics = open_metrics(args)
+    try:
+        with sync_playwright() as pw:
+            browser = pw.chromium.launch(headless=not args.headful, args=BROWSER_ARGS)
+            while True:
+                reply = client.post_retry("/lease")
+                job = reply.get("job")
+                if job is None:
+                    if reply.get("done"):
+                        print("[DONE] Coordinator: semua job selesai.")
+                        break
+                    time.sleep(args.idle)
+                    continue
+
+                if job["type"] == "area":
+                    print(f"\n[JOB] Area {job['area']}")
+                    body = run_area_job(browser, job, storage_state, args, cache, session_guard, metrics)
+                    client.post_retry("/result/area", **body)
+                else:
+                    print(f"\n[JOB] {len(job['outlets'])} outlet di {job['area']}")
+                    body = run_outlet_job(
+                        browser, job, storage_state, args, cache, rate, retry, breaker, metrics,
+                    )
+                    client.post_retry("/result/outlets", **body)
+                jobs_done += 1
+            browser.close()
+    finally:
+        stop.set()
+        if cache is not None:
+            cache.close()
+        if metrics is not None:
+            metrics.close()
+
+    s = session_guard.summary()
+    print(f"[INFO] Worker {worker_id} selesai, {jobs_done} job. Bootstrap dihindari: "
+          f"{s['bootstraps_avoided']} (~{s['time_saved_s']:.0f}s).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,382 @@
+"""
+GoFood Scrape Coordinator — pembagi job lintas mesin (HTTP/JSON)
+================================================================
+Proses ringan yang membagikan job ke worker (`cluster_worker.py`) dan
+menyimpan hasilnya. Semua state ada di satu database antrian SQLite milik
+coordinator, jadi worker tidak perlu berbagi folder `output/`.
+
+Alur:
+  1. Coordinator meng-enqueue satu *area job* per locality.
+  2. Worker me-lease area job → step 1 + step 2 → upload daftar outlet.
+  3. Coordinator meng-enqueue outlet (maks `--limit`) sebagai *outlet job*.
+  4. Worker me-lease batch outlet → step 3 → upload record menu.
+  5. Saat semua outlet area selesai, coordinator menulis output area
+     (format sama dengan `scrap_sby.py`).
+
+Worker mengirim heartbeat berkala; heartbeat memperpanjang semua lease
+miliknya. Worker yang tidak mengirim heartbeat lebih dari `--heartbeat-timeout`
+dianggap mati dan lease-nya dikembalikan ke pending.
+
+Endpoint (semua JSON):
+  POST /heartbeat        {"worker"}                          → {"ok", "leases"}
+  POST /lease            {"worker"}                          → {"job": {...} | null, "done"}
+  POST /result/area      {"worker", "area", "outlets"|"error"} → {"ok", "queued", "ignored"|"state"}
+  POST /result/outlets   {"worker", "area", "results"}       → {"ok", "settled"}
+  GET  /status                                               → ringkasan antrian & worker
+
+Usage (satu mesin, beberapa worker):
+  python3 coordinator.py --port 8765 --limit 20 --exit-when-done
+  python3 cluster_worker.py --coordinator http://127.0.0.1:8765   # jalankan N kali
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+from gofood_core import OUTPUT_DIR, add_output_format_args, save_outputs
+from scheduler import add_schedule_args, schedule_outlets
+from scrap_sby import CITY, LIST_AREA, WIB
+from work_queue import OutletQueue
+
+# ── Defaults ────────────────────────────────────────────────────────
+DEFAULT_COORDINATOR_DB = Path("output/session/gofood_coordinator.sqlite")
+DEFAULT_PORT = 8765
+DEFAULT_HEARTBEAT_TIMEOUT = 60.0
+DEFAULT_LEASE_SECONDS = 900  # fallback jika heartbeat tidak pernah datang
+DEFAULT_BATCH_SIZE = 5
+
+AREA_NAMESPACE = "__areas__"
+
+
+class Coordinator:
+    """State coordinator: antrian area/outlet, heartbeat worker, finalisasi area."""
+
+    def __init__(
+        self, queue: OutletQueue, city: str, areas: list[str], limit: int,
+        batch_size: int, heartbeat_timeout: float,
+        fmt: str = "json", compression: str = "none", compact: bool = False,
+        schedule_args=None,
+    ):
+        self.queue = queue
+        self.city = city
+        self.areas = areas
+        self.limit = limit
+        self.batch_size = batch_size
+        self.heartbeat_timeout = heartbeat_timeout
+        self.fmt = fmt
+        self.compression = compression
+        self.compact = compact
+        self.schedule_args = schedule_args
+        self.workers: dict[str, float] = {}  # worker → last heartbeat (monotonic)
+
+        added = queue.enqueue(AREA_NAMESPACE, [{"uid": a, "area": a, "city": city} for a in areas])
+        print(f"[INFO] {added} area job baru, {len(areas)} area total.")
+        self._recover()
+
+    def _recover(self) -> None:
+        """Restart setelah crash: selesaikan area yang discovery-nya sudah masuk tapi belum final.
+
+        Area "done" tanpa outlet job (DB lama / crash sebelum enqueue) di-enqueue
+        ulang dari `outlets` tersimpan; area yang job-nya sudah selesai semua
+        (mis. crash di dalam `save_outputs`) langsung difinalisasi.
+        """
+        for area in self.areas:
+            state = self._area_state(area)
+            if not state or state.get("status") == "error" or state.get("finalized"):
+                continue
+            outlets = state.get("outlets", [])
+            if outlets and not any(self.queue.counts(area).values()):
+                queued = self.queue.enqueue(area, self._targets(area, outlets))
+                print(f"[RECOVER] {area}: {queued} outlet job di-enqueue ulang dari discovery tersimpan.")
+            self._maybe_finalize(area)
+
+    # ── Worker liveness ────────────────────────────────────────────
+
+    def heartbeat(self, worker: str) -> int:
+        self.workers[worker] = time.monotonic()
+        return self.queue.touch(worker)
+
+    def reap(self) -> None:
+        """Kembalikan lease worker yang heartbeat-nya sudah lewat batas."""
+        now = time.monotonic()
+        for worker, seen in list(self.workers.items()):
+            if now - seen <= self.heartbeat_timeout:
+                continue
+            n = self.queue.release(worker)
+            del self.workers[worker]
+            print(f"[WARN] Worker {worker} tidak aktif {now - seen:.0f}s — {n} lease di-requeue.")
+
+    # ── Job dispatch ───────────────────────────────────────────────
+
+    def lease(self, worker: str) -> dict | None:
+        """Outlet job didahulukan (area sudah setengah jalan), lalu area job baru."""
+        self.heartbeat(worker)
+        for area in self.areas:
+            outlets = []
+            while len(outlets) < self.batch_size:
+                outlet = self.queue.lease(area, owner=worker)
+                if outlet is None:
+                    break
+                outlets.append(outlet)
+            if outlets:
+                return {"type": "outlets", "area": area, "city": self.city, "outlets": outlets}
+        job = self.queue.lease(AREA_NAMESPACE, owner=worker)
+        if job is not None:
+            return {"type": "area", "area": job["area"], "city": job["city"]}
+        return None
+
+    def done(self) -> bool:
+        """True jika semua area sudah ditulis outputnya atau gagal permanen."""
+        if self.queue.has_open(AREA_NAMESPACE):
+            return False
+        for area in self.areas:
+            state = self._area_state(area)
+            if not (state.get("finalized") or state.get("status") == "error"):
+                return False
+        return True
+
+    def leave(self, worker: str) -> None:
+        """Worker berhenti dengan normal (tidak ada job lagi)."""
+        self.workers.pop(worker, None)
+
+    def _area_state(self, area: str) -> dict:
+        return self.queue.result(AREA_NAMESPACE, area) or {}
+
+    # ── Results ────────────────────────────────────────────────────
+
+    def area_failed(self, worker: str, area: str, error: str) -> str:
+        """Discovery gagal (mis. session bootstrap). Area dicoba lagi sampai max_attempts."""
+        state = self.queue.settle(AREA_NAMESPACE, area, {
+            "area": area, "status": "error", "error": error, "worker": worker,
+        }, owner=worker)
+        if state is None:
+            print(f"[WARN] {area}: laporan gagal dari {worker} diabaikan (lease area bukan miliknya lagi).")
+            return "stale"
+        print(f"[WARN] {area}: discovery gagal di {worker} ({error}) → {state}.")
+        return state
+
+    def area_result(self, worker: str, area: str, outlets: list[dict]) -> int | None:
+        """Daftar outlet hasil discovery. Return jumlah outlet job baru, None jika diabaikan.
+
+        Hasil terlambat/duplikat (area sudah difinalisasi, atau lease area sudah
+        di-requeue ke worker lain setelah heartbeat timeout) diabaikan supaya
+        area tidak di-scrape dua kali dan outputnya tidak ditimpa.
+        """
+        if self._area_state(area).get("finalized"):
+            print(f"[WARN] {area}: hasil discovery dari {worker} diabaikan (area sudah selesai).")
+            return None
+        # Area job selesai + outlet job masuk dalam satu transaksi; hanya pemegang lease area
+        queued = self.queue.complete_and_enqueue(AREA_NAMESPACE, area, {
+            "area": area, "outlets": outlets, "worker": worker, "finalized": False,
+            "discovered_at": datetime.now(WIB).isoformat(),
+        }, area, self._targets(area, outlets), owner=worker)
+        if queued is None:
+            print(f"[WARN] {area}: hasil discovery dari {worker} diabaikan (lease area bukan miliknya lagi).")
+            return None
+        print(f"[INFO] {area}: {len(outlets)} outlet dari {worker}, {queued} di-enqueue.")
+        self._maybe_finalize(area)
+        return queued
+
+    def _targets(self, area: str, outlets: list[dict]) -> list[dict]:
+        """Outlet job untuk area: urutan scheduler (opsional) lalu dipotong `limit`."""
+        targets = outlets
+        if self.schedule_args is not None:
+            menus_json = OUTPUT_DIR / "json" / f"gofood_{area}_menus.json"
+            targets = schedule_outlets(outlets, self.schedule_args, menus_json, None, area)
+        # Posisi enqueue = urutan lease, jadi urutan prioritas terjaga
+        return targets[:self.limit] if self.limit > 0 else targets
+
+    def outlet_results(self, worker: str, area: str, results: list[dict]) -> int:
+        """`results` berisi {"uid", "record"} — uid job, bukan uid dari payload profil."""
+        settled = 0
+        for item in results:
+            uid, record = item.get("uid"), item.get("record")
+            if not uid or not isinstance(record, dict):
+                continue
+            # Worker sudah menjalankan RetryPolicy; re-lease hanya untuk worker yang mati
+            state = self.queue.settle(area, uid, record, owner=worker, permanent=True)
+            if state is not None:
+                settled += 1
+        c = self.queue.counts(area)
+        print(f"[INFO] {area}: +{settled} record dari {worker} | "
+              f"done={c['done']} failed={c['failed']} open={c['pending'] + c['leased']}")
+        self._maybe_finalize(area)
+        return settled
+
+    def _maybe_finalize(self, area: str) -> None:
+        """Tulis output area begitu discovery selesai dan tidak ada outlet terbuka."""
+        state = self._area_state(area)
+        if not state or state.get("status") == "error" or state.get("finalized"):
+            return
+        if self.queue.has_open(area):
+            return
+        outlets = state.get("outlets", [])
+        menu_results = self.queue.results(area)
+        if outlets:
+            save_outputs(
+                outlets, menu_results,
+                OUTPUT_DIR / "json" / f"gofood_{area}_outlets.json",
+                OUTPUT_DIR / "json" / f"gofood_{area}_menus.json",
+                OUTPUT_DIR / "csv" / f"gofood_{area}_menus.csv",
+                fmt=self.fmt, compression=self.compression, compact=self.compact,
+            )
+        state.update({
+            "finalized": True,
+            "finished_at": datetime.now(WIB).isoformat(),
+            "outlets_found": len(outlets),
+            "outlets_scraped": len(menu_results),
+            "success": sum(1 for r in menu_results if r.get("status") == "success"),
+            "errors": sum(1 for r in menu_results if r.get("status") == "error"),
+        })
+        self.queue.update_result(AREA_NAMESPACE, area, state)
+        self.queue.clear(area)
+        print(f"[DONE] {area}: output disimpan ({len(menu_results)} record).")
+
+    def status(self) -> dict:
+        now = time.monotonic()
+        areas = {}
+        for area in self.areas:
+            state = self._area_state(area)
+            areas[area] = {
+                "discovered": bool(state),
+                "finalized": bool(state.get("finalized")),
+                "outlets": self.queue.counts(area),
+            }
+        return {
+            "done": self.done(),
+            "area_jobs": self.queue.counts(AREA_NAMESPACE),
+            "areas": areas,
+            "workers": {w: round(now - seen, 1) for w, seen in self.workers.items()},
+        }
+
+
+# ── HTTP ───────────────────────────────────────────────────────────
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "GoFoodCoordinator/1.0"
+
+    @property
+    def coord(self) -> Coordinator:
+        return self.server.coordinator
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/status":
+            self._send(200, self.coord.status())
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            worker = body["worker"]
+            if self.path.startswith("/result/"):
+                area = body["area"]
+        except (ValueError, KeyError, TypeError):
+            fields = "'worker' dan 'area'" if self.path.startswith("/result/") else "'worker'"
+            self._send(400, {"error": f"body JSON dengan field {fields} wajib"})
+            return
+
+        if self.path == "/heartbeat":
+            self._send(200, {"ok": True, "leases": self.coord.heartbeat(worker)})
+        elif self.path == "/lease":
+            job = self.coord.lease(worker)
+            done = job is None and self.coord.done()
+            if done:
+                self.coord.leave(worker)
+            self._send(200, {"job": job, "done": done})
+        elif self.path == "/result/area":
+            self.coord.heartbeat(worker)
+            if body.get("error"):
+                state = self.coord.area_failed(worker, area, body["error"])
+                self._send(200, {"ok": True, "state": state})
+            else:
+                queued = self.coord.area_result(worker, area, body.get("outlets", []))
+                self._send(200, {"ok": True, "queued": queued or 0, "ignored": queued is None})
+        elif self.path == "/result/outlets":
+            self.coord.heartbeat(worker)
+            settled = self.coord.outlet_results(worker, area, body.get("results", []))
+            self._send(200, {"ok": True, "settled": settled})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def log_message(self, fmt, *args):
+        pass  # akses log terlalu ramai; event penting sudah di-print Coordinator
+
+
+def serve(server: HTTPServer, coordinator: Coordinator, exit_when_done: bool = False) -> None:
+    """Loop request single-thread: akses SQLite tetap di satu thread, reaper jalan di sela request."""
+    server.timeout = 0.5
+    while True:
+        server.handle_request()
+        coordinator.reap()
+        # Selesai jika semua area beres dan semua worker sudah diberi tahu
+        if exit_when_done and coordinator.done() and not coordinator.workers:
+            return
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Coordinator job scraping GoFood (HTTP/JSON).")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Alamat bind (pakai 0.0.0.0 untuk worker di mesin lain).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"Port HTTP (default: {DEFAULT_PORT}).")
+    parser.add_argument("--city", default=CITY, help=f"Service area (default: {CITY}).")
+    parser.add_argument("--area", action="append", default=None,
+                        help="Locality yang dibagikan (bisa diulang; default: LIST_AREA scrap_sby).")
+    parser.add_argument("--limit", type=int, default=0,
+                        help="Maks outlet per area untuk step 3 (0 = semua).")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Outlet per lease (default: {DEFAULT_BATCH_SIZE}).")
+    parser.add_argument("--heartbeat-timeout", type=float, default=DEFAULT_HEARTBEAT_TIMEOUT,
+                        help="Detik tanpa heartbeat sebelum lease worker di-requeue.")
+    parser.add_argument("--db", default=str(DEFAULT_COORDINATOR_DB),
+                        help=f"Database antrian coordinator (default: {DEFAULT_COORDINATOR_DB}).")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Hapus state run sebelumnya sebelum mulai.")
+    parser.add_argument("--exit-when-done", action="store_true",
+                        help="Berhenti setelah semua area selesai dan worker sudah keluar.")
+    add_output_format_args(parser)
+    add_schedule_args(parser)
+    args = parser.parse_args()
+
+    areas = args.area or LIST_AREA
+    queue = OutletQueue(Path(args.db), lease_seconds=DEFAULT_LEASE_SECONDS, worker_id="coordinator")
+    if args.fresh:
+        for ns in queue.namespaces():
+            queue.clear(ns)
+
+    coordinator = Coordinator(
+        queue, args.city, areas, args.limit, args.batch_size, args.heartbeat_timeout,
+        fmt=args.format, compression=args.compress, compact=args.compact_json,
+        schedule_args=args,
+    )
+    server = HTTPServer((args.host, args.port), _Handler)
+    server.coordinator = coordinator
+    print(f"[INFO] Coordinator listen di http://{args.host}:{server.server_port} "
+          f"({len(areas)} area, limit={args.limit or 'semua'})")
+    try:
+        serve(server, coordinator, args.exit_when_done)
+    except KeyboardInterrupt:
+        print("\n[ABORT] Coordinator dihentikan.")
+    finally:
+        server.server_close()
+        queue.close()
+
+    print(json.dumps(coordinator.status()["areas"], ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,14 +11,14 @@ import json
 import re
 from pathlib import Path
 
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
-
+import developer_test_scrapping
 from developer_test_scrapping import (
     BROWSER_ARGS,
     OUTPUT_DIR,
     _context_kwargs,
     _extract_outlets_recursive,
     step1_session_bootstrap,
+    sync_playwright,
 )
 
 CITY = "surabaya"
@@ -82,9 +82,10 @@ def analyze_area(browser, area: str, storage_state: Path):
     context = browser.new_context(**_context_kwargs(storage_state))
     page = context.new_page()
     page.goto(nearme_url, wait_until="domcontentloaded", timeout=60_000)
+    # Atribut modul dibaca saat dipakai: kelas asli baru terpasang setelah sync_playwright()
     try:
         page.wait_for_load_state("networkidle", timeout=20_000)
-    except PlaywrightTimeoutError:
+    except developer_test_scrapping.PlaywrightTimeoutError:
         pass
     page.wait_for_timeout(8000)
 
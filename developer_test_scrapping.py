@@ -11,43 +11,92 @@ Output akhir: JSON + CSV katalog menu dari restoran yang ditemukan.
 Usage:
   python3 developer_test_scrapping.py --area surabaya --locality sukolilo-restaurants --limit 5
   python3 developer_test_scrapping.py --area surabaya --locality gubeng-restaurants --limit 10 --headful
+  python3 developer_test_scrapping.py --locality gubeng-restaurants --limit 20 --schedule priority
 """
 
 import argparse
-import csv
-import json
-import random
-import re
 import sys
+import threading
 import time
-import unicodedata
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from pathlib import Path
 
-from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
-from playwright.sync_api import sync_playwright
-
-# ── Constants ───────────────────────────────────────────────────────
-WIB = timezone(timedelta(hours=7))
-OUTPUT_DIR = Path("output")
-
-API_URL_HINTS = (
-    "graphql", "api", "search", "outlet", "restaurant", "explore",
-    "discover", "nearby", "listing", "catalog", "feed",
+import json_codec
+from discovery_checkpoint import DiscoveryCheckpoint, add_checkpoint_args, open_checkpoint
+from har_replay import HarHarness, add_har_args, open_har
+from intercept_worker import DEFAULT_WORKERS, InterceptWorker, LiveCount, add_intercept_worker_args
+from network_accounting import NetworkAccountant
+# Parsing/normalisasi/output di gofood_core; nama diimpor ulang untuk modul lama
+from gofood_core import (
+    API_URL_HINTS,
+    CSV_COLUMNS,
+    DEFAULT_BASE_URL,
+    OUTPUT_DIR,
+    WIB,
+    _error_record,
+    _extract_next_data_outlets,
+    _extract_next_data_text,
+    _extract_outlets_recursive,
+    _finalize_menu_record,
+    _is_outlet,
+    _is_real_outlet,
+    _normalize_outlet,
+    _origin,
+    _outlets_from_next_data,
+    _parse_menu,
+    _parse_menu_payload,
+    _parse_menu_text,
+    _slugify,
+    add_output_format_args,
+    flatten_to_csv_rows,
+    save_outputs,
+)
+from memory_profile import MemoryProfiler, add_memory_args, open_memory_profiler
+from metrics import Metrics, add_metrics_args, open_metrics
+from outlet_stream import DEFAULT_BUFFER, OutletStream, add_stream_args
+from payload_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, PayloadCache
+from rate_control import RateController
+from response_filter import ResponseFilter, add_response_filter_args, open_response_filter
+from retry_engine import (
+    ERROR_CHALLENGE,
+    ERROR_INVALID,
+    ERROR_MISSING_PAYLOAD,
+    ERROR_NAVIGATION,
+    ERROR_TIMEOUT,
+    CircuitBreaker,
+    RetryPolicy,
+    add_retry_args,
+    is_challenge,
+    open_retry,
+)
+from scheduler import add_schedule_args, schedule_outlets
+from session_check import BOOTSTRAP_OVERHEAD_S, SessionGuard, add_session_args, open_session_guard
+from work_queue import DEFAULT_QUEUE_DB, OutletQueue, iter_leases
+from warm_start import (
+    STOP_EXHAUSTED, STOP_MAX_SCROLLS, WarmStart, add_warm_start_args, load_seed, open_warm_start,
 )
 
+# ── Constants ───────────────────────────────────────────────────────
 BROWSER_ARGS = [
     "--disable-blink-features=AutomationControlled",
     "--no-first-run",
     "--no-default-browser-check",
 ]
 
-CSV_COLUMNS = [
-    "restaurant_uid", "restaurant_name", "restaurant_url", "scraped_at",
-    "status", "section_uid", "section_name", "section_type",
-    "item_uid", "item_name", "item_description", "item_status",
-    "price_units", "currency_code", "image_url", "variant_count",
-]
+# ── Playwright (lazy) ───────────────────────────────────────────────
+# Diimpor saat browser pertama kali dibuka, bukan saat modul diimpor: tool
+# offline tidak butuh Playwright (parsing/output ada di gofood_core.py).
+# Semua entry point browser wajib membuka Playwright lewat `sync_playwright()`
+# di bawah supaya `except PlaywrightTimeoutError` menangkap kelas yang benar.
+PlaywrightTimeoutError: type[Exception] = TimeoutError
+
+
+def sync_playwright():
+    """`playwright.sync_api.sync_playwright()` dengan import saat dipanggil."""
+    global PlaywrightTimeoutError
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    from playwright.sync_api import sync_playwright as _sync_playwright
+    return _sync_playwright()
 
 
 def _context_kwargs(storage_state: Path) -> dict:
@@ -77,6 +126,7 @@ def _context_kwargs(storage_state: Path) -> dict:
 
 def step1_session_bootstrap(
     browser, listing_url: str, storage_state: Path, wait_ms: int,
+    net: NetworkAccountant | None = None, har: HarHarness | None = None,
 ) -> bool:
     """Buka halaman listing untuk menembus WAF dan menyimpan session."""
     print(f"\n{'='*60}")
@@ -85,6 +135,10 @@ def step1_session_bootstrap(
     print(f"  Target: {listing_url}")
 
     context = browser.new_context(**_context_kwargs(storage_state))
+    if net is not None:
+        net.attach(context, "step1")
+    if har is not None:
+        har.attach(context, "step1")
     page = context.new_page()
 
     try:
@@ -116,8 +170,7 @@ def step1_session_bootstrap(
         return True
     else:
         # Mungkin kena anti-bot, tapi session tetap tersimpan
-        html_lower = html.lower()
-        if any(m in html_lower for m in ("captcha", "cloudflare", "probe.js", "access denied")):
+        if is_challenge(html):
             print("  [WARNING] Terdeteksi anti-bot challenge.")
             print("  Coba jalankan ulang dengan --headful untuk solve captcha manual.")
             return False
@@ -125,167 +178,190 @@ def step1_session_bootstrap(
         return True
 
 
-# ═══════════════════════════════════════════════════════════════════
-#  STEP 2 — NEAR-ME OUTLET DISCOVERY
-# ═══════════════════════════════════════════════════════════════════
-
-def _slugify(text: str) -> str:
-    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9]+", "-", text)
-    return text.strip("-")
-
-
-def _is_outlet(obj: dict) -> bool:
-    if not isinstance(obj, dict):
-        return False
-    has_uid = "uid" in obj
-    has_core = isinstance(obj.get("core"), dict) and "displayName" in obj.get("core", {})
-    has_name = "displayName" in obj
-    return has_uid and (has_core or has_name)
-
-
-def _is_real_outlet(uid: str, core: dict) -> bool:
-    if uid.startswith("CUISINE_"):
-        return False
-    if not core:
-        return False
-    location = core.get("location")
-    if not isinstance(location, dict):
+def _probe_session(browser, listing_url: str, storage_state: Path) -> bool:
+    """GET listing lewat request context (tanpa render). True jika session masih diterima."""
+    context = browser.new_context(**_context_kwargs(storage_state))
+    try:
+        resp = context.request.get(listing_url, timeout=15_000)
+        body = resp.text()
+        ok = resp.ok and "__NEXT_DATA__" in body and not is_challenge(body, resp.status)
+        print(f"  [SESSION] Probe HTTP {resp.status} → {'OK' if ok else 'gagal'}")
+        return ok
+    except Exception as exc:
+        print(f"  [SESSION] Probe error: {exc}")
         return False
-    return location.get("latitude") is not None and location.get("longitude") is not None
-
-
-def _extract_outlets_recursive(node) -> list[dict]:
-    results = []
-    if isinstance(node, dict):
-        if _is_outlet(node):
-            results.append(node)
-        for v in node.values():
-            results.extend(_extract_outlets_recursive(v))
-    elif isinstance(node, list):
-        for item in node:
-            results.extend(_extract_outlets_recursive(item))
-    return results
-
-
-def _normalize_outlet(raw: dict, service_area: str) -> dict | None:
-    uid = raw.get("uid")
-    if not uid:
-        return None
-
-    core = raw.get("core", {}) if isinstance(raw.get("core"), dict) else {}
-    delivery = raw.get("delivery", {}) if isinstance(raw.get("delivery"), dict) else {}
-    ratings = raw.get("ratings", {}) if isinstance(raw.get("ratings"), dict) else {}
-
-    if not _is_real_outlet(uid, core):
-        return None
+    finally:
+        context.close()
 
-    display_name = core.get("displayName") or raw.get("displayName") or ""
-    if not display_name:
-        return None
 
-    path = raw.get("path", "") or ""
-    if not path and service_area and display_name:
-        slug = _slugify(display_name)
-        path = f"/{service_area}/restaurant/{slug}-{uid}"
-    full_url = f"https://gofood.co.id{path}" if path else ""
-
-    return {
-        "uid": uid,
-        "name": display_name,
-        "path": path,
-        "full_url": full_url,
-        "latitude": core.get("location", {}).get("latitude") if isinstance(core.get("location"), dict) else None,
-        "longitude": core.get("location", {}).get("longitude") if isinstance(core.get("location"), dict) else None,
-        "status": core.get("status"),
-        "rating_average": ratings.get("average"),
-        "rating_total": ratings.get("total"),
-        "delivery_distance_km": delivery.get("distanceKm"),
-        "price_level": raw.get("priceLevel"),
-    }
+def ensure_session(
+    browser, listing_url: str, storage_state: Path, wait_ms: int,
+    guard: SessionGuard | None = None, net: NetworkAccountant | None = None,
+    har: HarHarness | None = None,
+) -> tuple[bool, bool]:
+    """Jalankan step 1 hanya jika session basi. Return (ok, bootstrapped).
+
+    Tanpa `guard` perilakunya sama dengan step1_session_bootstrap.
+    """
+    if guard is not None:
+        needed, reason = guard.needs_bootstrap(
+            storage_state, lambda: _probe_session(browser, listing_url, storage_state),
+        )
+        if not needed:
+            saved = guard.record_skip(wait_ms / 1000 + BOOTSTRAP_OVERHEAD_S)
+            print(f"\n[STEP 1] Session masih segar ({reason}) — bootstrap dilewati (~{saved:.0f}s).")
+            return True, False
+        print(f"\n[STEP 1] Bootstrap diperlukan: {reason}")
 
+    t0 = time.monotonic()
+    ok = step1_session_bootstrap(browser, listing_url, storage_state, wait_ms, net, har)
+    if guard is not None and ok:
+        guard.record_bootstrap(time.monotonic() - t0)
+    return ok, True
 
-def _extract_next_data_outlets(html: str) -> list[dict]:
-    match = re.search(
-        r'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>',
-        html, re.IGNORECASE | re.DOTALL,
-    )
-    if not match:
-        return []
-    try:
-        payload = json.loads(match.group(1).strip())
-    except json.JSONDecodeError:
-        return []
-
-    contents = payload.get("props", {}).get("pageProps", {}).get("contents", [])
-    outlets = []
-    for section in contents:
-        if not isinstance(section, dict):
-            continue
-        data = section.get("data")
-        if not isinstance(data, list):
-            continue
-        for item in data:
-            if isinstance(item, dict) and "uid" in item:
-                outlets.append(item)
-            for key in ("outlets", "items"):
-                nested = item.get(key) if isinstance(item, dict) else None
-                if isinstance(nested, list):
-                    for sub in nested:
-                        if isinstance(sub, dict) and "uid" in sub:
-                            outlets.append(sub)
-    return outlets
 
+# ═══════════════════════════════════════════════════════════════════
+#  STEP 2 — NEAR-ME OUTLET DISCOVERY
+# ═══════════════════════════════════════════════════════════════════
 
 def step2_outlet_discovery(
     browser, nearme_url: str, service_area: str, storage_state: Path,
     max_scrolls: int, patience: int, scroll_delay: float, wait_ms: int,
+    cache: PayloadCache | None = None, namespace: str = "",
+    checkpoint: DiscoveryCheckpoint | None = None,
+    warm: WarmStart | None = None,
+    metrics: Metrics | None = None, net: NetworkAccountant | None = None,
+    har: HarHarness | None = None, stream: OutletStream | None = None,
+    rfilter: ResponseFilter | None = None, workers: int = DEFAULT_WORKERS,
 ) -> list[dict]:
-    """Scroll halaman near-me, intercept API, kumpulkan outlet unik."""
+    """Scroll halaman near-me, intercept API, kumpulkan outlet unik.
+
+    Jika `cache` diberikan, body API dan __NEXT_DATA__ near-me diarsipkan
+    di bawah `namespace` (locality) untuk `reparse.py`.
+    Jika `checkpoint` diberikan, outlet di-snapshot berkala ke disk dan run
+    yang crash dilanjutkan dari snapshot terakhir.
+    Jika `warm` diberikan, outlet run sebelumnya menjadi seed: coverage seed
+    dilacak, scroll boleh berhenti lebih awal, dan outlet ditandai
+    new/present/unconfirmed (lihat `warm_start.py`).
+    `metrics` (opsional) menerima counter halaman, respons API, byte, durasi
+    parse, dan outlet baru. `net` mencatat seluruh traffic context (step2);
+    `har` merekam/memutar ulang traffic (lihat `har_replay.py`).
+    Jika `stream` diberikan, outlet baru langsung diteruskan ke consumer step 3
+    (thread terpisah) dan scroll menunggu saat queue-nya penuh (lihat `outlet_stream.py`).
+    `rfilter` menyaring respons sebelum body diunduh (default: gate bawaan
+    `response_filter.py`); counter per rule dicetak di akhir step.
+    Body respons yang lolos diproses `workers` thread di luar thread
+    Playwright (0 = inline di callback, lihat `intercept_worker.py`).
+    """
     print(f"\n{'='*60}")
     print("[STEP 2] OUTLET DISCOVERY (Near-Me Interceptor)")
     print(f"{'='*60}")
     print(f"  Target : {nearme_url}")
     print(f"  Area   : {service_area}")
 
+    base_url = _origin(nearme_url)  # full_url outlet ikut host near-me (mis. fixture_server.py)
+    if rfilter is None:
+        rfilter = ResponseFilter(metrics=metrics)
     outlets_by_uid: dict[str, dict] = {}
-    intercepted_count = 0
+    seen_this_run: set[str] = set()  # UID yang terlihat di run ini (baru + seed checkpoint)
+    lock = threading.Lock()          # outlets_by_uid/seen_this_run/warm diubah thread worker
+    intercepted = LiveCount()
+    resumed_scrolls = 0
+    if checkpoint is not None:
+        outlets_by_uid, resumed_scrolls = checkpoint.load()
+        if outlets_by_uid:
+            print(f"  [CHECKPOINT] Resume: {len(outlets_by_uid)} outlet dari {resumed_scrolls} scroll sebelumnya")
+    if warm is not None:
+        for uid in outlets_by_uid:
+            warm.observe(uid)
+    if stream is not None:
+        for norm in outlets_by_uid.values():
+            stream.put(norm)
+    unique = LiveCount(len(outlets_by_uid))  # dibaca scroll loop, ditulis thread worker
+    seen = LiveCount()
+
+    def add_outlet(norm: dict | None) -> bool:
+        """Catat outlet. Return True jika UID belum pernah ada (termasuk di checkpoint)."""
+        if not norm:
+            return False
+        uid = norm["uid"]
+        with lock:
+            if uid not in seen_this_run:
+                seen_this_run.add(uid)
+                seen.add()
+            if warm is not None:
+                warm.observe(uid)
+            if uid in outlets_by_uid:
+                return False
+            outlets_by_uid[uid] = norm
+            unique.add()
+        if stream is not None:
+            stream.put(norm)  # bisa memblokir (queue penuh) — di luar lock
+        if metrics is not None:
+            metrics.inc("outlets_discovered_total", area=namespace)
+        return True
 
-    def handle_response(response):
-        nonlocal intercepted_count
-        if response.request.resource_type not in ("fetch", "xhr"):
-            return
-        url_lower = response.url.lower()
-        if not any(hint in url_lower for hint in API_URL_HINTS):
-            return
+    def process_body(data: bytes, url: str) -> None:
+        """Decode + walk + normalisasi satu body API (di thread worker)."""
+        t0 = time.perf_counter()
         try:
-            body = response.json()
+            body = json_codec.loads(data)
         except Exception:
+            rfilter.record("decode_error")
             return
 
         found = _extract_outlets_recursive(body)
+        rfilter.record("outlets" if found else "no_outlets")
+        # Hanya body yang berisi outlet yang diarsipkan: reparse.py tidak butuh sisanya
+        if cache is not None and found:
+            cache.put("api", namespace, data.decode("utf-8", "replace"), namespace, service_area,
+                      url, datetime.now(WIB).isoformat())
         new = 0
         for raw in found:
-            norm = _normalize_outlet(raw, service_area)
-            if norm and norm["uid"] not in outlets_by_uid:
-                outlets_by_uid[norm["uid"]] = norm
-                new += 1
+            new += add_outlet(_normalize_outlet(raw, service_area, base_url))
+        if metrics is not None:
+            metrics.observe("parse_seconds", time.perf_counter() - t0, step="api")
+            metrics.inc("intercepted_responses_total", area=namespace)
+            metrics.inc("bytes_received_total", len(data), step="api")
         if found:
-            intercepted_count += 1
-            print(f"    [API] {len(found)} outlets ({new} new, {len(outlets_by_uid)} total)")
+            intercepted.add()
+            print(f"    [API] {len(found)} outlets ({new} new, {unique.value} total)")
+
+    worker = InterceptWorker(process_body, workers=workers, name="step2-intercept")
+
+    def handle_response(response):
+        # Thread Playwright: hanya gate murah + ambil byte body, sisanya di worker
+        if not rfilter.accept(response):
+            return
+        try:
+            data = response.body()
+        except Exception:
+            rfilter.record("decode_error")
+            return
+        worker.submit(data, response.url)
 
     context = browser.new_context(**_context_kwargs(storage_state))
+    if net is not None:
+        net.attach(context, "step2")
+    if har is not None:
+        har.attach(context, "step2")
     page = context.new_page()
     page.on("response", handle_response)
 
+    t0 = time.monotonic()
     try:
         response = page.goto(nearme_url, wait_until="domcontentloaded", timeout=60_000)
         print(f"  HTTP status: {response.status if response else None}")
     except PlaywrightTimeoutError:
         print("  [ERROR] Timeout navigasi near-me.")
+        if metrics is not None:
+            metrics.inc("errors_total", error_class=ERROR_TIMEOUT)
         context.close()
+        worker.close()
         return []
+    if metrics is not None:
+        metrics.inc("pages_total", step="nearme")
+        metrics.observe("page_seconds", time.monotonic() - t0, step="nearme")
 
     try:
         page.wait_for_load_state("networkidle", timeout=20_000)
@@ -296,42 +372,80 @@ def step2_outlet_discovery(
 
     # Batch awal dari __NEXT_DATA__
     html = page.content()
+    raw_next_data = _extract_next_data_text(html)
+    if cache is not None and raw_next_data:
+        cache.put("nearme", namespace, raw_next_data, namespace, service_area,
+                  nearme_url, datetime.now(WIB).isoformat())
     initial = _extract_next_data_outlets(html)
     for raw in initial:
-        norm = _normalize_outlet(raw, service_area)
-        if norm and norm["uid"] not in outlets_by_uid:
-            outlets_by_uid[norm["uid"]] = norm
-    print(f"  [INITIAL] {len(initial)} raw -> {len(outlets_by_uid)} unik setelah filter")
+        add_outlet(_normalize_outlet(raw, service_area, base_url))
+    worker.wait_idle()
+    print(f"  [INITIAL] {len(initial)} raw -> {unique.value} unik setelah filter")
 
     # Scroll loop
     print("  [SCROLL] Memulai infinite scroll...")
     scroll_count = 0
     stale_streak = 0
 
-    while scroll_count < max_scrolls and stale_streak < patience:
-        scroll_count += 1
-        prev = len(outlets_by_uid)
-
-        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        time.sleep(scroll_delay)
-        try:
-            page.wait_for_load_state("networkidle", timeout=5000)
-        except PlaywrightTimeoutError:
-            pass
-
-        new_this = len(outlets_by_uid) - prev
-        if new_this == 0:
-            stale_streak += 1
-            print(f"    Scroll {scroll_count}: tanpa data baru (stale {stale_streak}/{patience})")
-        else:
-            stale_streak = 0
-            print(f"    Scroll {scroll_count}: +{new_this} baru (total {len(outlets_by_uid)})")
+    try:
+        while scroll_count < max_scrolls and stale_streak < patience:
+            scroll_count += 1
+            prev = unique.value
+            prev_seen = seen.value
+
+            if stream is not None:
+                stream.wait_room()
+            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            time.sleep(scroll_delay)
+            try:
+                page.wait_for_load_state("networkidle", timeout=5000)
+            except PlaywrightTimeoutError:
+                pass
+            # Body yang masih antre di worker jangan sampai terhitung "tanpa data baru"
+            worker.wait_idle()
+
+            total = unique.value
+            new_this = total - prev
+            if new_this > 0:
+                stale_streak = 0
+                print(f"    Scroll {scroll_count}: +{new_this} baru (total {total})")
+                if checkpoint is not None:
+                    with lock:
+                        snapshot = dict(outlets_by_uid)
+                    checkpoint.maybe_save(snapshot, resumed_scrolls + scroll_count)
+            elif seen.value > prev_seen:
+                # Masih melewati outlet dari checkpoint — belum sampai wilayah baru
+                print(f"    Scroll {scroll_count}: mengejar checkpoint "
+                      f"({seen.value}/{total} terlihat lagi)")
+            else:
+                stale_streak += 1
+                print(f"    Scroll {scroll_count}: tanpa data baru (stale {stale_streak}/{patience})")
+            if warm is not None:
+                with lock:
+                    warm.record_scroll()
+                    stop = warm.should_stop()
+                if stop:
+                    break
+    finally:
+        # Crash/interrupt di tengah scroll: outlet yang sudah ketemu tetap tersimpan
+        worker.close()
+        if checkpoint is not None:
+            checkpoint.flush(outlets_by_uid, resumed_scrolls + scroll_count)
 
     context.storage_state(path=str(storage_state))
     context.close()
+    if checkpoint is not None:
+        checkpoint.clear()
+    if warm is not None:
+        # Berhenti karena max_scrolls (outlet masih mengalir) ≠ daftar habis: seed yang belum
+        # terlihat tetap dibawa sebagai unconfirmed, bukan dibuang sebagai vanished
+        warm.record_stop(STOP_EXHAUSTED if stale_streak >= patience else STOP_MAX_SCROLLS)
+        outlets_by_uid = warm.finish(outlets_by_uid)
 
     outlet_list = sorted(outlets_by_uid.values(), key=lambda o: o["name"])
-    print(f"  [DONE] {len(outlet_list)} outlet unik ditemukan. API ditangkap: {intercepted_count}x")
+    print(f"  [DONE] {len(outlet_list)} outlet unik ditemukan. API ditangkap: {intercepted.value}x")
+    rfilter.report()
+    worker.report()
     return outlet_list
 
 
@@ -339,74 +453,271 @@ def step2_outlet_discovery(
 #  STEP 3 — BATCH MENU EXTRACTION
 # ═══════════════════════════════════════════════════════════════════
 
-_NEXT_DATA_RE = re.compile(
-    r'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>',
-    re.IGNORECASE | re.DOTALL,
-)
-
-
-def _parse_menu(html: str) -> dict:
-    """Ekstrak __NEXT_DATA__ lalu parse menu sections."""
-    match = _NEXT_DATA_RE.search(html)
-    if not match:
-        return {"status": "error", "error": "__NEXT_DATA__ not found", "menu_sections": []}
-
+def _scrape_outlet_menu(
+    page, outlet: dict, label: str, wait_ms: int,
+    cache: PayloadCache | None, namespace: str,
+    rate: RateController | None = None, deadline: float | None = None,
+    metrics: Metrics | None = None,
+) -> tuple[dict, bool]:
+    """Buka profil satu outlet dan parse menunya (satu attempt).
+
+    Return (record, visited) — visited False jika navigasi tidak terjadi/gagal.
+    Record error membawa `error_class` (lihat retry_engine). Latency goto,
+    HTTP status, timeout, dan ada/tidaknya __NEXT_DATA__ dilaporkan ke `rate`.
+    `deadline` (time.monotonic) memotong timeout goto/networkidle/wait ke sisa budget.
+    """
+    name = outlet.get("name", "???")
+    url = outlet.get("full_url", "")
+    uid = outlet.get("uid", "")
+
+    def remaining_ms(default_ms: int) -> int:
+        if deadline is None:
+            return default_ms
+        return max(0, min(default_ms, int((deadline - time.monotonic()) * 1000)))
+
+    if not url:
+        print(f"\n  [{label}] SKIP {name} — no URL")
+        return _error_record(uid, name, "", "no full_url", ERROR_INVALID), False
+
+    print(f"\n  [{label}] {name}")
+    print(f"    URL: {url}")
+
+    goto_timeout = remaining_ms(60_000)
+    if goto_timeout <= 0:
+        print("    [ERROR] Budget waktu outlet habis")
+        return _error_record(uid, name, url, "outlet budget exhausted", ERROR_TIMEOUT), False
+
+    t0 = time.monotonic()
     try:
-        payload = json.loads(match.group(1).strip())
-    except json.JSONDecodeError:
-        return {"status": "error", "error": "JSON decode error", "menu_sections": []}
-
-    page_props = payload.get("props", {}).get("pageProps", {})
-    outlet = page_props.get("outlet", {})
-    core = outlet.get("core", {}) if isinstance(outlet.get("core"), dict) else {}
-    catalog = outlet.get("catalog", {}) if isinstance(outlet.get("catalog"), dict) else {}
-    sections_raw = catalog.get("sections", [])
-
-    result = {
-        "restaurant_uid": outlet.get("uid") or core.get("uid") or "",
-        "restaurant_name": core.get("displayName") or "",
-        "restaurant_url": page_props.get("outletUrl") or "",
-        "status": "success" if sections_raw else "no_menu",
-        "menu_sections": [],
-    }
+        resp = page.goto(url, wait_until="domcontentloaded", timeout=goto_timeout)
+        print(f"    HTTP: {resp.status if resp else '?'}")
+    except PlaywrightTimeoutError:
+        print(f"    [ERROR] Timeout")
+        if rate is not None:
+            rate.observe(latency=time.monotonic() - t0, timeout=True)
+        return _error_record(uid, name, url, "goto timeout", ERROR_TIMEOUT), False
+    except Exception as exc:
+        print(f"    [ERROR] {exc}")
+        if rate is not None:
+            rate.observe(latency=time.monotonic() - t0, failed=True)
+        return _error_record(uid, name, url, str(exc), ERROR_NAVIGATION), False
+    goto_latency = time.monotonic() - t0
+    status = resp.status if resp else None
+    if metrics is not None:
+        metrics.inc("pages_total", step="profile")
+        metrics.observe("page_seconds", goto_latency, step="profile")
+
+    # timeout=0 di Playwright berarti tanpa batas — budget habis = lewati wait
+    idle_ms = remaining_ms(25_000)
+    if idle_ms > 0:
+        try:
+            page.wait_for_load_state("networkidle", timeout=idle_ms)
+        except PlaywrightTimeoutError:
+            pass
+
+    settle_ms = remaining_ms(wait_ms)
+    if settle_ms > 0:
+        page.wait_for_timeout(settle_ms)
+    html = page.content()
+    scraped_at = datetime.now(WIB).isoformat()
+    raw_next_data = _extract_next_data_text(html)
+    if rate is not None:
+        rate.observe(latency=goto_latency, status=status, payload_missing=raw_next_data is None)
+    if cache is not None and raw_next_data:
+        cache.put("menu", uid, raw_next_data, namespace, url=url, fetched_at=scraped_at)
+    t_parse = time.perf_counter()
+    record = _finalize_menu_record(
+        _parse_menu_text(raw_next_data), uid, name, url, scraped_at,
+    )
+    if metrics is not None:
+        metrics.observe("parse_seconds", time.perf_counter() - t_parse, step="menu")
+        metrics.inc("bytes_received_total", len(html.encode("utf-8")), step="profile")
+    if record["status"] == "error":
+        if raw_next_data is None and is_challenge(html, status):
+            record["error"] = f"challenge detected (HTTP {status or '?'})"
+            record["error_class"] = ERROR_CHALLENGE
+        else:
+            record["error_class"] = ERROR_MISSING_PAYLOAD
 
-    if not isinstance(sections_raw, list):
-        return result
+    sec_count = len(record.get("menu_sections", []))
+    item_count = sum(len(s.get("items", [])) for s in record.get("menu_sections", []))
 
-    for section in sections_raw:
-        if not isinstance(section, dict):
-            continue
-        items = []
-        for item in (section.get("items") or []):
-            if not isinstance(item, dict):
+    if record["status"] == "success":
+        print(f"    [OK] {sec_count} sections, {item_count} items")
+    elif record["status"] == "no_menu":
+        print(f"    [WARN] No menu found")
+    else:
+        print(f"    [ERROR] {record.get('error', '?')}")
+
+    return record, True
+
+
+def _scrape_with_retry(
+    page, outlet: dict, label: str, wait_ms: int,
+    cache: PayloadCache | None, namespace: str,
+    rate: RateController | None, retry: RetryPolicy, breaker: CircuitBreaker | None,
+    metrics: Metrics | None = None,
+) -> tuple[dict, bool]:
+    """`_scrape_outlet_menu` dengan retry terklasifikasi dalam budget waktu per outlet."""
+    deadline = time.monotonic() + retry.outlet_budget
+    visited_any = False
+    for attempt in range(1, retry.max_attempts + 1):
+        if breaker is not None:
+            breaker.before_request()
+        record, visited = _scrape_outlet_menu(
+            page, outlet, label, wait_ms, cache, namespace, rate, deadline, metrics,
+        )
+        visited_any = visited_any or visited
+        error_class = record.get("error_class")
+        if metrics is not None and error_class is not None:
+            metrics.inc("errors_total", error_class=error_class)
+        if breaker is not None and error_class != ERROR_INVALID:
+            breaker.record(error_class is None)
+
+        if error_class is None:
+            if attempt > 1:
+                retry.recovered += 1
+            break
+        if not retry.should_retry(error_class, attempt):
+            break
+        delay = retry.backoff(attempt)
+        if time.monotonic() + delay >= deadline:
+            retry.budget_exhausted += 1
+            print(f"    [RETRY] Budget {retry.outlet_budget:.0f}s habis, berhenti di attempt {attempt}.")
+            break
+        retry.retries += 1
+        print(f"    [RETRY] {error_class} — attempt {attempt + 1}/{retry.max_attempts} "
+              f"dalam {delay:.1f}s...")
+        time.sleep(delay)
+    return record, visited_any
+
+
+class MenuExtractor:
+    """Context + page step 3 beserta state pacing/retry; satu outlet per `scrape()`.
+
+    Dipakai `step3_batch_menu` (loop berurutan) dan sebagai consumer
+    `OutletStream` saat `--stream` (lihat `outlet_stream.py`).
+    """
+
+    def __init__(
+        self, browser, storage_state: Path, wait_ms: int,
+        rate: RateController, retry: RetryPolicy, breaker: CircuitBreaker,
+        cache: PayloadCache | None = None, namespace: str = "",
+        queue: OutletQueue | None = None,
+        metrics: Metrics | None = None, net: NetworkAccountant | None = None,
+        profiler: MemoryProfiler | None = None, har: HarHarness | None = None,
+    ):
+        self.browser = browser
+        self.storage_state = storage_state
+        self.wait_ms = wait_ms
+        self.rate, self.retry, self.breaker = rate, retry, breaker
+        self.cache = cache
+        self.namespace = namespace
+        self.queue = queue
+        self.metrics = metrics
+        self.profiler = profiler
+        self.results: list[dict] = []
+        self.count = 0
+        self.context = browser.new_context(**_context_kwargs(storage_state))
+        if net is not None:
+            net.attach(self.context, "step3")
+        if har is not None:
+            har.attach(self.context, "step3")
+        self.page = self.context.new_page()
+
+    def scrape(self, outlet: dict, label: str) -> bool:
+        """Scrape satu outlet (dengan retry), simpan hasil. Return True jika halaman dikunjungi."""
+        self.count += 1
+        record, visited = _scrape_with_retry(
+            self.page, outlet, label, self.wait_ms, self.cache, self.namespace,
+            self.rate, self.retry, self.breaker, self.metrics,
+        )
+        if self.metrics is not None:
+            self.metrics.inc("outlets_scraped_total", status=record.get("status", "?"))
+            self.metrics.set("delay_seconds", self.rate.interval, controller=self.rate.name)
+        if self.profiler is not None:
+            self.profiler.tick(self.browser)
+
+        if self.queue is not None:
+            # Retry error sudah dipegang RetryPolicy (attempt + budget outlet); antrian
+            # hanya mengulang lease yang hilang (runner mati), jadi record ini final
+            state = self.queue.settle(self.namespace, outlet.get("uid", ""), record, permanent=True)
+            if state is None:
+                print("    [QUEUE] Lease sudah diambil runner lain — hasil ini dibuang.")
+        else:
+            self.results.append(record)
+
+        if visited:
+            try:
+                self.context.storage_state(path=str(self.storage_state))
+            except Exception:
+                pass
+        return visited
+
+    def consume(self, outlet: dict) -> float:
+        """Consumer `OutletStream`: scrape outlet, return jeda pacing sebelum outlet berikutnya."""
+        if self.queue is not None:
+            # Enqueue per outlet supaya crash tetap bisa di-resume, lalu lease
+            # outlet itu (settle hanya diterima dari pemegang lease). Outlet yang
+            # sudah selesai di run sebelumnya (discovery diulang) tidak bisa di-lease
+            self.queue.enqueue(self.namespace, [outlet])
+            if self.queue.lease(self.namespace, uids=[outlet.get("uid", "")]) is None:
+                print(f"\n  [S{self.count + 1}] SKIP {outlet.get('name', '???')} — sudah selesai di antrian")
+                return 0.0
+        visited = self.scrape(outlet, f"S{self.count + 1}")
+        return self.rate.next_delay() if visited else 0.0
+
+    def run(self, work, total: int | None = None, uids: list[str] | None = None) -> None:
+        """Scrape berurutan dengan jeda adaptif antar outlet.
+
+        Dengan queue, `work` adalah `iter_leases(..., uids)` dan `uids` yang
+        sama dipakai untuk mengecek apakah masih ada outlet target tersisa.
+        """
+        for i, outlet in enumerate(work):
+            label = f"{i+1}/{total}" if total is not None else f"{i+1}"
+            if not self.scrape(outlet, label):
                 continue
-            price = item.get("price", {}) if isinstance(item.get("price"), dict) else {}
-            variants = item.get("variants", []) if isinstance(item.get("variants"), list) else []
-            items.append({
-                "item_uid": item.get("uid", ""),
-                "item_name": item.get("displayName", ""),
-                "item_description": item.get("description", ""),
-                "item_status": item.get("status"),
-                "price_units": price.get("units"),
-                "currency_code": price.get("currencyCode", ""),
-                "image_url": item.get("imageUrl", ""),
-                "variant_count": len(variants),
-            })
-        result["menu_sections"].append({
-            "section_uid": section.get("uid", ""),
-            "section_name": section.get("displayName", ""),
-            "section_type": section.get("type"),
-            "items": items,
-        })
-
-    return result
+            if self.queue is not None:
+                has_next = self.queue.has_open(self.namespace, uids)
+            else:
+                has_next = i < total - 1
+            if has_next:
+                self.rate.wait()
+
+    def close(self, targets: list[dict]) -> list[dict]:
+        """Tutup context, cetak ringkasan pacing/retry, return record untuk `targets`."""
+        self.context.close()
+        self.rate.report()
+        r, b = self.retry.summary(), self.breaker.summary()
+        print(f"  [RETRY] retry={r['retries']} pulih={r['recovered']} budget_habis={r['budget_exhausted']} | "
+              f"breaker {b['state']} trip={b['trips']} pause={b['paused_s']}s")
+        if self.queue is not None:
+            return self.queue.results(self.namespace, [o.get("uid") for o in targets])
+        return self.results
 
 
 def step3_batch_menu(
     browser, outlets: list[dict], storage_state: Path,
     limit: int, wait_ms: int, delay_min: float, delay_max: float,
+    cache: PayloadCache | None = None, namespace: str = "",
+    queue: OutletQueue | None = None, rate: RateController | None = None,
+    retry: RetryPolicy | None = None, breaker: CircuitBreaker | None = None,
+    metrics: Metrics | None = None, net: NetworkAccountant | None = None,
+    profiler: MemoryProfiler | None = None, har: HarHarness | None = None,
 ) -> list[dict]:
-    """Iterasi outlet, buka profil, ekstrak menu."""
+    """Iterasi outlet, buka profil, ekstrak menu.
+
+    Jika `cache` diberikan, __NEXT_DATA__ tiap profil diarsipkan (key = uid).
+    Jika `queue` diberikan, target di-enqueue ke namespace lalu diambil via
+    lease; outlet yang sudah selesai di run sebelumnya tidak di-scrape ulang.
+    Jeda antar outlet diatur `rate` (AIMD, batas delay_min..delay_max);
+    caller bisa mengoper controller sendiri supaya rate terbawa antar area.
+    Error dicoba ulang sesuai `retry` (backoff + budget per outlet); `breaker`
+    mem-pause runner jika rasio gagal terlalu tinggi.
+    `metrics` (opsional) menerima status record dan interval pacing saat ini;
+    `net` mencatat seluruh traffic context (step3); `profiler` mengambil
+    checkpoint memori tiap N outlet; `har` merekam/memutar ulang traffic.
+    """
     print(f"\n{'='*60}")
     print("[STEP 3] BATCH MENU EXTRACTION")
     print(f"{'='*60}")
@@ -418,159 +729,182 @@ def step3_batch_menu(
         print("  [WARNING] Tidak ada outlet untuk di-scrape.")
         return []
 
-    results: list[dict] = []
-    context = browser.new_context(**_context_kwargs(storage_state))
-    page = context.new_page()
+    if queue is not None:
+        added = queue.enqueue(namespace, targets)
+        c = queue.counts(namespace)
+        print(f"  [QUEUE] +{added} baru | pending={c['pending']} leased={c['leased']} "
+              f"done={c['done']} failed={c['failed']}")
+
+    extractor = MenuExtractor(
+        browser, storage_state, wait_ms,
+        rate if rate is not None else RateController(delay_min, delay_max, name="step3"),
+        retry if retry is not None else RetryPolicy(),
+        breaker if breaker is not None else CircuitBreaker(),
+        cache=cache, namespace=namespace, queue=queue,
+        metrics=metrics, net=net, profiler=profiler, har=har,
+    )
+    if queue is not None:
+        # Hanya target run ini: job lain di namespace (mis. sisa --limit lebih besar) tidak di-lease
+        uids = [o.get("uid") for o in targets]
+        extractor.run(iter_leases(queue, namespace, uids), uids=uids)
+    else:
+        extractor.run(targets, total=len(targets))
+    return extractor.close(targets)
 
-    for i, outlet in enumerate(targets):
-        name = outlet.get("name", "???")
-        url = outlet.get("full_url", "")
-        uid = outlet.get("uid", "")
 
-        if not url:
-            print(f"\n  [{i+1}/{len(targets)}] SKIP {name} — no URL")
-            results.append({
-                "restaurant_uid": uid, "restaurant_name": name,
-                "restaurant_url": "", "scraped_at": datetime.now(WIB).isoformat(),
-                "status": "error", "error": "no full_url", "menu_sections": [],
-            })
-            continue
+def step23_stream(
+    browser, nearme_url: str, service_area: str, storage_state: Path,
+    max_scrolls: int, patience: int, scroll_delay: float,
+    limit: int | None, wait_ms: int, delay_min: float, delay_max: float,
+    buffer: int = DEFAULT_BUFFER, headless: bool = True,
+    cache: PayloadCache | None = None, namespace: str = "",
+    queue: OutletQueue | None = None, rate: RateController | None = None,
+    retry: RetryPolicy | None = None, breaker: CircuitBreaker | None = None,
+    checkpoint: DiscoveryCheckpoint | None = None, warm: WarmStart | None = None,
+    metrics: Metrics | None = None, net: NetworkAccountant | None = None,
+    profiler: MemoryProfiler | None = None, har: HarHarness | None = None,
+    rfilter: ResponseFilter | None = None, workers: int = DEFAULT_WORKERS,
+) -> tuple[list[dict], list[dict]]:
+    """Step 2 + step 3 sebagai producer/consumer (`--stream`). Return (outlets, menu_results).
+
+    Outlet baru dari step 2 masuk `OutletStream` (urutan discovery, maksimal
+    `limit`, None = semua) dan di-scrape thread consumer yang membuka
+    `sync_playwright()` + browser sendiri (`headless`), bersamaan dengan
+    scroll; sisa queue dihabiskan setelah discovery selesai. Dengan `queue`,
+    consumer memakai koneksi antrian sendiri (`OutletQueue.reopen`), outlet
+    di-enqueue per outlet, dan outlet yang masih terbuka (lease hilang)
+    diselesaikan di akhir lewat lease.
+    """
+    stream = OutletStream(buffer, limit)
+
+    def consumer(stream: OutletStream) -> list[dict]:
+        # Thread consumer: Playwright sync dan koneksi sqlite3 tidak boleh lintas thread
+        consumer_queue = queue.reopen() if queue is not None else None
+        try:
+            with sync_playwright() as pw:
+                consumer_browser = pw.chromium.launch(headless=headless, args=BROWSER_ARGS)
+                extractor = MenuExtractor(
+                    consumer_browser, storage_state, wait_ms,
+                    rate if rate is not None else RateController(delay_min, delay_max, name="step3"),
+                    retry if retry is not None else RetryPolicy(),
+                    breaker if breaker is not None else CircuitBreaker(),
+                    cache=cache, namespace=namespace, queue=consumer_queue,
+                    metrics=metrics, net=net, profiler=profiler, har=har,
+                )
+                stream.serve(extractor.consume)
+                if stream.aborted:
+                    extractor.context.close()
+                    return []
+                uids = [o.get("uid") for o in stream.accepted]
+                if consumer_queue is not None and consumer_queue.has_open(namespace, uids):
+                    print("  [QUEUE] Menyelesaikan outlet yang masih terbuka di antrian...")
+                    extractor.run(iter_leases(consumer_queue, namespace, uids), uids=uids)
+                results = extractor.close(stream.accepted)
+                consumer_browser.close()
+                return results
+        finally:
+            if consumer_queue is not None:
+                consumer_queue.close()
+
+    stream.start(consumer)
+    print(f"  [STREAM] Step 3 berjalan di thread sendiri selama discovery "
+          f"(queue {stream.maxsize}, limit {limit})")
 
-        print(f"\n  [{i+1}/{len(targets)}] {name}")
-        print(f"    URL: {url}")
+    try:
+        outlets = step2_outlet_discovery(
+            browser, nearme_url, service_area, storage_state,
+            max_scrolls, patience, scroll_delay, wait_ms,
+            cache=cache, namespace=namespace, checkpoint=checkpoint, warm=warm,
+            metrics=metrics, net=net, har=har, stream=stream, rfilter=rfilter, workers=workers,
+        )
+        if queue is not None:
+            queue.set_discovered(namespace, outlets)
+        # Outlet yang baru muncul setelah finalisasi step 2 (mis. seed warm start)
+        for outlet in outlets:
+            stream.put(outlet)
+    except BaseException:
+        stream.abort()
+        raise
+    if profiler is not None:
+        profiler.checkpoint("step2", browser)
 
-        try:
-            resp = page.goto(url, wait_until="domcontentloaded", timeout=60_000)
-            print(f"    HTTP: {resp.status if resp else '?'}")
-        except PlaywrightTimeoutError:
-            print(f"    [ERROR] Timeout")
-            results.append({
-                "restaurant_uid": uid, "restaurant_name": name,
-                "restaurant_url": url, "scraped_at": datetime.now(WIB).isoformat(),
-                "status": "error", "error": "goto timeout", "menu_sections": [],
-            })
-            continue
-        except Exception as exc:
-            print(f"    [ERROR] {exc}")
-            results.append({
-                "restaurant_uid": uid, "restaurant_name": name,
-                "restaurant_url": url, "scraped_at": datetime.now(WIB).isoformat(),
-                "status": "error", "error": str(exc), "menu_sections": [],
-            })
-            continue
+    print(f"\n{'='*60}")
+    print("[STEP 3] BATCH MENU EXTRACTION (sisa stream)")
+    print(f"{'='*60}")
+    print(f"  Sisa queue: {len(stream)} outlet, sudah di-consume: {stream.consumed}")
+    menu_results = stream.close()
+    stream.report()
+    return outlets, menu_results
 
-        try:
-            page.wait_for_load_state("networkidle", timeout=25_000)
-        except PlaywrightTimeoutError:
-            pass
 
-        page.wait_for_timeout(wait_ms)
-        html = page.content()
-        record = _parse_menu(html)
-
-        if not record.get("restaurant_uid"):
-            record["restaurant_uid"] = uid
-        if not record.get("restaurant_name"):
-            record["restaurant_name"] = name
-        if not record.get("restaurant_url"):
-            record["restaurant_url"] = url
-        record["scraped_at"] = datetime.now(WIB).isoformat()
-
-        sec_count = len(record.get("menu_sections", []))
-        item_count = sum(len(s.get("items", [])) for s in record.get("menu_sections", []))
-
-        if record["status"] == "success":
-            print(f"    [OK] {sec_count} sections, {item_count} items")
-        elif record["status"] == "no_menu":
-            print(f"    [WARN] No menu found")
-        else:
-            print(f"    [ERROR] {record.get('error', '?')}")
+# ═══════════════════════════════════════════════════════════════════
+#  CLI — FLAG BERSAMA
+# ═══════════════════════════════════════════════════════════════════
 
-        results.append(record)
+def add_base_url_args(parser: argparse.ArgumentParser) -> None:
+    """Flag CLI host target, mis. fixture_server.py untuk benchmark offline."""
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL,
+                        help=f"Base URL GoFood (default: {DEFAULT_BASE_URL}; "
+                             f"contoh lokal: http://127.0.0.1:8800).")
 
-        try:
-            context.storage_state(path=str(storage_state))
-        except Exception:
-            pass
 
-        if i < len(targets) - 1:
-            delay = random.uniform(delay_min, delay_max)
-            print(f"    Waiting {delay:.1f}s...")
-            time.sleep(delay)
+def add_net_accounting_args(parser: argparse.ArgumentParser) -> None:
+    """Flag CLI network accounting (request/byte per resource type & host)."""
+    parser.add_argument("--no-net-accounting", action="store_true",
+                        help="Matikan penghitungan request/byte per resource type & host.")
 
-    context.close()
-    return results
 
+def add_cache_args(parser: argparse.ArgumentParser) -> None:
+    """Flag CLI payload cache (arsip raw __NEXT_DATA__ + body API)."""
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR),
+                        help=f"Direktori payload cache (default: {DEFAULT_CACHE_DIR}).")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // 1024 ** 2,
+                        help="Batas ukuran cache dalam MB; blob LRU dibuang (default: 2048).")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Jangan arsipkan payload mentah.")
 
-# ═══════════════════════════════════════════════════════════════════
-#  OUTPUT — JSON + CSV
-# ═══════════════════════════════════════════════════════════════════
 
-def flatten_to_csv_rows(results: list[dict]) -> list[dict]:
-    rows = []
-    for rec in results:
-        base = {
-            "restaurant_uid": rec.get("restaurant_uid", ""),
-            "restaurant_name": rec.get("restaurant_name", ""),
-            "restaurant_url": rec.get("restaurant_url", ""),
-            "scraped_at": rec.get("scraped_at", ""),
-            "status": rec.get("status", ""),
-        }
-        sections = rec.get("menu_sections", [])
-        if not sections:
-            rows.append({**base, **{k: "" for k in CSV_COLUMNS if k not in base}})
-            continue
-        for sec in sections:
-            sec_base = {**base,
-                "section_uid": sec.get("section_uid", ""),
-                "section_name": sec.get("section_name", ""),
-                "section_type": sec.get("section_type", ""),
-            }
-            items = sec.get("items", [])
-            if not items:
-                rows.append({**sec_base, **{k: "" for k in CSV_COLUMNS if k not in sec_base}})
-                continue
-            for item in items:
-                rows.append({**sec_base,
-                    "item_uid": item.get("item_uid", ""),
-                    "item_name": item.get("item_name", ""),
-                    "item_description": item.get("item_description", ""),
-                    "item_status": item.get("item_status", ""),
-                    "price_units": item.get("price_units", ""),
-                    "currency_code": item.get("currency_code", ""),
-                    "image_url": item.get("image_url", ""),
-                    "variant_count": item.get("variant_count", ""),
-                })
-    return rows
-
-
-def save_outputs(
-    outlets: list[dict], menu_results: list[dict],
-    outlets_json: Path, menus_json: Path, menus_csv: Path,
-):
-    """Simpan semua output ke file."""
-    for p in (outlets_json, menus_json, menus_csv):
-        p.parent.mkdir(parents=True, exist_ok=True)
-
-    # Outlet discovery
-    outlets_json.write_text(
-        json.dumps(outlets, ensure_ascii=False, indent=2) + "\n", encoding="utf-8",
-    )
-    print(f"  Outlet JSON : {outlets_json} ({len(outlets)} outlets)")
+def open_cache(args: argparse.Namespace) -> PayloadCache | None:
+    if args.no_cache:
+        return None
+    return PayloadCache(Path(args.cache_dir), max_bytes=args.cache_max_mb * 1024 ** 2)
 
-    # Menu JSON
-    menus_json.write_text(
-        json.dumps(menu_results, ensure_ascii=False, indent=2) + "\n", encoding="utf-8",
-    )
-    print(f"  Menu JSON   : {menus_json}")
 
-    # Menu CSV
-    rows = flatten_to_csv_rows(menu_results)
-    with menus_csv.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
-        writer.writeheader()
-        writer.writerows(rows)
-    print(f"  Menu CSV    : {menus_csv} ({len(rows)} rows)")
+def add_queue_args(parser: argparse.ArgumentParser) -> None:
+    """Flag CLI antrian outlet durable untuk step 3 (resume per outlet)."""
+    parser.add_argument("--queue-db", default=str(DEFAULT_QUEUE_DB),
+                        help=f"Path database antrian outlet (default: {DEFAULT_QUEUE_DB}).")
+    parser.add_argument("--no-queue", action="store_true",
+                        help="Jangan pakai antrian; crash berarti ulang dari awal.")
+
+
+def open_queue(args: argparse.Namespace) -> OutletQueue | None:
+    if args.no_queue:
+        return None
+    return OutletQueue(Path(args.queue_db))
+
+
+def resume_outlets(queue: OutletQueue, namespace: str, outlets_path: Path) -> tuple[list[dict], list[dict]]:
+    """Resume dari antrian tanpa step 2. Return (outlets untuk disimpan, target step 3).
+
+    Antrian hanya berisi target step 3 (`--limit`), jadi daftar outlet area
+    diambil dari daftar discovery yang disimpan di antrian; run lama/stream
+    yang crash sebelum discovery selesai memakai snapshot outlet sebelumnya
+    ditambah target. Snapshot tidak pernah menyusut jadi daftar target saja.
+    """
+    targets = queue.outlets(namespace)
+    outlets = queue.discovered(namespace)
+    if outlets is None:
+        by_uid = load_seed(outlets_path)
+        source = "snapshot sebelumnya" if by_uid else "antrian saja"
+        for outlet in targets:
+            by_uid.setdefault(outlet["uid"], outlet)
+        outlets = sorted(by_uid.values(), key=lambda o: o.get("name", ""))
+    else:
+        source = "discovery tersimpan"
+    print(f"\n[RESUME] {len(targets)} target dari antrian {namespace}, "
+          f"{len(outlets)} outlet ({source}), skip step 2.")
+    return outlets, targets
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -585,6 +919,7 @@ def main() -> int:
 Contoh:
   python3 developer_test_scrapping.py --area surabaya --locality sukolilo-restaurants --limit 3
   python3 developer_test_scrapping.py --area surabaya --locality gubeng-restaurants --limit 10 --headful
+  python3 developer_test_scrapping.py --locality gubeng-restaurants --limit 20 --schedule priority
         """,
     )
 
@@ -610,14 +945,32 @@ Contoh:
     parser.add_argument("--wait-ms", type=int, default=8000,
                         help="Extra wait setelah page load, ms (default: 8000).")
     parser.add_argument("--delay-min", type=float, default=3.0,
-                        help="Delay minimum antar outlet (detik).")
+                        help="Batas bawah jeda adaptif antar outlet (detik).")
     parser.add_argument("--delay-max", type=float, default=7.0,
-                        help="Delay maksimum antar outlet (detik).")
+                        help="Batas atas jeda adaptif antar outlet (detik).")
 
     # Browser
     parser.add_argument("--headful", action="store_true",
                         help="Jalankan browser non-headless (visual).")
 
+    # Output
+    add_output_format_args(parser)
+    add_base_url_args(parser)
+    add_net_accounting_args(parser)
+    add_cache_args(parser)
+    add_queue_args(parser)
+    add_schedule_args(parser)
+    add_retry_args(parser)
+    add_session_args(parser)
+    add_checkpoint_args(parser)
+    add_warm_start_args(parser)
+    add_metrics_args(parser)
+    add_memory_args(parser)
+    add_har_args(parser)
+    add_stream_args(parser)
+    add_response_filter_args(parser)
+    add_intercept_worker_args(parser)
+
     args = parser.parse_args()
     # ── Derived paths ──
     storage_state = OUTPUT_DIR / "session" / "gofood_storage_state.json"
@@ -625,10 +978,24 @@ Contoh:
     menus_json = OUTPUT_DIR / "json" / f"gofood_{args.locality}_menus.json"
     menus_csv = OUTPUT_DIR / "csv" / f"gofood_{args.locality}_menus.csv"
 
-    listing_url = f"https://gofood.co.id/{args.area}/{args.locality}"
+    listing_url = f"{args.base_url.rstrip('/')}/{args.area}/{args.locality}"
     nearme_url = f"{listing_url}/near-me/"
 
     storage_state.parent.mkdir(parents=True, exist_ok=True)
+    cache = open_cache(args)
+    queue = open_queue(args)
+    retry, breaker = open_retry(args)
+    metrics = open_metrics(args)
+    rfilter = open_response_filter(args, metrics)
+    net = None if args.no_net_accounting else NetworkAccountant(args.locality)
+    har = open_har(args)
+    # Probe session lewat APIRequestContext tidak ikut di-route HAR → step 1 selalu jalan
+    guard = None if har is not None else open_session_guard(args)
+    profiler = open_memory_profiler(args, OUTPUT_DIR / "json" / f"gofood_{args.locality}_memory.json")
+    stream = args.stream
+    if stream and args.schedule == "priority":
+        print("[WARN] --schedule priority butuh daftar outlet lengkap; --stream dimatikan.")
+        stream = False
 
     print(f"\n{'#'*60}")
     print(f"  GoFood E2E Pipeline")
@@ -642,35 +1009,89 @@ Contoh:
         browser = pw.chromium.launch(headless=not args.headful, args=BROWSER_ARGS)
 
         # ── STEP 1 ──
-        ok = step1_session_bootstrap(browser, listing_url, storage_state, args.wait_ms)
+        ok, _ = ensure_session(
+            browser, listing_url, storage_state, args.wait_ms, guard, net, har,
+        )
         if not ok:
             print("\n[ABORT] Session bootstrap gagal. Coba dengan --headful.")
             browser.close()
+            if metrics is not None:
+                metrics.close()
+            if profiler is not None:
+                profiler.close()
             return 1
-
-        # ── STEP 2 ──
-        outlets = step2_outlet_discovery(
-            browser, nearme_url, args.area, storage_state,
-            args.max_scrolls, args.patience, args.scroll_delay, args.wait_ms,
-        )
+        if profiler is not None:
+            profiler.checkpoint("step1", browser)
+
+        # ── STEP 2 ── (dilewati jika antrian run sebelumnya belum selesai)
+        menu_results = None
+        if stream:
+            # Step 2 + 3 bersamaan; resume antrian = discovery diulang, outlet selesai dilewati
+            outlets, menu_results = step23_stream(
+                browser, nearme_url, args.area, storage_state,
+                args.max_scrolls, args.patience, args.scroll_delay,
+                args.limit, args.wait_ms, args.delay_min, args.delay_max,
+                buffer=args.stream_buffer, headless=not args.headful,
+                cache=cache, namespace=args.locality, queue=queue,
+                retry=retry, breaker=breaker,
+                checkpoint=open_checkpoint(args, args.locality),
+                warm=open_warm_start(args, outlets_json),
+                metrics=metrics, net=net, profiler=profiler, har=har, rfilter=rfilter,
+                workers=args.intercept_workers,
+            )
+        elif queue is not None and queue.has_open(args.locality):
+            outlets, targets = resume_outlets(queue, args.locality, outlets_json)
+        else:
+            outlets = step2_outlet_discovery(
+                browser, nearme_url, args.area, storage_state,
+                args.max_scrolls, args.patience, args.scroll_delay, args.wait_ms,
+                cache=cache, namespace=args.locality,
+                checkpoint=open_checkpoint(args, args.locality),
+                warm=open_warm_start(args, outlets_json),
+                metrics=metrics, net=net, har=har, rfilter=rfilter,
+                workers=args.intercept_workers,
+            )
+            if queue is not None:
+                queue.set_discovered(args.locality, outlets)
+            # --limit = budget request step 3; --schedule priority isi dengan outlet paling bernilai
+            targets = schedule_outlets(outlets, args, menus_json, cache, args.locality)
+            if profiler is not None:
+                profiler.checkpoint("step2", browser)
         if not outlets:
             print("\n[ABORT] Tidak ada outlet ditemukan.")
             browser.close()
+            if metrics is not None:
+                metrics.close()
+            if profiler is not None:
+                profiler.close()
             return 1
 
         # ── STEP 3 ──
-        menu_results = step3_batch_menu(
-            browser, outlets, storage_state,
-            args.limit, args.wait_ms, args.delay_min, args.delay_max,
-        )
+        if menu_results is None:
+            menu_results = step3_batch_menu(
+                browser, targets, storage_state,
+                args.limit, args.wait_ms, args.delay_min, args.delay_max,
+                cache=cache, namespace=args.locality, queue=queue,
+                retry=retry, breaker=breaker, metrics=metrics, net=net, profiler=profiler,
+                har=har,
+            )
+        if profiler is not None:
+            profiler.checkpoint("step3", browser)
 
         browser.close()
+    if har is not None:
+        har.write_manifest()
 
     # ── SAVE ──
     print(f"\n{'='*60}")
     print("[OUTPUT] Menyimpan hasil...")
     print(f"{'='*60}")
-    save_outputs(outlets, menu_results, outlets_json, menus_json, menus_csv)
+    save_outputs(
+        outlets, menu_results, outlets_json, menus_json, menus_csv,
+        fmt=args.format, compression=args.compress, compact=args.compact_json,
+    )
+    if queue is not None:
+        queue.clear(args.locality)
 
     # ── SUMMARY ──
     success = sum(1 for r in menu_results if r.get("status") == "success")
@@ -687,7 +1108,13 @@ Contoh:
     print(f"  Success           : {success}")
     print(f"  Error             : {errors}")
     print(f"  Total menu items  : {total_items}")
+    if net is not None:
+        net.report()
     print(f"{'='*60}\n")
+    if metrics is not None:
+        metrics.close()
+    if profiler is not None:
+        profiler.close()
 
     return 0
 
@@ -0,0 +1,110 @@
+"""
+Discovery Checkpoint — snapshot outlet hasil step 2 selama scroll panjang
+=========================================================================
+`step2_outlet_discovery` menyimpan outlet unik di memori sampai scroll loop
+selesai (sampai 500 scroll di `scrap_sby.py`). Checkpoint menulis snapshot
+set outlet ke disk setiap `every` outlet baru (atomic: tmp + rename), dan
+sekali lagi saat loop berhenti — termasuk karena exception/crash browser.
+
+Run berikutnya untuk namespace yang sama memuat snapshot sebagai seed, lalu
+scroll melanjutkan. Outlet dari checkpoint yang terlihat lagi dianggap
+"mengejar" posisi terakhir (tidak menambah stale streak), tapi hanya UID
+yang benar-benar baru yang dihitung sebagai temuan.
+
+Layout:
+  output/session/checkpoints/gofood_<namespace>_discovery.json
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# ── Defaults ────────────────────────────────────────────────────────
+WIB = timezone(timedelta(hours=7))
+DEFAULT_CHECKPOINT_DIR = Path("output/session/checkpoints")
+DEFAULT_EVERY = 25                 # outlet baru per checkpoint
+DEFAULT_MAX_AGE = 24 * 3600        # checkpoint lebih tua dari ini diabaikan
+CHECKPOINT_VERSION = 1
+
+
+class DiscoveryCheckpoint:
+    """Snapshot atomik outlet step 2 untuk satu namespace (locality)."""
+
+    def __init__(
+        self, namespace: str, checkpoint_dir: Path = DEFAULT_CHECKPOINT_DIR,
+        every: int = DEFAULT_EVERY, max_age: float = DEFAULT_MAX_AGE,
+    ):
+        self.namespace = namespace
+        self.path = Path(checkpoint_dir) / f"gofood_{namespace}_discovery.json"
+        self.every = max(1, every)
+        self.max_age = max_age
+        self.saved_count = 0
+        self.saves = 0
+
+    def load(self) -> tuple[dict[str, dict], int]:
+        """Return (outlets_by_uid, scrolls) dari checkpoint; kosong jika tidak ada/basi."""
+        try:
+            age = time.time() - self.path.stat().st_mtime
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}, 0
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"  [CHECKPOINT] Diabaikan, tidak terbaca: {exc}")
+            return {}, 0
+        if age > self.max_age or data.get("version") != CHECKPOINT_VERSION:
+            print(f"  [CHECKPOINT] Diabaikan (umur {age / 3600:.1f} jam / versi lain).")
+            return {}, 0
+        outlets = {o["uid"]: o for o in data.get("outlets", []) if o.get("uid")}
+        self.saved_count = len(outlets)
+        return outlets, int(data.get("scrolls", 0))
+
+    def save(self, outlets_by_uid: dict[str, dict], scrolls: int) -> None:
+        """Tulis snapshot secara atomic (tmp + rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": CHECKPOINT_VERSION,
+            "namespace": self.namespace,
+            "saved_at": datetime.now(WIB).isoformat(),
+            "scrolls": scrolls,
+            "outlets": list(outlets_by_uid.values()),
+        }
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.saved_count = len(outlets_by_uid)
+        self.saves += 1
+
+    def maybe_save(self, outlets_by_uid: dict[str, dict], scrolls: int) -> bool:
+        """Simpan jika sudah ada >= `every` outlet baru sejak checkpoint terakhir."""
+        if len(outlets_by_uid) - self.saved_count < self.every:
+            return False
+        self.save(outlets_by_uid, scrolls)
+        print(f"    [CHECKPOINT] {len(outlets_by_uid)} outlet disimpan")
+        return True
+
+    def flush(self, outlets_by_uid: dict[str, dict], scrolls: int) -> None:
+        """Simpan sisa outlet yang belum ter-checkpoint (dipanggil saat loop berhenti)."""
+        if len(outlets_by_uid) != self.saved_count:
+            self.save(outlets_by_uid, scrolls)
+
+    def clear(self) -> None:
+        """Hapus checkpoint setelah discovery selesai dengan normal."""
+        self.path.unlink(missing_ok=True)
+
+
+def add_checkpoint_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--checkpoint-every", type=int, default=DEFAULT_EVERY,
+                        help=f"Checkpoint discovery setiap N outlet baru (default: {DEFAULT_EVERY}, "
+                             f"0 = nonaktif).")
+
+
+def open_checkpoint(args: argparse.Namespace, namespace: str) -> DiscoveryCheckpoint | None:
+    if getattr(args, "checkpoint_every", 0) <= 0:
+        return None
+    return DiscoveryCheckpoint(namespace, every=args.checkpoint_every)
@@ -0,0 +1,406 @@
+"""
+Fixture Server — stand-in GoFood lokal untuk benchmark end-to-end offline
+=========================================================================
+Menyajikan halaman yang bentuknya sama dengan gofood.co.id, dibangun dari
+fixture di `output/fixtures/` (salinan `output/`):
+
+  GET /<city>/<locality>                 listing (shell HTML + __NEXT_DATA__)
+  GET /<city>/<locality>/near-me/        batch outlet pertama di __NEXT_DATA__,
+                                         script scroll → fetch feed berikutnya
+  GET /api/feed/near-me?locality=&page=  feed JSON ber-halaman (--page-size)
+  GET /<city>/restaurant/<slug>-<uid>    profil outlet, menu di __NEXT_DATA__
+  GET /__stats                           counter request / error yang disuntik
+
+Sumber fixture (relatif ke --fixtures-dir):
+  - json/gofood_<locality>_outlets.json → daftar outlet per locality
+  - json/gofood_<locality>_menus.json   → katalog menu per outlet
+  - json/gofood_next_data.json          → template __NEXT_DATA__ listing
+  - json/gofood_profile_mapan.json      → template __NEXT_DATA__ profil
+  - html/gofood_playwright_output.html  → shell HTML (script/CSS eksternal dibuang)
+  - html/gofood_raw_output.html         → halaman challenge anti-bot
+
+Record hasil normalisasi di-"denormalisasi" kembali ke bentuk payload GoFood,
+jadi parser step 2/3 menghasilkan record yang sama dengan fixture.
+
+Knob: --latency-ms/--jitter-ms (delay tiap respons), --error-rate (HTTP 503),
+--challenge-rate (halaman challenge HTTP 403), --page-size (outlet per halaman feed).
+
+Usage:
+  python3 fixture_server.py --init-from output --port 8800 --latency-ms 150 --error-rate 0.02
+  python3 developer_test_scrapping.py --base-url http://127.0.0.1:8800 \\
+      --locality gubeng-restaurants --limit 20 --delay-min 0 --delay-max 1
+
+Scraper menulis ke output/json, jadi server menolak start jika --fixtures-dir
+menunjuk ke output/ itu sendiri. `--init-from output` menyalin json/ dan html/
+ke --fixtures-dir sekali (hanya jika direktori itu belum ada).
+"""
+
+import argparse
+import json
+import random
+import re
+import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from gofood_core import OUTPUT_DIR
+from output_formats import is_record_file, iter_records
+
+# ── Defaults ────────────────────────────────────────────────────────
+DEFAULT_PORT = 8800
+DEFAULT_FIXTURES_DIR = OUTPUT_DIR / "fixtures"
+DEFAULT_PAGE_SIZE = 12
+SESSION_COOKIE_MAX_AGE = 6 * 3600
+
+FEED_PATH = "/api/feed/near-me"
+_OUTLETS_FILE_RE = re.compile(r"^gofood_(.+)_outlets\.jsonl?(\.gz|\.zst)?$")
+_UID_RE = re.compile(r"([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})/?$")
+_NEXT_DATA_RE = re.compile(
+    r'(<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>)(.*?)(</script>)', re.IGNORECASE | re.DOTALL,
+)
+
+# Shell HTML asli memuat script Next.js, GTM, CSS & gambar dari CDN — dibuang
+# supaya browser tidak keluar dari server lokal (dan networkidle cepat tercapai).
+_STRIP_RES = (
+    re.compile(r'<script\b(?![^>]*(?:__NEXT_DATA__|ld\+json))[^>]*>.*?</script>', re.IGNORECASE | re.DOTALL),
+    re.compile(r"<link\b[^>]*>", re.IGNORECASE),
+    re.compile(r'\s(?:src|srcset)="https?://[^"]*"', re.IGNORECASE),
+    re.compile(r"url\((['\"]?)https?://[^)]*\)", re.IGNORECASE),
+)
+
+SCROLL_SCRIPT = """<script>
+(function () {
+  var page = 1, loading = false, done = %(done)s;
+  function more() {
+    if (loading || done) return;
+    if (window.innerHeight + window.scrollY < document.body.scrollHeight - 200) return;
+    loading = true;
+    fetch("%(feed)s?locality=%(locality)s&page=" + page)
+      .then(function (r) { return r.json(); })
+      .then(function (body) {
+        body.data.outlets.forEach(function (o) {
+          var div = document.createElement("div");
+          div.style.height = "120px";
+          div.textContent = o.core.displayName;
+          document.body.appendChild(div);
+        });
+        page += 1; done = body.nextPage === null; loading = false;
+      })
+      .catch(function () { loading = false; });
+  }
+  window.addEventListener("scroll", more);
+})();
+</script>"""
+
+
+# ── Denormalisasi fixture → payload GoFood ─────────────────────────
+
+def raw_outlet(outlet: dict) -> dict:
+    """Record outlet ternormalisasi → objek outlet seperti di feed/__NEXT_DATA__."""
+    return {
+        "uid": outlet["uid"],
+        "path": outlet.get("path", ""),
+        "core": {
+            "uid": outlet["uid"],
+            "displayName": outlet.get("name", ""),
+            "status": outlet.get("status"),
+            "location": {"latitude": outlet.get("latitude"), "longitude": outlet.get("longitude")},
+        },
+        "ratings": {"average": outlet.get("rating_average"), "total": outlet.get("rating_total")},
+        "delivery": {"distanceKm": outlet.get("delivery_distance_km")},
+        "priceLevel": outlet.get("price_level"),
+    }
+
+
+def raw_catalog(record: dict) -> list[dict]:
+    """Record menu ternormalisasi → `outlet.catalog.sections` GoFood."""
+    sections = []
+    for section in record.get("menu_sections", []):
+        sections.append({
+            "uid": section.get("section_uid", ""),
+            "displayName": section.get("section_name", ""),
+            "type": section.get("section_type"),
+            "items": [
+                {
+                    "uid": item.get("item_uid", ""),
+                    "displayName": item.get("item_name", ""),
+                    "description": item.get("item_description", ""),
+                    "status": item.get("item_status"),
+                    "price": {"units": item.get("price_units"), "currencyCode": item.get("currency_code", ""),
+                              "nanos": 0},
+                    "imageUrl": item.get("image_url", ""),
+                    "variants": [{}] * (item.get("variant_count") or 0),
+                }
+                for item in section.get("items", [])
+            ],
+        })
+    return sections
+
+
+# ── Fixture store ──────────────────────────────────────────────────
+
+class FixtureStore:
+    """Outlet per locality, menu per uid, dan template halaman dari direktori fixture."""
+
+    def __init__(self, fixtures_dir: Path = DEFAULT_FIXTURES_DIR):
+        json_dir = Path(fixtures_dir) / "json"
+        html_dir = Path(fixtures_dir) / "html"
+
+        self.outlets: dict[str, list[dict]] = {}
+        for path in sorted(json_dir.glob("gofood_*_outlets.*")):
+            match = _OUTLETS_FILE_RE.match(path.name)
+            if match and is_record_file(path):
+                self.outlets[match.group(1)] = [o for o in iter_records(path) if o.get("uid")]
+        self.by_uid = {o["uid"]: o for outlets in self.outlets.values() for o in outlets}
+
+        self.menus: dict[str, dict] = {}
+        for locality in self.outlets:
+            for path in filter(is_record_file, json_dir.glob(f"gofood_{locality}_menus.*")):
+                for record in iter_records(path):
+                    if record.get("status") != "success":
+                        continue
+                    # Outlet bisa muncul di beberapa locality — pakai scrape terbaru
+                    current = self.menus.get(record["restaurant_uid"])
+                    if current is None or record.get("scraped_at", "") > current.get("scraped_at", ""):
+                        self.menus[record["restaurant_uid"]] = record
+
+        self.listing_template = json.loads((json_dir / "gofood_next_data.json").read_text(encoding="utf-8"))
+        self.profile_template = json.loads((json_dir / "gofood_profile_mapan.json").read_text(encoding="utf-8"))
+        self.challenge_html = (html_dir / "gofood_raw_output.html").read_text(encoding="utf-8")
+
+        shell = (html_dir / "gofood_playwright_output.html").read_text(encoding="utf-8")
+        for pattern in _STRIP_RES:
+            shell = pattern.sub("", shell)
+        match = _NEXT_DATA_RE.search(shell)
+        self.shell_head = shell[:match.end(1)]
+        self.shell_tail = shell[match.start(3):]
+
+    def render(self, next_data: dict, extra_script: str = "") -> str:
+        """Shell HTML dengan __NEXT_DATA__ diganti (dan script tambahan sebelum </body>)."""
+        payload = json.dumps(next_data, ensure_ascii=False).replace("</", "<\\/")
+        tail = self.shell_tail
+        if extra_script:
+            tail = tail.replace("</body>", extra_script + "</body>", 1)
+        return self.shell_head + payload + tail
+
+    def listing_page(self, city: str, locality: str, outlets: list[dict] | None = None,
+                     near_me: bool = False) -> dict:
+        """__NEXT_DATA__ listing; near-me → satu section OUTLET berisi batch pertama."""
+        page_props = dict(self.listing_template["props"]["pageProps"])
+        if near_me:
+            page_props["contents"] = [{
+                "title": "Terdekat", "description": "", "type": "OUTLET", "showAll": False,
+                "data": [raw_outlet(o) for o in outlets or []],
+            }]
+        return {
+            **self.listing_template,
+            "page": "/[service_area]/[locality]/near_me" if near_me else "/[service_area]/[locality]",
+            "query": {"service_area": city, "locality": locality},
+            "props": {**self.listing_template["props"], "pageProps": page_props},
+        }
+
+    def profile_page(self, outlet: dict) -> dict:
+        """__NEXT_DATA__ profil outlet dengan katalog dari fixture menu (kosong jika tidak ada)."""
+        template_props = self.profile_template["props"]["pageProps"]
+        base = raw_outlet(outlet)
+        record = self.menus.get(outlet["uid"], {})
+        page_props = {
+            **template_props,
+            "outlet": {**template_props["outlet"], **base,
+                       "core": {**template_props["outlet"]["core"], **base["core"]},
+                       "catalog": {"sections": raw_catalog(record)}},
+            "outletUrl": outlet.get("path", ""),
+        }
+        return {**self.profile_template, "props": {**self.profile_template["props"], "pageProps": page_props}}
+
+
+# ── HTTP ───────────────────────────────────────────────────────────
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, store: FixtureStore, page_size: int = DEFAULT_PAGE_SIZE,
+                 latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0, challenge_rate: float = 0, seed: int | None = None):
+        super().__init__(address, _Handler)
+        self.store = store
+        self.page_size = max(1, page_size)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.challenge_rate = challenge_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats: dict[str, int] = {}
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def roll(self, rate: float) -> bool:
+        with self._lock:
+            return rate > 0 and self._rng.random() < rate
+
+    def delay(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "GoFoodFixture/1.0"
+
+    def _send(self, status: int, body: str, content_type: str = "text/html; charset=utf-8",
+              cookie: bool = False) -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if cookie:
+            self.send_header("Set-Cookie", f"gf_session={int(time.time())}; Path=/; "
+                                           f"Max-Age={SESSION_COOKIE_MAX_AGE}; SameSite=Lax")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status: int, body: dict) -> None:
+        self._send(status, json.dumps(body, ensure_ascii=False), "application/json")
+
+    def do_GET(self):
+        srv: FixtureServer = self.server
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+
+        if url.path == "/__stats":
+            self._send_json(200, dict(srv.stats))
+            return
+        if url.path == "/favicon.ico":
+            self._send(404, "")
+            return
+
+        time.sleep(srv.delay())
+
+        if url.path == FEED_PATH:
+            kind = "feed"
+        elif len(parts) == 3 and parts[1] == "restaurant":
+            kind = "profile"
+        elif len(parts) == 3 and parts[2] == "near-me":
+            kind = "nearme"
+        elif len(parts) == 2:
+            kind = "listing"
+        else:
+            srv.count("not_found")
+            self._send(404, "not found", "text/plain")
+            return
+        srv.count(kind)
+
+        # Error & challenge disuntik ke request yang di-retry pipeline (feed & profil)
+        if kind in ("feed", "profile") and srv.roll(srv.error_rate):
+            srv.count("injected_error")
+            self._send(503, "service unavailable", "text/plain")
+            return
+        if kind == "profile" and srv.roll(srv.challenge_rate):
+            srv.count("injected_challenge")
+            self._send(403, srv.store.challenge_html)
+            return
+
+        if kind == "feed":
+            query = parse_qs(url.query)
+            locality = query.get("locality", [""])[0]
+            page = int(query.get("page", ["1"])[0] or 1)
+            outlets = srv.store.outlets.get(locality, [])
+            chunk = outlets[page * srv.page_size:(page + 1) * srv.page_size]
+            has_next = (page + 1) * srv.page_size < len(outlets)
+            self._send_json(200, {
+                "data": {"outlets": [raw_outlet(o) for o in chunk]},
+                "page": page, "nextPage": page + 1 if has_next else None,
+            })
+        elif kind == "profile":
+            match = _UID_RE.search(parts[2])
+            outlet = srv.store.by_uid.get(match.group(1)) if match else None
+            if outlet is None:
+                self._send(404, "outlet tidak ditemukan", "text/plain")
+                return
+            self._send(200, srv.store.render(srv.store.profile_page(outlet)))
+        else:
+            city, locality = parts[0], parts[1]
+            outlets = srv.store.outlets.get(locality)
+            if outlets is None:
+                self._send(404, "locality tidak ada di fixture", "text/plain")
+                return
+            if kind == "listing":
+                self._send(200, srv.store.render(srv.store.listing_page(city, locality)), cookie=True)
+                return
+            first = outlets[:srv.page_size]
+            script = SCROLL_SCRIPT % {
+                "done": "true" if len(outlets) <= srv.page_size else "false",
+                "feed": FEED_PATH, "locality": locality,
+            }
+            self._send(200, srv.store.render(srv.store.listing_page(city, locality, first, near_me=True),
+                                             script), cookie=True)
+
+    def log_message(self, fmt, *args):
+        pass  # ringkasan per jenis request tersedia di /__stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Server GoFood lokal berbasis fixture untuk benchmark offline.")
+    parser.add_argument("--host", default="127.0.0.1", help="Alamat bind (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port HTTP (default: {DEFAULT_PORT}).")
+    parser.add_argument("--fixtures-dir", default=str(DEFAULT_FIXTURES_DIR),
+                        help=f"Direktori berisi json/ dan html/ fixture (default: {DEFAULT_FIXTURES_DIR}); "
+                             f"tidak boleh {OUTPUT_DIR}/ karena output scraper menimpanya.")
+    parser.add_argument("--init-from", default=None, metavar="DIR",
+                        help="Salin json/ dan html/ dari DIR ke --fixtures-dir jika belum ada (mis. output).")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f"Outlet per halaman near-me/feed (default: {DEFAULT_PAGE_SIZE}).")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay dasar tiap respons, ms.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Variasi ± delay, ms.")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Peluang HTTP 503 pada feed & profil (0..1).")
+    parser.add_argument("--challenge-rate", type=float, default=0.0,
+                        help="Peluang halaman challenge (HTTP 403) pada profil (0..1).")
+    parser.add_argument("--seed", type=int, default=None, help="Seed RNG supaya error/latency repeatable.")
+    args = parser.parse_args()
+
+    fixtures_dir = Path(args.fixtures_dir)
+    if fixtures_dir.resolve() == OUTPUT_DIR.resolve():
+        print(f"[ERROR] --fixtures-dir {fixtures_dir} adalah direktori output scraper; run benchmark "
+              f"akan menimpa fixture. Pakai salinan: --init-from {OUTPUT_DIR} --fixtures-dir {DEFAULT_FIXTURES_DIR}")
+        return 2
+    if args.init_from and not fixtures_dir.exists():
+        for sub in ("json", "html"):
+            shutil.copytree(Path(args.init_from) / sub, fixtures_dir / sub)
+        print(f"[INFO] Fixture disalin: {args.init_from} → {fixtures_dir}")
+    if not (fixtures_dir / "json").is_dir():
+        print(f"[ERROR] Fixture tidak ditemukan di {fixtures_dir}/json — "
+              f"buat dulu dengan --init-from {OUTPUT_DIR} atau synthetic_data.py generate --out {fixtures_dir}")
+        return 2
+
+    t0 = time.monotonic()
+    store = FixtureStore(fixtures_dir)
+    server = FixtureServer(
+        (args.host, args.port), store, page_size=args.page_size,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, challenge_rate=args.challenge_rate, seed=args.seed,
+    )
+    print(f"[INFO] Fixture dimuat {time.monotonic() - t0:.1f}s: {len(store.outlets)} locality, "
+          f"{len(store.by_uid)} outlet, {len(store.menus)} menu")
+    for locality, outlets in store.outlets.items():
+        print(f"  - {locality}: {len(outlets)} outlet")
+    print(f"[INFO] Fixture server di http://{args.host}:{args.port} "
+          f"(page {server.page_size}, latency {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms, "
+          f"error {args.error_rate:.0%}, challenge {args.challenge_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n[INFO] Berhenti. Statistik: {json.dumps(server.stats)}")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,332 @@
+"""
+GoFood Core — parsing, normalisasi, dan output tanpa Playwright
+===============================================================
+Bagian pipeline yang tidak butuh browser: normalisasi outlet dari payload
+API/__NEXT_DATA__, parse katalog menu, flatten CSV, dan tulis output.
+Modul ini hanya bergantung pada stdlib + `output_formats`, jadi tool offline
+(`reparse.py`, `merge_outputs.py`, `synthetic_data.py`, coordinator) bisa
+mengimpornya tanpa Playwright terpasang dan tanpa membayar biaya import-nya.
+
+`developer_test_scrapping.py` mengimpor ulang semua nama di sini, jadi
+`from developer_test_scrapping import _parse_menu` tetap berfungsi.
+Cold-start import tiap entry point bisa diukur dengan `import_timing.py`.
+"""
+
+import argparse
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import json_codec
+from outlet_fields import build_outlet_record
+from output_formats import COMPRESSION_SUFFIX, FORMATS, with_format, write_csv, write_records
+
+# ── Constants ───────────────────────────────────────────────────────
+WIB = timezone(timedelta(hours=7))
+OUTPUT_DIR = Path("output")
+DEFAULT_BASE_URL = "https://gofood.co.id"
+
+API_URL_HINTS = (
+    "graphql", "api", "search", "outlet", "restaurant", "explore",
+    "discover", "nearby", "listing", "catalog", "feed",
+)
+
+CSV_COLUMNS = [
+    "restaurant_uid", "restaurant_name", "restaurant_url", "scraped_at",
+    "status", "section_uid", "section_name", "section_type",
+    "item_uid", "item_name", "item_description", "item_status",
+    "price_units", "currency_code", "image_url", "variant_count",
+]
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  OUTLET — NORMALISASI
+# ═══════════════════════════════════════════════════════════════════
+
+def _slugify(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    text = text.lower()
+    text = re.sub(r"[^a-z0-9]+", "-", text)
+    return text.strip("-")
+
+
+def _is_outlet(obj: dict) -> bool:
+    if not isinstance(obj, dict):
+        return False
+    has_uid = "uid" in obj
+    has_core = isinstance(obj.get("core"), dict) and "displayName" in obj.get("core", {})
+    has_name = "displayName" in obj
+    return has_uid and (has_core or has_name)
+
+
+def _is_real_outlet(uid: str, core: dict) -> bool:
+    if uid.startswith("CUISINE_"):
+        return False
+    if not core:
+        return False
+    location = core.get("location")
+    if not isinstance(location, dict):
+        return False
+    return location.get("latitude") is not None and location.get("longitude") is not None
+
+
+def _extract_outlets_recursive(node) -> list[dict]:
+    results = []
+    if isinstance(node, dict):
+        if _is_outlet(node):
+            results.append(node)
+        for v in node.values():
+            results.extend(_extract_outlets_recursive(v))
+    elif isinstance(node, list):
+        for item in node:
+            results.extend(_extract_outlets_recursive(item))
+    return results
+
+
+def _origin(url: str) -> str:
+    """`scheme://host` dari URL halaman; fallback ke DEFAULT_BASE_URL."""
+    parts = urlsplit(url or "")
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme and parts.netloc else DEFAULT_BASE_URL
+
+
+def _normalize_outlet(raw: dict, service_area: str, base_url: str = DEFAULT_BASE_URL) -> dict | None:
+    """Outlet mentah → record bersih (field dari `outlet_fields.OUTLET_FIELDS`). None jika invalid."""
+    uid = raw.get("uid")
+    if not uid:
+        return None
+
+    core = raw.get("core")
+    if not isinstance(core, dict) or not _is_real_outlet(uid, core):
+        return None
+
+    display_name = core.get("displayName") or raw.get("displayName") or ""
+    if not display_name:
+        return None
+
+    path = raw.get("path", "") or ""
+    if not path and service_area and display_name:
+        slug = _slugify(display_name)
+        path = f"/{service_area}/restaurant/{slug}-{uid}"
+    full_url = f"{base_url}{path}" if path else ""
+
+    return build_outlet_record(raw, uid, display_name, path, full_url)
+
+
+_NEXT_DATA_RE = re.compile(
+    r'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def _extract_next_data_text(html: str) -> str | None:
+    """Ambil teks JSON mentah di dalam tag __NEXT_DATA__ (None jika tidak ada)."""
+    match = _NEXT_DATA_RE.search(html)
+    return match.group(1).strip() if match else None
+
+
+def _extract_next_data_outlets(html: str) -> list[dict]:
+    raw = _extract_next_data_text(html)
+    if raw is None:
+        return []
+    try:
+        payload = json_codec.loads(raw)
+    except json_codec.JSONDecodeError:
+        return []
+    return _outlets_from_next_data(payload)
+
+
+def _outlets_from_next_data(payload: dict) -> list[dict]:
+    contents = payload.get("props", {}).get("pageProps", {}).get("contents", [])
+    outlets = []
+    for section in contents:
+        if not isinstance(section, dict):
+            continue
+        data = section.get("data")
+        if not isinstance(data, list):
+            continue
+        for item in data:
+            if isinstance(item, dict) and "uid" in item:
+                outlets.append(item)
+            for key in ("outlets", "items"):
+                nested = item.get(key) if isinstance(item, dict) else None
+                if isinstance(nested, list):
+                    for sub in nested:
+                        if isinstance(sub, dict) and "uid" in sub:
+                            outlets.append(sub)
+    return outlets
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  MENU — PARSE __NEXT_DATA__ PROFIL
+# ═══════════════════════════════════════════════════════════════════
+
+def _parse_menu(html: str) -> dict:
+    """Ekstrak __NEXT_DATA__ lalu parse menu sections."""
+    return _parse_menu_text(_extract_next_data_text(html))
+
+
+def _parse_menu_text(raw: str | None) -> dict:
+    """Parse menu dari teks JSON __NEXT_DATA__ (None = tag tidak ditemukan)."""
+    if raw is None:
+        return {"status": "error", "error": "__NEXT_DATA__ not found", "menu_sections": []}
+
+    try:
+        payload = json_codec.loads(raw)
+    except json_codec.JSONDecodeError:
+        return {"status": "error", "error": "JSON decode error", "menu_sections": []}
+
+    return _parse_menu_payload(payload)
+
+
+def _parse_menu_payload(payload: dict) -> dict:
+    """Parse outlet info + menu sections dari payload __NEXT_DATA__."""
+    page_props = payload.get("props", {}).get("pageProps", {})
+    outlet = page_props.get("outlet", {})
+    core = outlet.get("core", {}) if isinstance(outlet.get("core"), dict) else {}
+    catalog = outlet.get("catalog", {}) if isinstance(outlet.get("catalog"), dict) else {}
+    sections_raw = catalog.get("sections", [])
+
+    result = {
+        "restaurant_uid": outlet.get("uid") or core.get("uid") or "",
+        "restaurant_name": core.get("displayName") or "",
+        "restaurant_url": page_props.get("outletUrl") or "",
+        "status": "success" if sections_raw else "no_menu",
+        "menu_sections": [],
+    }
+
+    if not isinstance(sections_raw, list):
+        return result
+
+    for section in sections_raw:
+        if not isinstance(section, dict):
+            continue
+        items = []
+        for item in (section.get("items") or []):
+            if not isinstance(item, dict):
+                continue
+            price = item.get("price", {}) if isinstance(item.get("price"), dict) else {}
+            variants = item.get("variants", []) if isinstance(item.get("variants"), list) else []
+            items.append({
+                "item_uid": item.get("uid", ""),
+                "item_name": item.get("displayName", ""),
+                "item_description": item.get("description", ""),
+                "item_status": item.get("status"),
+                "price_units": price.get("units"),
+                "currency_code": price.get("currencyCode", ""),
+                "image_url": item.get("imageUrl", ""),
+                "variant_count": len(variants),
+            })
+        result["menu_sections"].append({
+            "section_uid": section.get("uid", ""),
+            "section_name": section.get("displayName", ""),
+            "section_type": section.get("type"),
+            "items": items,
+        })
+
+    return result
+
+
+def _finalize_menu_record(record: dict, uid: str, name: str, url: str, scraped_at: str) -> dict:
+    """Isi metadata dari data target jika tidak ada di halaman, set scraped_at."""
+    if not record.get("restaurant_uid"):
+        record["restaurant_uid"] = uid
+    if not record.get("restaurant_name"):
+        record["restaurant_name"] = name
+    if not record.get("restaurant_url"):
+        record["restaurant_url"] = url
+    record["scraped_at"] = scraped_at
+    return record
+
+
+def _error_record(uid: str, name: str, url: str, error: str, error_class: str) -> dict:
+    return {
+        "restaurant_uid": uid, "restaurant_name": name,
+        "restaurant_url": url, "scraped_at": datetime.now(WIB).isoformat(),
+        "status": "error", "error": error, "error_class": error_class, "menu_sections": [],
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  OUTPUT — JSON + CSV
+# ═══════════════════════════════════════════════════════════════════
+
+def flatten_to_csv_rows(results: list[dict]) -> list[dict]:
+    rows = []
+    for rec in results:
+        base = {
+            "restaurant_uid": rec.get("restaurant_uid", ""),
+            "restaurant_name": rec.get("restaurant_name", ""),
+            "restaurant_url": rec.get("restaurant_url", ""),
+            "scraped_at": rec.get("scraped_at", ""),
+            "status": rec.get("status", ""),
+        }
+        sections = rec.get("menu_sections", [])
+        if not sections:
+            rows.append({**base, **{k: "" for k in CSV_COLUMNS if k not in base}})
+            continue
+        for sec in sections:
+            sec_base = {**base,
+                "section_uid": sec.get("section_uid", ""),
+                "section_name": sec.get("section_name", ""),
+                "section_type": sec.get("section_type", ""),
+            }
+            items = sec.get("items", [])
+            if not items:
+                rows.append({**sec_base, **{k: "" for k in CSV_COLUMNS if k not in sec_base}})
+                continue
+            for item in items:
+                rows.append({**sec_base,
+                    "item_uid": item.get("item_uid", ""),
+                    "item_name": item.get("item_name", ""),
+                    "item_description": item.get("item_description", ""),
+                    "item_status": item.get("item_status", ""),
+                    "price_units": item.get("price_units", ""),
+                    "currency_code": item.get("currency_code", ""),
+                    "image_url": item.get("image_url", ""),
+                    "variant_count": item.get("variant_count", ""),
+                })
+    return rows
+
+
+def save_outputs(
+    outlets: list[dict], menu_results: list[dict],
+    outlets_json: Path, menus_json: Path, menus_csv: Path,
+    fmt: str = "json", compression: str = "none", compact: bool = False,
+) -> dict[str, Path]:
+    """Simpan semua output ke file.
+
+    `fmt` ("json"/"jsonl") dan `compression` ("none"/"gzip"/"zstd") mengganti
+    suffix path output; `compact` menulis JSON tanpa indent. File tanpa kompresi
+    mendapat sidecar index `<file>.idx` (lihat `record_index.py`). Return path final.
+    """
+    outlets_json = with_format(outlets_json, fmt, compression)
+    menus_json = with_format(menus_json, fmt, compression)
+    menus_csv = with_format(menus_csv, compression=compression)
+
+    # Outlet discovery
+    write_records(outlets_json, outlets, compact=compact, index_key="uid")
+    print(f"  Outlet JSON : {outlets_json} ({len(outlets)} outlets)")
+
+    # Menu JSON
+    write_records(menus_json, menu_results, compact=compact, index_key="restaurant_uid")
+    print(f"  Menu JSON   : {menus_json}")
+
+    # Menu CSV
+    n_rows = write_csv(
+        menus_csv, flatten_to_csv_rows(menu_results), CSV_COLUMNS, index_key="restaurant_uid",
+    )
+    print(f"  Menu CSV    : {menus_csv} ({n_rows} rows)")
+
+    return {"outlets": outlets_json, "menus": menus_json, "csv": menus_csv}
+
+
+def add_output_format_args(parser: argparse.ArgumentParser) -> None:
+    """Flag CLI format output, dipakai bersama oleh semua entry point."""
+    parser.add_argument("--format", choices=FORMATS, default="json",
+                        help="Format file outlet/menu: json (array) atau jsonl (default: json).")
+    parser.add_argument("--compress", choices=tuple(COMPRESSION_SUFFIX), default="none",
+                        help="Kompresi output JSON/JSONL/CSV (default: none).")
+    parser.add_argument("--compact-json", action="store_true",
+                        help="Tulis JSON tanpa indent (lebih kecil).")
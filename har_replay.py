@@ -0,0 +1,107 @@
+"""
+HAR Record/Replay — run deterministik untuk perbandingan performa
+=================================================================
+Membandingkan parser, wait strategy, atau konkurensi terhadap situs live
+selalu berisik (jumlah outlet berubah, latency naik-turun, WAF). Harness ini
+merekam seluruh traffic satu run `developer_test_scrapping.py` ke HAR lalu
+memutarnya ulang lewat routing HAR Playwright (`context.route_from_har`):
+
+  --har-record DIR   tiap context (step1/step2/step3) direkam ke
+                     DIR/<step>.har.zip (body disimpan sebagai lampiran zip)
+  --har-replay DIR   tiap context dilayani dari HAR yang sama; request yang
+                     tidak ada di HAR di-abort → run 100% offline
+
+Urutan context sama antara record dan replay, jadi context kedua di step
+yang sama memakai DIR/<step>_2.har.zip, dst. Saat record/replay, session
+guard dimatikan supaya step 1 selalu berjalan (probe session memakai
+APIRequestContext yang tidak ikut di-route HAR). Pakai `--no-queue` di kedua
+run supaya resume antrian tidak melewati step 2.
+
+Contoh:
+  python3 developer_test_scrapping.py --locality gubeng-restaurants --limit 20 --no-queue --har-record output/har/gubeng
+  python3 developer_test_scrapping.py --locality gubeng-restaurants --limit 20 --no-queue --har-replay output/har/gubeng --wait-ms 0
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from output_formats import atomic_open_text
+
+# ── Defaults ────────────────────────────────────────────────────────
+WIB = timezone(timedelta(hours=7))
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MANIFEST = "manifest.json"
+
+
+class HarHarness:
+    """Pasang perekam/pemutar HAR ke tiap context browser sesuai urutan step."""
+
+    def __init__(self, har_dir: Path, mode: str):
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f"Mode HAR tidak dikenal: {mode}")
+        self.har_dir = Path(har_dir)
+        self.mode = mode
+        self.files: list[str] = []
+        self._seen: dict[str, int] = {}
+        if mode == MODE_RECORD:
+            self.har_dir.mkdir(parents=True, exist_ok=True)
+        elif not self.har_dir.is_dir():
+            raise FileNotFoundError(f"Direktori HAR tidak ditemukan: {self.har_dir}")
+
+    def _path(self, step: str) -> Path:
+        n = self._seen[step] = self._seen.get(step, 0) + 1
+        return self.har_dir / (f"{step}.har.zip" if n == 1 else f"{step}_{n}.har.zip")
+
+    def attach(self, context, step: str) -> None:
+        """Panggil tepat setelah `browser.new_context()`, sebelum page dibuka."""
+        path = self._path(step)
+        self.files.append(path.name)
+        if self.mode == MODE_RECORD:
+            # HAR ditulis ke disk saat context.close()
+            context.route_from_har(str(path), update=True, update_content="attach", update_mode="full")
+            return
+        if not path.exists():
+            print(f"  [HAR] {path.name} tidak ada di rekaman — semua request context ini di-abort.")
+            context.route("**/*", lambda route: route.abort())
+            return
+        context.route_from_har(str(path), not_found="abort")
+
+    def write_manifest(self, argv: list[str] | None = None) -> None:
+        """Record: simpan argumen run + daftar HAR. Replay: bandingkan dengan rekaman."""
+        manifest_path = self.har_dir / MANIFEST
+        argv = list(sys.argv[1:] if argv is None else argv)
+        if self.mode == MODE_RECORD:
+            manifest = {"recorded_at": datetime.now(WIB).isoformat(), "argv": argv, "files": self.files}
+            with atomic_open_text(manifest_path) as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            print(f"  [HAR] Rekaman {len(self.files)} context: {self.har_dir}")
+            return
+        try:
+            recorded = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if recorded.get("files") != self.files:
+            print(f"  [HAR] Urutan context berbeda dari rekaman: {recorded.get('files')} vs {self.files} "
+                  f"— hasil replay mungkin tidak identik.")
+
+
+def add_har_args(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--har-record", metavar="DIR", default=None,
+                       help="Rekam seluruh traffic run ke HAR per step di DIR.")
+    group.add_argument("--har-replay", metavar="DIR", default=None,
+                       help="Putar ulang traffic dari rekaman HAR di DIR (offline, deterministik).")
+
+
+def open_har(args: argparse.Namespace) -> HarHarness | None:
+    if getattr(args, "har_record", None):
+        print(f"[INFO] HAR record → {args.har_record}")
+        return HarHarness(Path(args.har_record), MODE_RECORD)
+    if getattr(args, "har_replay", None):
+        print(f"[INFO] HAR replay ← {args.har_replay}")
+        return HarHarness(Path(args.har_replay), MODE_REPLAY)
+    return None
@@ -0,0 +1,108 @@
+"""
+Import Timing — ukur cold-start import tiap entry point
+=======================================================
+Tiap modul diimpor di interpreter baru (`python -X importtime`) beberapa
+kali; dilaporkan median waktu proses total, waktu import kumulatif modul itu
+sendiri, modul dependency termahal (self time), dan apakah Playwright ikut
+termuat. Dipakai untuk menjaga tool offline (reparse, merge, benchmark,
+coordinator) tetap ringan setelah parsing dipisah ke `gofood_core.py`.
+
+Usage:
+  python3 import_timing.py
+  python3 import_timing.py --modules reparse,merge_outputs --repeat 10
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+# ── Defaults ────────────────────────────────────────────────────────
+DEFAULT_MODULES = (
+    "gofood_core", "reparse", "merge_outputs", "record_index", "synthetic_data",
+    "coordinator", "developer_test_scrapping", "scrap_sby",
+)
+DEFAULT_REPEAT = 5
+TOP_DEPS = 3
+HEAVY_MODULES = ("playwright", "greenlet", "pyee")
+
+_PROBE = (
+    "import sys, json; import {module}; "
+    "print(json.dumps([m for m in {heavy!r} if m in sys.modules]))"
+)
+
+
+def _parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Baris `import time: self | cumulative | name` → {name: (self_us, cumulative_us)}."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure(module: str, repeat: int = DEFAULT_REPEAT) -> dict:
+    """Import `module` di `repeat` proses baru; return ringkasan median."""
+    wall, cumulative = [], []
+    timings: dict[str, tuple[int, int]] = {}
+    heavy: list[str] = []
+    error = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True,
+        )
+        wall.append((time.perf_counter() - t0) * 1000)
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+            break
+        timings = _parse_importtime(proc.stderr)
+        cumulative.append(timings.get(module, (0, 0))[1] / 1000)
+        heavy = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    result = {"module": module, "process_ms": round(statistics.median(wall), 1)}
+    if error is not None:
+        return {**result, "error": error}
+    deps = sorted(((name, t[0]) for name, t in timings.items() if name != module), key=lambda x: -x[1])
+    return {
+        **result,
+        "import_ms": round(statistics.median(cumulative), 1),
+        "modules_loaded": len(timings),
+        "heavy": heavy,
+        "top_self_ms": [(name, round(us / 1000, 1)) for name, us in deps[:TOP_DEPS]],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ukur cold-start import entry point pipeline GoFood.")
+    parser.add_argument("--modules", default=",".join(DEFAULT_MODULES),
+                        help="Modul yang diukur, pisah koma (default: semua entry point).")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"Jumlah proses per modul, diambil median (default: {DEFAULT_REPEAT}).")
+    parser.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON.")
+    args = parser.parse_args()
+
+    results = [measure(m.strip(), args.repeat) for m in args.modules.split(",") if m.strip()]
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"{'modul':26s} {'proses ms':>10s} {'import ms':>10s} {'modul':>6s}  berat / dependency termahal")
+    for r in results:
+        if "error" in r:
+            print(f"{r['module']:26s} {r['process_ms']:10.1f} {'-':>10s} {'-':>6s}  GAGAL: {r['error']}")
+            continue
+        heavy = ",".join(r["heavy"]) or "-"
+        deps = ", ".join(f"{name} {ms}" for name, ms in r["top_self_ms"])
+        print(f"{r['module']:26s} {r['process_ms']:10.1f} {r['import_ms']:10.1f} {r['modules_loaded']:6d}  "
+              f"{heavy} | {deps}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
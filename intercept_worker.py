@@ -0,0 +1,150 @@
+"""
+Intercept Worker — decode/walk/normalisasi respons di luar thread Playwright
+===========================================================================
+API sync Playwright memanggil callback `page.on("response")` di thread yang
+sama dengan scroll loop. Dulu decode JSON, walk rekursif outlet, dan
+normalisasi ikut dikerjakan di callback, jadi tiap respons besar menahan
+scroll dan pengiriman event lain.
+
+Sekarang callback step 2 hanya mengambil byte body (`response.body()`, harus
+di thread Playwright) dan memasukkannya ke `InterceptWorker`; thread worker
+mengerjakan sisanya. Scroll loop membaca jumlah outlet unik lewat
+`LiveCount` (thread-safe) dan memanggil `wait_idle()` sebelum menghitung
+hasil satu scroll, supaya respons yang masih antre tidak terbaca sebagai
+scroll "tanpa data baru".
+
+`workers=0` memproses inline di callback (perilaku lama; berguna untuk
+debugging). Lebih dari satu worker jarang membantu karena decode/walk
+terikat GIL — yang dicari adalah melepas thread Playwright, bukan paralelisme.
+"""
+
+import argparse
+import queue
+import threading
+import time
+from typing import Callable
+
+# ── Defaults ────────────────────────────────────────────────────────
+DEFAULT_WORKERS = 1
+DEFAULT_QUEUE_SIZE = 256   # body antre maksimal sebelum callback ikut menunggu
+IDLE_TIMEOUT_S = 10.0
+
+_STOP = object()
+
+
+class LiveCount:
+    """Counter integer yang dibaca/ditulis dari beberapa thread."""
+
+    def __init__(self, value: int = 0):
+        self._lock = threading.Lock()
+        self._value = value
+
+    def add(self, n: int = 1) -> int:
+        with self._lock:
+            self._value += n
+            return self._value
+
+    @property
+    def value(self) -> int:
+        with self._lock:
+            return self._value
+
+
+class InterceptWorker:
+    """Antrian body respons + thread worker yang menjalankan `process(body, url)`."""
+
+    def __init__(
+        self, process: Callable[[bytes, str], None],
+        workers: int = DEFAULT_WORKERS, maxsize: int = DEFAULT_QUEUE_SIZE, name: str = "intercept",
+    ):
+        self.process = process
+        self.workers = max(0, workers)
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.processed = 0
+        self.errors = 0
+        self.peak = 0
+        self.busy_s = 0.0
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{name}-{i + 1}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _handle(self, body: bytes, url: str) -> None:
+        t0 = time.perf_counter()
+        try:
+            self.process(body, url)
+        except Exception as exc:
+            with self._lock:
+                self.errors += 1
+            print(f"    [WORKER] Gagal memproses {url[:80]}: {exc}")
+        with self._lock:
+            self.processed += 1
+            self.busy_s += time.perf_counter() - t0
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._handle(*item)
+            finally:
+                self._queue.task_done()
+
+    def submit(self, body: bytes, url: str) -> None:
+        """Dipanggil dari callback response: antrekan body (inline jika workers=0)."""
+        with self._lock:
+            self.submitted += 1
+        if not self._threads:
+            self._handle(body, url)
+            return
+        self._queue.put((body, url))
+        depth = self._queue.qsize()
+        if depth > self.peak:
+            self.peak = depth
+
+    def wait_idle(self, timeout: float = IDLE_TIMEOUT_S) -> bool:
+        """Tunggu semua body yang sudah diantre selesai diproses. False jika timeout."""
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        """Proses sisa antrian lalu hentikan thread worker."""
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "processed": self.processed,
+                "errors": self.errors,
+                "peak_queue": self.peak,
+                "busy_s": round(self.busy_s, 3),
+            }
+
+    def report(self) -> None:
+        s = self.summary()
+        where = f"{s['workers']} thread di luar thread Playwright" if s["workers"] else "inline"
+        print(f"  [WORKER] {s['processed']}/{s['submitted']} body diproses ({where}), error {s['errors']}, "
+              f"antrian puncak {s['peak_queue']}, waktu proses {s['busy_s']}s")
+
+
+def add_intercept_worker_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--intercept-workers", type=int, default=DEFAULT_WORKERS,
+                        help="Thread pemroses respons step 2 (0 = inline di callback Playwright, "
+                             f"default: {DEFAULT_WORKERS}).")
@@ -0,0 +1,180 @@
+"""
+JSON Codec — backend JSON cepat (orjson) dengan fallback stdlib
+===============================================================
+Tiap outlet step 3 = satu `json.loads` blob __NEXT_DATA__ ratusan KB, dan
+tiap save = serialisasi list multi-megabyte. Modul ini memilih backend saat
+import:
+
+  - `orjson` jika terpasang (`pip install orjson`)
+  - `json` stdlib jika tidak, atau jika env `GOFOOD_JSON=json`
+
+API-nya sengaja sempit dan hanya mencakup format yang dipakai pipeline:
+
+  loads(text | bytes)        → objek; `JSONDecodeError` sama dengan stdlib
+  dumps(obj, indent=False)   → str compact `(",", ":")` atau indent 2 spasi,
+                               selalu `ensure_ascii=False`
+
+Output `dumps` identik byte-per-byte dengan `json.dumps` stdlib dengan opsi yang
+sama, karena format file JSON/JSONL bersifat kontrak (index `.idx`, diff antar
+run). orjson menulis float eksponen berbeda (`1e16` vs `1e+16`,
+`0.00001` vs `1e-05`). Karena itu output orjson yang memuat token angka seperti
+itu, atau objek yang ditolak orjson (int > 64 bit, key non-string, surrogate),
+dikerjakan ulang dengan stdlib. Decode juga jatuh ke stdlib untuk input yang
+hanya diterima stdlib (NaN/Infinity, int > 64 bit). Satu-satunya perbedaan
+yang tersisa: float NaN/Infinity ditulis orjson sebagai `null` (JSON valid),
+stdlib sebagai `NaN`; pipeline tidak pernah menghasilkan nilai tersebut.
+
+Benchmark + verifikasi byte terhadap output yang ada:
+  python3 json_codec.py
+  python3 json_codec.py --inputs output/json/gofood_gubeng-restaurants_menus.json --repeat 20
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+JSONDecodeError = json.JSONDecodeError
+
+# Token angka yang ditulis beda oleh orjson dan stdlib: eksponen (`1e16` vs
+# `1e+16`, `1e-7` vs `1e-07`) dan pecahan < 1e-4 yang orjson tulis desimal penuh
+# (`0.00001` vs `1e-05`). Pola diawali literal supaya scan regex tetap murah;
+# kandidat di dalam string ("Rp 1e5," / UID) disaring `_has_float_mismatch`.
+_EXPONENT = re.compile(rb"e-?[0-9]{1,3}(?:[,\n\]}]|\Z)")
+_SMALL_FRACTION = b"0.0000"
+_NUMBER_CHARS = b"0123456789.-"
+_TOKEN_START = b"[:, \n"
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None and os.environ.get("GOFOOD_JSON", "").lower() != "json" else "json"
+
+
+def set_backend(name: str) -> None:
+    """Paksa backend ("orjson" / "json"), mis. untuk benchmark perbandingan."""
+    global BACKEND
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("Backend orjson butuh package orjson: pip install orjson")
+    if name not in ("orjson", "json"):
+        raise ValueError(f"Backend JSON tidak dikenal: {name}")
+    BACKEND = name
+
+
+def _stdlib_dumps(obj, indent: bool) -> str:
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _token_start(data: bytes, end: int) -> int | None:
+    """Awal token angka yang berakhir di `end`, atau None jika bagian dari string."""
+    i = end
+    while i > 0 and data[i - 1] in _NUMBER_CHARS:
+        i -= 1
+    if i > 0 and data[i - 1] not in _TOKEN_START:
+        return None
+    return i
+
+
+def _has_float_mismatch(data: bytes) -> bool:
+    """True jika output orjson memuat token angka yang ditulis beda oleh stdlib."""
+    for match in _EXPONENT.finditer(data):
+        end = match.start()
+        if end > 0 and data[end - 1] in b"0123456789" and _token_start(data, end) is not None:
+            return True
+    end = data.find(_SMALL_FRACTION)
+    while end != -1:
+        start = _token_start(data, end)
+        if start is not None and data[start:end] in (b"", b"-"):
+            return True
+        end = data.find(_SMALL_FRACTION, end + 1)
+    return False
+
+
+def loads(data: str | bytes):
+    """Decode JSON dari str/bytes."""
+    if BACKEND == "orjson":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # stdlib menerima NaN/Infinity & int besar; error asli tetap dari stdlib
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = False) -> str:
+    """Encode ke str; byte identik dengan `json.dumps(obj, ensure_ascii=False, ...)`."""
+    if BACKEND == "orjson":
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            return _stdlib_dumps(obj, indent)
+        if not _has_float_mismatch(data):
+            return data.decode("utf-8")
+    return _stdlib_dumps(obj, indent)
+
+
+# ── Benchmark ──────────────────────────────────────────────────────
+
+def _timeit(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench(paths: list[Path], repeat: int) -> list[dict]:
+    """Bandingkan decode/encode per backend untuk tiap file; cek output byte identik."""
+    from output_formats import format_of, is_record_file, open_text
+
+    results = []
+    for path in filter(is_record_file, paths):
+        with open_text(path) as f:
+            raw = f.read()
+        lines = [line for line in raw.splitlines() if line.strip()] if format_of(path) == "jsonl" else None
+        data = [json.loads(line) for line in lines] if lines is not None else json.loads(raw)
+        records = data if isinstance(data, list) else [data]
+        row = {"file": path.name, "mb": round(len(raw.encode("utf-8")) / 1e6, 2), "identical": True}
+        for backend in ("json", "orjson") if orjson is not None else ("json",):
+            set_backend(backend)
+            decode = (lambda: [loads(line) for line in lines]) if lines is not None else (lambda: loads(raw))
+            row[f"loads_{backend}_ms"] = round(_timeit(decode, repeat) * 1000, 2)
+            row[f"dumps_{backend}_ms"] = round(
+                _timeit(lambda: [dumps(r, indent=True) for r in records], repeat) * 1000, 2)
+            row["identical"] &= all(
+                dumps(r, indent=True) == _stdlib_dumps(r, True) and dumps(r) == _stdlib_dumps(r, False)
+                for r in records
+            )
+        results.append(row)
+    set_backend("orjson" if orjson is not None else "json")
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark backend JSON + verifikasi output byte-identik.")
+    parser.add_argument("--inputs", nargs="*", default=None,
+                        help="File JSON/JSONL yang diuji (default: semua di output/json).")
+    parser.add_argument("--repeat", type=int, default=5, help="Ulangan per pengukuran, diambil terbaik.")
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.inputs] if args.inputs else sorted(
+        p for p in Path("output/json").glob("*.json*") if not p.name.endswith(".idx"))
+    print(f"[INFO] Backend aktif: {BACKEND} (orjson {'terpasang' if orjson is not None else 'tidak ada'})")
+    results = bench(paths, args.repeat)
+    print(f"{'file':48s} {'MB':>6s} {'loads json':>11s} {'orjson':>8s} {'dumps json':>11s} {'orjson':>8s}  identik")
+    for r in results:
+        cols = [r.get(k) for k in ("loads_json_ms", "loads_orjson_ms", "dumps_json_ms", "dumps_orjson_ms")]
+        cells = [f"{c:.1f}" if c is not None else "-" for c in cols]
+        print(f"{r['file'][:48]:48s} {r['mb']:6.2f} {cells[0]:>11s} {cells[1]:>8s} {cells[2]:>11s} {cells[3]:>8s}  "
+              f"{'ya' if r['identical'] else 'TIDAK'}")
+    return 0 if all(r["identical"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
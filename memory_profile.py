@@ -0,0 +1,266 @@
+"""
+Memory Profile — tracemalloc + RSS browser untuk run panjang (`--profile-memory`)
+================================================================================
+Run `scrap_sby` menahan satu browser berjam-jam; profiler ini mengambil
+checkpoint memori per stage (setelah step 1/2/3 tiap area) dan tiap N outlet
+di step 3. Tiap checkpoint mencatat:
+
+  - tracemalloc: byte Python yang sedang dialokasikan + peak
+  - RSS proses Python, driver Playwright (node), dan Chromium (semua proses
+    turunan: browser, renderer, GPU, utility)
+  - jumlah context & page yang masih terbuka di browser
+  - top call site yang tumbuh sejak checkpoint sebelumnya
+
+Report JSON berisi timeline, top call site yang tumbuh sejak baseline
+(traceback), laju pertumbuhan per outlet, dan dugaan leak page/context:
+di batas stage semua context seharusnya sudah ditutup, di dalam step 3
+hanya satu context/page yang boleh hidup.
+
+RSS dibaca lewat `psutil` jika terpasang, selain itu dari /proc (Linux);
+platform lain tanpa psutil hanya mendapat angka tracemalloc.
+"""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from output_formats import atomic_open_text
+
+# ── Defaults ────────────────────────────────────────────────────────
+WIB = timezone(timedelta(hours=7))
+DEFAULT_EVERY = 25        # checkpoint tiap N outlet step 3
+DEFAULT_FRAMES = 10       # kedalaman traceback tracemalloc
+DEFAULT_TOP = 15
+STEP_TOP = 5              # call site per checkpoint di timeline
+
+_IGNORE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+# ── RSS proses ─────────────────────────────────────────────────────
+
+def _proc_tree() -> list[tuple[int, str, int]]:
+    """[(pid, nama, rss_bytes)] untuk semua turunan proses ini (tanpa proses ini)."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        result = []
+        for child in psutil.Process().children(recursive=True):
+            try:
+                result.append((child.pid, child.name(), child.memory_info().rss))
+            except psutil.Error:
+                continue
+        return result
+
+    proc = Path("/proc")
+    if not proc.exists():
+        return []
+    parents: dict[int, list[int]] = {}
+    names: dict[int, str] = {}
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # format: pid (comm) state ppid ... — comm bisa berisi spasi/kurung
+        comm = stat[stat.index("(") + 1:stat.rindex(")")]
+        ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+        pid = int(entry.name)
+        names[pid] = comm
+        parents.setdefault(ppid, []).append(pid)
+
+    result = []
+    stack = list(parents.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(parents.get(pid, []))
+        rss = _proc_rss(pid)
+        if rss is not None:
+            result.append((pid, names.get(pid, "?"), rss))
+    return result
+
+
+def _proc_rss(pid: int | str = "self") -> int | None:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def sample_rss() -> dict:
+    """RSS (MB) proses Python, driver Playwright, dan Chromium."""
+    own = _proc_rss()
+    if own is None:
+        try:
+            import psutil
+            own = psutil.Process().memory_info().rss
+        except ImportError:
+            pass
+    browser = driver = 0
+    processes = 0
+    for _, name, rss in _proc_tree():
+        processes += 1
+        if name.lower().startswith("node"):
+            driver += rss
+        else:
+            browser += rss
+    return {
+        "python_mb": round(own / 1e6, 1) if own is not None else None,
+        "driver_mb": round(driver / 1e6, 1),
+        "browser_mb": round(browser / 1e6, 1),
+        "child_processes": processes,
+    }
+
+
+def _open_pages(browser) -> tuple[int | None, int | None]:
+    if browser is None:
+        return None, None
+    try:
+        contexts = browser.contexts
+        return len(contexts), sum(len(c.pages) for c in contexts)
+    except Exception:
+        return None, None
+
+
+def _site(stat) -> dict:
+    frame = stat.traceback[-1]  # frame terbaru = baris yang mengalokasikan
+    return {
+        "site": f"{frame.filename}:{frame.lineno}",
+        "size_diff_kb": round(stat.size_diff / 1024, 1),
+        "size_kb": round(stat.size / 1024, 1),
+        "count_diff": stat.count_diff,
+    }
+
+
+class MemoryProfiler:
+    """Checkpoint memori per stage dan tiap `every` outlet; tulis report growth."""
+
+    def __init__(self, report_path: Path, every: int = DEFAULT_EVERY,
+                 frames: int = DEFAULT_FRAMES, top: int = DEFAULT_TOP):
+        self.report_path = Path(report_path)
+        self.every = max(1, every)
+        self.top = top
+        self.outlets = 0
+        self.timeline: list[dict] = []
+        self.started = time.monotonic()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.baseline = tracemalloc.take_snapshot().filter_traces(_IGNORE)
+        self.previous = self.baseline
+        self.last = self.baseline
+
+    def checkpoint(self, label: str, browser=None, expected_contexts: int = 0) -> dict:
+        """Ambil snapshot; `expected_contexts` = context yang wajar masih terbuka saat ini."""
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORE)
+        current, peak = tracemalloc.get_traced_memory()
+        contexts, pages = _open_pages(browser)
+        growth = snapshot.compare_to(self.previous, "lineno")[:STEP_TOP]
+        entry = {
+            "label": label,
+            "elapsed_s": round(time.monotonic() - self.started, 1),
+            "outlets": self.outlets,
+            "traced_mb": round(current / 1e6, 2),
+            "traced_peak_mb": round(peak / 1e6, 2),
+            **sample_rss(),
+            "open_contexts": contexts,
+            "open_pages": pages,
+            "expected_contexts": expected_contexts,
+            "top_growth": [_site(s) for s in growth if s.size_diff > 0],
+        }
+        self.timeline.append(entry)
+        self.previous = self.last = snapshot
+        print(f"  [MEM] {label}: traced {entry['traced_mb']} MB, python {entry['python_mb']} MB, "
+              f"browser {entry['browser_mb']} MB, context/page {contexts}/{pages}")
+        return entry
+
+    def tick(self, browser=None) -> None:
+        """Dipanggil per outlet step 3; checkpoint tiap `every` outlet."""
+        self.outlets += 1
+        if self.outlets % self.every == 0:
+            self.checkpoint(f"step3 +{self.outlets} outlet", browser, expected_contexts=1)
+
+    def leaks(self) -> list[dict]:
+        """Checkpoint dengan context/page terbuka melebihi yang wajar."""
+        found = []
+        for entry in self.timeline:
+            contexts, pages = entry["open_contexts"], entry["open_pages"]
+            if contexts is None:
+                continue
+            if contexts > entry["expected_contexts"] or pages > entry["expected_contexts"]:
+                found.append({"label": entry["label"], "open_contexts": contexts, "open_pages": pages,
+                              "expected": entry["expected_contexts"]})
+        return found
+
+    def report(self) -> dict:
+        """Bandingkan snapshot terakhir dengan baseline, tulis report JSON."""
+        stats = self.last.compare_to(self.baseline, "traceback")[:self.top]
+        first, last = (self.timeline[0], self.timeline[-1]) if self.timeline else ({}, {})
+
+        def delta(key: str):
+            if first.get(key) is None or last.get(key) is None:
+                return None
+            return round(last[key] - first[key], 1)
+
+        growth = {key: delta(key) for key in ("traced_mb", "python_mb", "browser_mb", "driver_mb")}
+        per_100 = None
+        if self.outlets and growth["browser_mb"] is not None:
+            per_100 = {k: round(v * 100 / self.outlets, 2) for k, v in growth.items() if v is not None}
+        report = {
+            "generated_at": datetime.now(WIB).isoformat(),
+            "checkpoints": len(self.timeline),
+            "outlets": self.outlets,
+            "growth_mb": growth,
+            "growth_mb_per_100_outlets": per_100,
+            "leaks": self.leaks(),
+            "top_sites": [
+                {**_site(s), "traceback": [f"{f.filename}:{f.lineno}" for f in reversed(s.traceback)]}
+                for s in stats if s.size_diff > 0
+            ],
+            "timeline": self.timeline,
+        }
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_open_text(self.report_path) as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        print(f"\n  [MEM] Report: {self.report_path}")
+        print(f"  [MEM] Growth: " + ", ".join(f"{k}={v}" for k, v in growth.items()))
+        for site in report["top_sites"][:5]:
+            print(f"    +{site['size_diff_kb']:>10.1f} KB  {site['site']}")
+        for leak in report["leaks"]:
+            print(f"  [MEM] Dugaan leak di '{leak['label']}': {leak['open_contexts']} context, "
+                  f"{leak['open_pages']} page (wajar {leak['expected']})")
+        return report
+
+    def close(self) -> dict:
+        report = self.report()
+        tracemalloc.stop()
+        return report
+
+
+def add_memory_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Profil memori: snapshot tracemalloc + RSS Chromium, tulis report growth.")
+    parser.add_argument("--profile-memory-every", type=int, default=DEFAULT_EVERY,
+                        help=f"Checkpoint memori tiap N outlet step 3 (default: {DEFAULT_EVERY}).")
+
+
+def open_memory_profiler(args: argparse.Namespace, report_path: Path) -> MemoryProfiler | None:
+    if not getattr(args, "profile_memory", False):
+        return None
+    print(f"[INFO] Profil memori aktif (tracemalloc), report: {report_path}")
+    return MemoryProfiler(report_path, every=args.profile_memory_every)
@@ -0,0 +1,189 @@
+"""
+GoFood Master Catalog Merger
+============================
+Gabungkan semua file menu per area (`gofood_<locality>_menus.json`, juga
+`.jsonl` dan versi `.gz`/`.zst`) menjadi satu katalog master (JSON + CSV)
+tanpa memuat seluruh isi file ke memori.
+
+Cara kerja (streaming, dua lintasan baca):
+  1. Scan   — stream semua file input, simpan hanya index kecil per outlet:
+              restaurant_uid -> (scraped_at, file ke-berapa, posisi record).
+              Record dengan scraped_at paling baru yang menang.
+  2. Write  — stream ulang file input, tulis record pemenang langsung ke
+              JSON master dan CSV master dalam satu lintasan.
+
+Memori sebanding dengan jumlah outlet unik, bukan jumlah baris menu.
+
+Usage:
+  python3 merge_outputs.py
+  python3 merge_outputs.py --input "output/json/gofood_*_menus.json"
+  python3 merge_outputs.py --output output/json/gofood_menus_master.json \\
+      --output-csv output/csv/gofood_menus_master.csv
+  python3 merge_outputs.py --format jsonl --compress gzip
+"""
+
+import argparse
+import csv
+from datetime import datetime, timezone
+from pathlib import Path
+
+from gofood_core import (
+    CSV_COLUMNS,
+    OUTPUT_DIR,
+    WIB,
+    add_output_format_args,
+    flatten_to_csv_rows,
+)
+from output_formats import RecordWriter, atomic_open_text, is_record_file, iter_records, with_format
+
+# ── Defaults ────────────────────────────────────────────────────────
+DEFAULT_INPUT_GLOB = "gofood_*_menus.*"
+DEFAULT_OUTPUT = OUTPUT_DIR / "json" / "gofood_menus_master.json"
+DEFAULT_OUTPUT_CSV = OUTPUT_DIR / "csv" / "gofood_menus_master.csv"
+
+_OLDEST = datetime.min.replace(tzinfo=timezone.utc)
+
+
+# ── Merge ──────────────────────────────────────────────────────────
+
+def _parse_scraped_at(value) -> datetime:
+    if not value:
+        return _OLDEST
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return _OLDEST
+    # Timestamp tanpa offset dianggap WIB (sama dengan pipeline)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=WIB)
+
+
+def discover_inputs(json_dir: Path, pattern: str, exclude: list[Path]) -> list[Path]:
+    """Cari file menu per area (JSON/JSONL, boleh terkompresi), kecuali output master."""
+    excluded = {p.resolve() for p in exclude}
+    return sorted(
+        p for p in json_dir.glob(pattern)
+        if p.resolve() not in excluded and is_record_file(p)
+    )
+
+
+def scan_winners(inputs: list[Path]) -> tuple[dict[str, tuple], dict]:
+    """Lintasan 1: pilih record terbaru per restaurant_uid.
+
+    Return (winners, stats) dimana winners = {uid: (scraped_at, file_idx, ordinal)}.
+    """
+    winners: dict[str, tuple] = {}
+    stats = {"records": 0, "no_uid": 0, "files": len(inputs)}
+
+    for file_idx, path in enumerate(inputs):
+        for ordinal, record in enumerate(iter_records(path)):
+            stats["records"] += 1
+            uid = record.get("restaurant_uid") if isinstance(record, dict) else None
+            if not uid:
+                stats["no_uid"] += 1
+                continue
+            ts = _parse_scraped_at(record.get("scraped_at"))
+            current = winners.get(uid)
+            # Tie-break: file yang diproses belakangan menang
+            if current is None or ts >= current[0]:
+                winners[uid] = (ts, file_idx, ordinal)
+
+    return winners, stats
+
+
+def _iter_winning_records(inputs: list[Path], winners: dict[str, tuple]):
+    keep = {(file_idx, ordinal) for _, file_idx, ordinal in winners.values()}
+    for file_idx, path in enumerate(inputs):
+        for ordinal, record in enumerate(iter_records(path)):
+            if (file_idx, ordinal) in keep:
+                yield record
+
+
+def write_master(
+    inputs: list[Path], winners: dict[str, tuple],
+    output_json: Path, output_csv: Path, compact: bool = False,
+) -> tuple[int, int]:
+    """Lintasan 2: tulis JSON + CSV master sekaligus. Return (records, rows)."""
+    n_rows = 0
+    with RecordWriter(output_json, compact=compact, index_key="restaurant_uid") as json_writer, \
+            atomic_open_text(output_csv, newline="") as cf:
+        csv_writer = csv.DictWriter(cf, fieldnames=CSV_COLUMNS)
+        csv_writer.writeheader()
+
+        for record in _iter_winning_records(inputs, winners):
+            json_writer.write(record)
+            rows = flatten_to_csv_rows([record])
+            csv_writer.writerows(rows)
+            n_rows += len(rows)
+
+    return json_writer.count, n_rows
+
+
+def merge(
+    inputs: list[Path], output_json: Path, output_csv: Path, compact: bool = False,
+) -> dict:
+    winners, stats = scan_winners(inputs)
+    n_records, n_rows = write_master(inputs, winners, output_json, output_csv, compact)
+    stats.update({
+        "unique_outlets": n_records,
+        "duplicates_dropped": stats["records"] - stats["no_uid"] - n_records,
+        "csv_rows": n_rows,
+    })
+    return stats
+
+
+# ── CLI ────────────────────────────────────────────────────────────
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Merge file menu per area menjadi katalog master (dedup by restaurant_uid).",
+    )
+    parser.add_argument("--input", action="append", default=None,
+                        help="Glob/path file menu input; bisa diulang "
+                             f"(default: output/json/{DEFAULT_INPUT_GLOB}).")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT),
+                        help="Path output JSON master.")
+    parser.add_argument("--output-csv", default=str(DEFAULT_OUTPUT_CSV),
+                        help="Path output CSV master.")
+    add_output_format_args(parser)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    output_json = with_format(Path(args.output), args.format, args.compress)
+    output_csv = with_format(Path(args.output_csv), compression=args.compress)
+
+    if args.input:
+        inputs: list[Path] = []
+        for pattern in args.input:
+            p = Path(pattern)
+            matched = sorted(p.parent.glob(p.name)) if any(c in p.name for c in "*?[") else [p]
+            inputs.extend(m for m in matched if m.resolve() != output_json.resolve())
+    else:
+        inputs = discover_inputs(OUTPUT_DIR / "json", DEFAULT_INPUT_GLOB, [output_json])
+
+    missing = [p for p in inputs if not p.exists()]
+    if missing:
+        print(f"[ERROR] File input tidak ditemukan: {', '.join(map(str, missing))}")
+        return 1
+    if not inputs:
+        print("[WARNING] Tidak ada file menu untuk di-merge.")
+        return 0
+
+    print(f"[INFO] {len(inputs)} file input:")
+    for p in inputs:
+        print(f"  - {p}")
+
+    stats = merge(inputs, output_json, output_csv, compact=args.compact_json)
+
+    print(f"\n{'='*60}")
+    print(f"[DONE] JSON master : {output_json} ({stats['unique_outlets']} outlets)")
+    print(f"[DONE] CSV master  : {output_csv} ({stats['csv_rows']} rows)")
+    print(f"[STATS] Records dibaca: {stats['records']} | Duplikat dibuang: "
+          f"{stats['duplicates_dropped']} | Tanpa uid: {stats['no_uid']}")
+    print(f"{'='*60}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
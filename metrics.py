@@ -0,0 +1,251 @@
+"""
+Metrics — registry gaya Prometheus untuk run scraping panjang
+=============================================================
+Counter/gauge/histogram sederhana (tanpa dependency) yang dirender ke format
+teks Prometheus. Dua cara ekspos, keduanya opsional:
+
+  - `--metrics-port N`      endpoint HTTP lokal `http://127.0.0.1:N/metrics`
+  - `--metrics-textfile P`  file `.prom` ditulis ulang (atomic) setiap
+                            `--metrics-interval` detik — untuk textfile
+                            collector node_exporter atau sekadar `watch cat`
+
+Metrik yang dicatat pipeline:
+  gofood_pages_total{step}                  halaman dibuka browser (nearme/profile)
+  gofood_pages_per_second                   rata-rata 60 detik terakhir
+  gofood_outlets_discovered_total{area}     outlet unik baru dari step 2
+  gofood_outlets_scraped_total{status}      record menu step 3 per status
+  gofood_intercepted_responses_total{area}  respons API JSON yang di-parse step 2
+  gofood_responses_filtered_total{rule}     keputusan pre-filter interceptor (rule tolak / accepted)
+  gofood_parse_seconds{step}                durasi parse (histogram)
+  gofood_page_seconds{step}                 latency goto (histogram)
+  gofood_bytes_received_total{step}         byte payload yang diterima
+  gofood_errors_total{error_class}          error per kelas retry_engine
+  gofood_delay_seconds{controller}          interval pacing saat ini
+  gofood_areas_total{status}                area selesai (scrap_sby)
+"""
+
+import argparse
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# ── Definisi metrik ─────────────────────────────────────────────────
+PREFIX = "gofood_"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DEFAULT_INTERVAL = 15.0
+RATE_WINDOW = 60.0  # detik untuk gofood_pages_per_second
+
+FAMILIES = {
+    "pages_total": ("counter", "Halaman yang dibuka browser."),
+    "outlets_discovered_total": ("counter", "Outlet unik baru yang ditemukan step 2."),
+    "outlets_scraped_total": ("counter", "Record menu step 3 per status."),
+    "intercepted_responses_total": ("counter", "Respons API JSON yang di-parse step 2."),
+    "responses_filtered_total": ("counter", "Keputusan pre-filter respons interceptor per rule."),
+    "parse_seconds": ("histogram", "Durasi parse payload, detik."),
+    "page_seconds": ("histogram", "Latency navigasi halaman, detik."),
+    "bytes_received_total": ("counter", "Byte payload yang diterima."),
+    "errors_total": ("counter", "Error scraping per kelas."),
+    "delay_seconds": ("gauge", "Interval pacing saat ini, detik."),
+    "areas_total": ("counter", "Area yang selesai diproses per status."),
+}
+
+
+def _labels(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Counter byte bisa besar — jangan pakai notasi eksponen untuk bilangan bulat."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metrics:
+    """Registry thread-safe; nama metrik tanpa prefix `gofood_`."""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.started = time.time()
+        self._values: dict[str, dict[tuple, float]] = {name: {} for name in FAMILIES}
+        self._hist: dict[str, dict[tuple, list]] = {}
+        self._page_times: deque[float] = deque(maxlen=10_000)
+        self.exporters: list = []
+
+    def _check(self, name: str, kind: str) -> None:
+        if FAMILIES[name][0] != kind:
+            raise ValueError(f"Metrik {name} bertipe {FAMILIES[name][0]}, bukan {kind}")
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        self._check(name, "counter")
+        key = _labels(labels)
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0) + value
+            if name == "pages_total":
+                self._page_times.append(time.monotonic())
+
+    def set(self, name: str, value: float, **labels) -> None:
+        self._check(name, "gauge")
+        with self._lock:
+            self._values[name][_labels(labels)] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        self._check(name, "histogram")
+        key = _labels(labels)
+        with self._lock:
+            # [count per bucket..., +Inf count, sum]
+            hist = self._hist.setdefault(name, {}).setdefault(key, [0] * (len(self.buckets) + 1) + [0.0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist[i] += 1
+            hist[-2] += 1
+            hist[-1] += value
+
+    def pages_per_second(self) -> float:
+        cutoff = time.monotonic() - RATE_WINDOW
+        with self._lock:
+            recent = sum(1 for t in self._page_times if t >= cutoff)
+        window = min(RATE_WINDOW, max(time.time() - self.started, 1.0))
+        return recent / window
+
+    def render(self) -> str:
+        """Format teks eksposisi Prometheus 0.0.4."""
+        pps = self.pages_per_second()
+        lines = [
+            f"# HELP {PREFIX}pages_per_second Halaman per detik, rata-rata {RATE_WINDOW:.0f} detik terakhir.",
+            f"# TYPE {PREFIX}pages_per_second gauge",
+            f"{PREFIX}pages_per_second {pps:.4f}",
+            f"# HELP {PREFIX}start_time_seconds Waktu mulai proses (unix).",
+            f"# TYPE {PREFIX}start_time_seconds gauge",
+            f"{PREFIX}start_time_seconds {self.started:.0f}",
+        ]
+        with self._lock:
+            for name, (kind, help_text) in FAMILIES.items():
+                full = PREFIX + name
+                lines.append(f"# HELP {full} {help_text}")
+                lines.append(f"# TYPE {full} {kind}")
+                if kind == "histogram":
+                    for key, hist in sorted(self._hist.get(name, {}).items()):
+                        for bound, count in zip(self.buckets, hist):
+                            lines.append(f"{full}_bucket{_format_labels(key, (('le', f'{bound:g}'),))} {count}")
+                        lines.append(f"{full}_bucket{_format_labels(key, (('le', '+Inf'),))} {hist[-2]}")
+                        lines.append(f"{full}_sum{_format_labels(key)} {hist[-1]:.6f}")
+                        lines.append(f"{full}_count{_format_labels(key)} {hist[-2]}")
+                else:
+                    for key, value in sorted(self._values[name].items()):
+                        lines.append(f"{full}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def close(self) -> None:
+        """Hentikan exporter (textfile ditulis sekali lagi dengan nilai akhir)."""
+        for exporter in self.exporters:
+            exporter.stop()
+        self.exporters.clear()
+
+
+# ── Exporter ───────────────────────────────────────────────────────
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    server_version = "GoFoodMetrics/1.0"
+
+    def do_GET(self):
+        if self.path not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        data = self.server.metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, fmt, *args):
+        pass  # scrape Prometheus tiap beberapa detik — jangan ramaikan log
+
+
+class HTTPExporter:
+    """Endpoint /metrics di thread daemon."""
+
+    def __init__(self, metrics: Metrics, port: int, host: str = "127.0.0.1"):
+        self.server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self.server.daemon_threads = True
+        self.server.metrics = metrics
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+        self.thread.start()
+        print(f"[INFO] Metrics: http://{host}:{self.server.server_port}/metrics")
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TextfileExporter:
+    """Tulis ulang file `.prom` secara atomic setiap `interval` detik."""
+
+    def __init__(self, metrics: Metrics, path: Path, interval: float = DEFAULT_INTERVAL):
+        self.metrics = metrics
+        self.path = Path(path)
+        self.interval = interval
+        self._stop = threading.Event()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.thread = threading.Thread(target=self._loop, name="metrics-textfile", daemon=True)
+        self.thread.start()
+        print(f"[INFO] Metrics: {self.path} (setiap {interval:g}s)")
+
+    def write(self) -> None:
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.metrics.render(), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.thread.join()
+        self.write()
+
+
+def add_metrics_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--metrics-port", type=int, default=0,
+                        help="Ekspos metrik Prometheus di http://127.0.0.1:PORT/metrics (0 = nonaktif).")
+    parser.add_argument("--metrics-textfile", default=None,
+                        help="Tulis metrik ke file .prom secara berkala (textfile exporter).")
+    parser.add_argument("--metrics-interval", type=float, default=DEFAULT_INTERVAL,
+                        help=f"Interval tulis textfile, detik (default: {DEFAULT_INTERVAL:.0f}).")
+
+
+def open_metrics(args: argparse.Namespace, shard: int | None = None) -> Metrics | None:
+    """Registry + exporter sesuai flag; None jika keduanya nonaktif.
+
+    `shard` (mode sharded) menggeser port dan memberi suffix file supaya tiap
+    proses worker punya endpoint/file sendiri.
+    """
+    port = getattr(args, "metrics_port", 0)
+    textfile = getattr(args, "metrics_textfile", None)
+    if not port and not textfile:
+        return None
+    metrics = Metrics()
+    if port:
+        metrics.exporters.append(HTTPExporter(metrics, port + (shard or 0)))
+    if textfile:
+        path = Path(textfile)
+        if shard is not None:
+            path = path.with_name(f"{path.stem}_shard{shard}{path.suffix}")
+        metrics.exporters.append(TextfileExporter(metrics, path, args.metrics_interval))
+    return metrics
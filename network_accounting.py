@@ -0,0 +1,122 @@
+"""
+Network Accounting — hitung request, byte, dan waktu per resource type / host
+=============================================================================
+`NetworkAccountant.attach(context, step)` memasang listener `requestfinished`
+dan `requestfailed` di context Playwright. Untuk tiap request dicatat:
+
+  - resource type (document, xhr, fetch, image, script, font, stylesheet, ...)
+  - host tujuan
+  - byte diterima: header + body respons terenkode (`request.sizes()`), yaitu
+    ukuran transfer yang memakan kuota
+  - durasi request sampai respons selesai (`request.timing.responseEnd`)
+
+Ringkasan dikelompokkan per step (step1/step2/step3), per resource type, dan
+per host (top N). `scrap_sby.py` menyimpan satu ringkasan per area di
+`scrap_sby_summary.json`, plus total seluruh run.
+"""
+
+import threading
+from urllib.parse import urlsplit
+
+# ── Defaults ────────────────────────────────────────────────────────
+TOP_HOSTS = 15
+
+
+def _bucket() -> dict:
+    return {"requests": 0, "failed": 0, "bytes": 0, "time_ms": 0.0}
+
+
+def _add(target: dict, key: str, nbytes: int, time_ms: float, failed: bool) -> None:
+    bucket = target.setdefault(key, _bucket())
+    bucket["requests"] += 1
+    bucket["failed"] += failed
+    bucket["bytes"] += nbytes
+    bucket["time_ms"] += time_ms
+
+
+def _rounded(buckets: dict, limit: int | None = None) -> dict:
+    items = sorted(buckets.items(), key=lambda kv: -kv[1]["bytes"])
+    if limit is not None:
+        items = items[:limit]
+    return {
+        key: {**b, "time_ms": round(b["time_ms"], 1), "mb": round(b["bytes"] / 1e6, 3)}
+        for key, b in items
+    }
+
+
+class NetworkAccountant:
+    """Tally request/byte/waktu dari semua context yang di-attach."""
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self._lock = threading.Lock()
+        self.total = _bucket()
+        self.by_step: dict[str, dict] = {}
+        self.by_type: dict[str, dict] = {}
+        self.by_host: dict[str, dict] = {}
+
+    def attach(self, context, step: str) -> None:
+        """Pasang listener ke context browser; `step` jadi label pengelompokan."""
+        context.on("requestfinished", lambda request: self._on_request(request, step, failed=False))
+        context.on("requestfailed", lambda request: self._on_request(request, step, failed=True))
+
+    def _on_request(self, request, step: str, failed: bool) -> None:
+        nbytes = 0
+        time_ms = 0.0
+        if not failed:
+            try:
+                sizes = request.sizes()
+                nbytes = sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
+            except Exception:
+                pass  # request dari page yang sudah ditutup
+        try:
+            time_ms = max(request.timing.get("responseEnd", -1), 0.0)
+        except Exception:
+            pass
+        self.record(step, request.resource_type, urlsplit(request.url).hostname or "-",
+                    max(nbytes, 0), time_ms, failed)
+
+    def record(self, step: str, resource_type: str, host: str,
+               nbytes: int, time_ms: float = 0.0, failed: bool = False) -> None:
+        with self._lock:
+            self.total["requests"] += 1
+            self.total["failed"] += failed
+            self.total["bytes"] += nbytes
+            self.total["time_ms"] += time_ms
+            _add(self.by_step, step, nbytes, time_ms, failed)
+            _add(self.by_type, resource_type, nbytes, time_ms, failed)
+            _add(self.by_host, host, nbytes, time_ms, failed)
+
+    def summary(self, top_hosts: int = TOP_HOSTS) -> dict:
+        with self._lock:
+            return {
+                **self.total,
+                "time_ms": round(self.total["time_ms"], 1),
+                "mb": round(self.total["bytes"] / 1e6, 3),
+                "by_step": _rounded(self.by_step),
+                "by_type": _rounded(self.by_type),
+                "by_host": _rounded(self.by_host, top_hosts),
+            }
+
+    def report(self) -> None:
+        s = self.summary()
+        label = f" {self.name}" if self.name else ""
+        print(f"  [NET]{label}: {s['requests']} request ({s['failed']} gagal), {s['mb']:.2f} MB")
+        for rtype, b in s["by_type"].items():
+            avg = b["time_ms"] / b["requests"] if b["requests"] else 0.0
+            print(f"    {rtype:12s} {b['requests']:6d} req  {b['mb']:9.3f} MB  avg {avg:7.0f} ms")
+
+
+def merge_summaries(summaries: list[dict]) -> dict:
+    """Gabungkan beberapa `summary()` (mis. semua area) jadi total run."""
+    merged = NetworkAccountant()
+    for s in summaries:
+        for field in ("requests", "failed", "bytes", "time_ms"):
+            merged.total[field] += s.get(field, 0)
+        for group, target in (("by_step", merged.by_step), ("by_type", merged.by_type),
+                              ("by_host", merged.by_host)):
+            for key, b in s.get(group, {}).items():
+                bucket = target.setdefault(key, _bucket())
+                for field in ("requests", "failed", "bytes", "time_ms"):
+                    bucket[field] += b.get(field, 0)
+    return merged.summary()
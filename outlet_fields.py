@@ -0,0 +1,233 @@
+"""
+Outlet Fields — spec field outlet deklaratif, dikompilasi jadi extractor
+=======================================================================
+Field outlet yang diambil dari objek mentah (near-me API / __NEXT_DATA__)
+didefinisikan sekali di `OUTLET_FIELDS` sebagai (nama, path, default):
+
+  ("latitude", ("core", "location", "latitude"), None)
+  ("image_url", (("media", "logo"), ("core", "media", "logo")), "")
+
+Path adalah tuple key dict; path berisi tuple-tuple berarti alternatif —
+dipakai alternatif pertama yang container-nya dict. Container yang bukan
+dict menghasilkan default, key yang tidak ada juga (`dict.get(key, default)`).
+
+`compile_fields(spec)` membangkitkan satu fungsi Python untuk seluruh spec:
+tiap container (`core`, `core.location`, `delivery`, ...) diambil dan dicek
+tipenya sekali, lalu semua field dibaca dari variabel lokal itu. Dipakai
+`gofood_core._normalize_outlet` dan `scripts/playwright/test_nearme_interceptor.py`,
+jadi kedua normalizer tidak bisa lagi berbeda field.
+
+Benchmark per outlet (spec terkompilasi vs walker generik vs versi tulis
+tangan sebelumnya) atas respons yang di-intercept:
+  python3 outlet_fields.py
+  python3 outlet_fields.py --inputs output/json/gofood_next_data.json --synthetic 20000
+"""
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from typing import Callable
+
+# ── Spec ────────────────────────────────────────────────────────────
+OUTLET_FIELDS = (
+    ("short_link", ("core", "shortLink"), ""),
+    ("latitude", ("core", "location", "latitude"), None),
+    ("longitude", ("core", "location", "longitude"), None),
+    ("status", ("core", "status"), None),
+    ("rating_average", ("ratings", "average"), None),
+    ("rating_total", ("ratings", "total"), None),
+    ("delivery_enabled", ("delivery", "enabled"), None),
+    ("delivery_max_radius_km", ("delivery", "maxRadiusKm"), None),
+    ("delivery_distance_km", ("delivery", "distanceKm"), None),
+    ("delivery_eta_minutes", ("delivery", "eta", "minutes"), None),
+    ("price_level", ("priceLevel",), None),
+    ("image_url", (("media", "logo"), ("core", "media", "logo")), ""),
+)
+
+DEFAULT_INPUTS = ("output/json/gofood_next_data.json", "output/json/gofood_nearme_raw_responses.json")
+DEFAULT_SYNTHETIC = 5000
+
+
+def _alternatives(path: tuple) -> tuple[tuple[str, ...], ...]:
+    return path if path and isinstance(path[0], tuple) else (path,)
+
+
+# ── Walker generik (referensi semantik spec) ───────────────────────
+
+def extract_interpreted(raw: dict, spec=OUTLET_FIELDS) -> dict:
+    """Tafsirkan spec langsung tanpa kompilasi; acuan kebenaran `compile_fields`."""
+    out = {}
+    for name, path, default in spec:
+        value = default
+        for alt in _alternatives(path):
+            node = raw
+            for key in alt[:-1]:
+                node = node.get(key) if isinstance(node, dict) else None
+            if isinstance(node, dict):
+                value = node.get(alt[-1], default)
+                break
+        out[name] = value
+    return out
+
+
+# ── Compiler ────────────────────────────────────────────────────────
+
+def _literal(value) -> str | None:
+    """Repr default yang aman di-inline sebagai konstanta, None jika harus lewat variabel."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return repr(value)
+    return None
+
+
+def compile_fields(
+    spec=OUTLET_FIELDS, name: str = "extract_fields", leading: tuple[str, ...] = (),
+) -> Callable[..., dict]:
+    """Kompilasi spec jadi `fn(raw, *leading) -> dict` dengan urutan key sesuai spec.
+
+    `leading` = key yang nilainya dihitung caller (mis. uid, name) dan
+    ditaruh paling depan di dict hasil, supaya record dibangun sekali jadi.
+
+    Container yang bukan dict diganti `_EMPTY` (dict kosong bersama) sekali di
+    awal, jadi pembacaan field cukup satu `.get()`; alternatif membedakan
+    container asli dari pengganti lewat `is not _EMPTY`.
+    """
+    containers: dict[tuple[str, ...], str] = {(): "raw"}
+    namespace: dict = {"_EMPTY": {}}
+    lines = [f"def {name}({', '.join(('raw',) + leading)}):"]
+
+    def container(prefix: tuple[str, ...]) -> str:
+        if prefix not in containers:
+            parent = container(prefix[:-1])
+            var = f"_c{len(containers)}"
+            lines.append(f"    {var} = {parent}.get({prefix[-1]!r})")
+            lines.append(f"    if {var}.__class__ is not dict:")
+            lines.append(f"        {var} = _EMPTY")
+            containers[prefix] = var
+        return containers[prefix]
+
+    items = [f"{key!r}: {key}" for key in leading]
+    for field, path, default in spec:
+        d = _literal(default)
+        if d is None:
+            d = f"_d{len(namespace)}"
+            namespace[d] = default
+        get_default = "" if default is None else f", {d}"
+        expr = d
+        # Dibangun dari alternatif terakhir supaya alternatif pertama dicek lebih dulu
+        alts = _alternatives(path)
+        for i, alt in enumerate(reversed(alts)):
+            var = container(alt[:-1])
+            access = f"{var}.get({alt[-1]!r}{get_default})"
+            expr = access if i == 0 else f"({access} if {var} is not _EMPTY else {expr})"
+        items.append(f"{field!r}: {expr}")
+    lines.append("    return {" + ", ".join(items) + "}")
+    source = "\n".join(lines)
+
+    exec(compile(source, f"<outlet_fields:{name}>", "exec"), namespace)
+    fn = namespace[name]
+    fn.source = source
+    return fn
+
+
+extract_outlet_fields = compile_fields(OUTLET_FIELDS, "extract_outlet_fields")
+# Record outlet lengkap: identitas dari `_normalize_outlet` + semua field spec
+build_outlet_record = compile_fields(
+    OUTLET_FIELDS, "build_outlet_record", leading=("uid", "name", "path", "full_url"),
+)
+
+
+# ── Benchmark ──────────────────────────────────────────────────────
+
+def _handwritten_fields(raw: dict) -> dict:
+    """Baseline: ekstraksi tulis tangan sebelum spec (isinstance + get berulang per field)."""
+    core = raw.get("core", {}) if isinstance(raw.get("core"), dict) else {}
+    delivery = raw.get("delivery", {}) if isinstance(raw.get("delivery"), dict) else {}
+    ratings = raw.get("ratings", {}) if isinstance(raw.get("ratings"), dict) else {}
+    return {
+        "short_link": core.get("shortLink", ""),
+        "latitude": core.get("location", {}).get("latitude") if isinstance(core.get("location"), dict) else None,
+        "longitude": core.get("location", {}).get("longitude") if isinstance(core.get("location"), dict) else None,
+        "status": core.get("status"),
+        "rating_average": ratings.get("average"),
+        "rating_total": ratings.get("total"),
+        "delivery_enabled": delivery.get("enabled"),
+        "delivery_max_radius_km": delivery.get("maxRadiusKm"),
+        "delivery_distance_km": delivery.get("distanceKm"),
+        "delivery_eta_minutes": delivery.get("eta", {}).get("minutes") if isinstance(delivery.get("eta"), dict) else None,
+        "price_level": raw.get("priceLevel"),
+        "image_url": (
+            raw.get("media", {}).get("logo", "")
+            if isinstance(raw.get("media"), dict) else
+            core.get("media", {}).get("logo", "") if isinstance(core.get("media"), dict) else ""
+        ),
+    }
+
+
+def load_raw_outlets(paths: list[Path], synthetic: int, seed: int = 42) -> list[dict]:
+    """Objek outlet mentah dari file respons (walk rekursif) + outlet sintetis."""
+    from gofood_core import _extract_outlets_recursive
+
+    outlets = []
+    for path in paths:
+        if path.exists():
+            outlets.extend(_extract_outlets_recursive(json.loads(path.read_text(encoding="utf-8"))))
+    if synthetic:
+        from synthetic_data import raw_outlet
+
+        rng = random.Random(seed)
+        outlets.extend(raw_outlet(rng) for _ in range(synthetic))
+    return outlets
+
+
+def _per_outlet_ns(fn, outlets: list[dict], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for raw in outlets:
+            fn(raw)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(outlets) * 1e9
+
+
+def main() -> int:
+    from gofood_core import _normalize_outlet
+
+    parser = argparse.ArgumentParser(description="Benchmark extractor field outlet terkompilasi.")
+    parser.add_argument("--inputs", nargs="*", default=list(DEFAULT_INPUTS),
+                        help="File JSON respons API / __NEXT_DATA__ yang di-intercept.")
+    parser.add_argument("--synthetic", type=int, default=DEFAULT_SYNTHETIC,
+                        help=f"Tambah N outlet sintetis (default: {DEFAULT_SYNTHETIC}).")
+    parser.add_argument("--repeat", type=int, default=5, help="Ulangan per pengukuran, diambil terbaik.")
+    parser.add_argument("--show-source", action="store_true", help="Cetak kode extractor hasil kompilasi.")
+    args = parser.parse_args()
+
+    if args.show_source:
+        print(extract_outlet_fields.source)
+    outlets = load_raw_outlets([Path(p) for p in args.inputs], args.synthetic)
+    if not outlets:
+        print("[ERROR] Tidak ada outlet mentah untuk diuji.")
+        return 1
+    mismatch = sum(
+        1 for raw in outlets
+        if not (extract_outlet_fields(raw) == extract_interpreted(raw) == _handwritten_fields(raw))
+    )
+    print(f"[INFO] {len(outlets)} outlet mentah, {len(OUTLET_FIELDS)} field, hasil beda: {mismatch}")
+
+    rows = [
+        ("tulis tangan (baseline)", _per_outlet_ns(_handwritten_fields, outlets, args.repeat)),
+        ("walker spec generik", _per_outlet_ns(extract_interpreted, outlets, args.repeat)),
+        ("spec terkompilasi", _per_outlet_ns(extract_outlet_fields, outlets, args.repeat)),
+    ]
+    baseline = rows[0][1]
+    print(f"{'extractor':26s} {'ns/outlet':>10s} {'speedup':>8s}")
+    for label, ns in rows:
+        print(f"{label:26s} {ns:10.0f} {baseline / ns:7.2f}x")
+    full = _per_outlet_ns(lambda r: _normalize_outlet(r, "surabaya"), outlets, args.repeat)
+    print(f"[INFO] _normalize_outlet (validasi + record lengkap): {full:.0f} ns/outlet")
+    return 0 if mismatch == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
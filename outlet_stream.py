@@ -0,0 +1,204 @@
+"""
+Outlet Stream — pipeline producer/consumer step 2 → step 3 (`--stream`)
+=======================================================================
+Tanpa streaming, step 3 baru mulai setelah scroll loop step 2 selesai,
+padahal tiap outlet sudah siap di-scrape begitu interceptor menormalisasinya.
+Dengan `OutletStream`:
+
+  - step 2 (producer) memasukkan outlet baru ke `queue.Queue` bounded
+  - consumer step 3 jalan di thread sendiri dengan `sync_playwright()` dan
+    browser sendiri (Playwright sync terikat ke thread yang membukanya),
+    jadi scrape profil berjalan bersamaan dengan scroll near-me
+  - backpressure: `put()` memblokir saat queue penuh, dan scroll loop
+    menunggu ada ruang (`wait_room()`) sebelum scroll berikutnya, jadi
+    discovery tidak lari jauh di depan extraction
+
+Consumer memanggil `serve(consume)`, dengan `consume(outlet) -> float`
+yang mengembalikan jeda (detik) sebelum outlet berikutnya boleh diambil.
+Pacing `RateController` ditunggu di thread consumer, bukan di scroll.
+`overlap_s` di `report()` adalah waktu extraction yang benar-benar
+tumpang-tindih dengan discovery; sisanya (`tail_s`) berjalan setelah
+discovery selesai.
+"""
+
+import argparse
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+# ── Defaults ────────────────────────────────────────────────────────
+DEFAULT_BUFFER = 20
+POLL_S = 1.0  # interval cek consumer masih hidup saat producer menunggu
+
+_DONE = object()
+
+
+class OutletStream:
+    """Queue bounded outlet step 2 → step 3 dengan consumer di thread sendiri."""
+
+    def __init__(self, maxsize: int = DEFAULT_BUFFER, limit: int | None = None):
+        self.maxsize = max(1, maxsize)
+        self.limit = limit
+        self.accepted: list[dict] = []     # urut masuk = target step 3
+        self._queue: queue.Queue = queue.Queue(self.maxsize)
+        self._seen: set[str] = set()
+        self._lock = threading.Lock()      # put() dipanggil thread InterceptWorker
+        self._ready = threading.Event()
+        self._abort = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._result: Any = None
+        self._error: BaseException | None = None
+        self.consumed = 0
+        self.peak = 0
+        self.stalls = 0                    # berapa kali producer menunggu queue penuh
+        self.overlap_s = 0.0               # waktu consume selama discovery masih jalan
+        self.tail_s = 0.0                  # waktu consume setelah discovery selesai
+        self.closed = False
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def aborted(self) -> bool:
+        return self._abort.is_set()
+
+    # ── Producer (thread step 2) ──
+
+    def start(self, run: Callable[["OutletStream"], Any]) -> None:
+        """Jalankan `run(stream)` di thread consumer; kembali setelah consumer siap (`serve`)."""
+        def target():
+            try:
+                self._result = run(self)
+            except BaseException as exc:
+                self._error = exc
+            finally:
+                self._ready.set()
+
+        self._thread = threading.Thread(target=target, name="step3-stream", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            self._thread.join()
+            raise self._error
+
+    def _alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _stall(self) -> None:
+        with self._lock:
+            self.stalls += 1
+        print(f"    [STREAM] Queue penuh ({self._queue.qsize()}/{self.maxsize}) — discovery menunggu extraction")
+
+    def put(self, outlet: dict) -> bool:
+        """Masukkan outlet (by uid, sekali saja, sampai `limit`). Memblokir selama queue penuh."""
+        uid = outlet.get("uid")
+        with self._lock:
+            if not uid or uid in self._seen:
+                return False
+            if self.limit is not None and len(self.accepted) >= self.limit:
+                return False
+            self._seen.add(uid)
+            self.accepted.append(outlet)
+        try:
+            self._queue.put_nowait(outlet)
+        except queue.Full:
+            if not self._alive():
+                return False  # consumer mati; error-nya dilempar join()
+            self._stall()
+            while True:
+                try:
+                    self._queue.put(outlet, timeout=POLL_S)
+                    break
+                except queue.Full:
+                    if not self._alive():
+                        return False  # consumer mati; error-nya dilempar join()
+        with self._lock:
+            self.peak = max(self.peak, self._queue.qsize())
+        return True
+
+    def wait_room(self) -> None:
+        """Backpressure di scroll loop: tunggu sampai queue tidak penuh."""
+        if not self._queue.full():
+            return
+        self._stall()
+        with self._queue.not_full:  # mutex queue sudah dipegang: jangan panggil qsize()/full()
+            while len(self._queue.queue) >= self.maxsize and self._alive():
+                self._queue.not_full.wait(POLL_S)
+
+    def close(self) -> Any:
+        """Discovery selesai: consumer menghabiskan sisa queue. Return hasil `run`."""
+        self.closed = True
+        while self._alive():
+            try:
+                self._queue.put(_DONE, timeout=POLL_S)
+                break
+            except queue.Full:
+                continue
+        return self.join()
+
+    def abort(self) -> None:
+        """Discovery gagal: consumer berhenti setelah outlet yang sedang di-scrape."""
+        self.closed = True
+        self._abort.set()
+        try:
+            self._queue.put_nowait(_DONE)
+        except queue.Full:
+            pass  # consumer tidak sedang menunggu get(); flag abort cukup
+        if self._thread is not None:
+            self._thread.join()
+
+    def join(self) -> Any:
+        if self._thread is not None:
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    # ── Consumer (thread step 3) ──
+
+    def serve(self, consume: Callable[[dict], float]) -> None:
+        """Loop consumer: ambil outlet sampai `close()`/`abort()`, tunggu jeda pacing di thread ini."""
+        self._ready.set()
+        ready_at = 0.0
+        while not self._abort.is_set():
+            outlet = self._queue.get()
+            if outlet is _DONE or self._abort.is_set():
+                break
+            wait = ready_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            during = not self.closed
+            t0 = time.monotonic()
+            delay = consume(outlet)
+            elapsed = time.monotonic() - t0
+            self.consumed += 1
+            if during:
+                self.overlap_s += elapsed
+            else:
+                self.tail_s += elapsed
+            ready_at = time.monotonic() + max(0.0, delay)
+
+    def summary(self) -> dict:
+        return {
+            "accepted": len(self.accepted),
+            "consumed": self.consumed,
+            "buffer": self.maxsize,
+            "peak_depth": self.peak,
+            "backpressure_stalls": self.stalls,
+            "overlap_s": round(self.overlap_s, 1),
+            "tail_s": round(self.tail_s, 1),
+        }
+
+    def report(self) -> None:
+        s = self.summary()
+        print(f"  [STREAM] {s['consumed']}/{s['accepted']} outlet di-consume | peak queue "
+              f"{s['peak_depth']}/{s['buffer']} | backpressure {s['backpressure_stalls']}x | "
+              f"extraction selama discovery {s['overlap_s']}s, setelahnya {s['tail_s']}s")
+
+
+def add_stream_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--stream", action="store_true",
+                        help="Mulai step 3 selama step 2 masih scroll (producer/consumer, urutan discovery).")
+    parser.add_argument("--stream-buffer", type=int, default=DEFAULT_BUFFER,
+                        help=f"Kapasitas queue outlet step 2 → step 3 (default: {DEFAULT_BUFFER}).")
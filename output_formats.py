@@ -0,0 +1,374 @@
+"""
+Output Formats — writer/reader untuk JSON, JSONL, dan CSV (opsional terkompresi)
+=================================================================================
+Format ditentukan dari suffix path:
+  - `.json`   → JSON array (default indent=2, atau compact)
+  - `.jsonl`  → satu record JSON per baris
+  - `.csv`    → CSV flat
+Ditambah suffix kompresi opsional:
+  - `.gz`     → gzip (stdlib)
+  - `.zst`    → zstd (butuh package `zstandard`)
+
+Contoh: `gofood_gubeng-restaurants_menus.jsonl.gz`.
+
+Semua reader bersifat streaming (record per record), jadi file besar
+maupun terkompresi tidak perlu di-decompress ke disk atau di-load penuh.
+"""
+
+import csv
+import gzip
+import io
+import json
+from contextlib import contextmanager
+from pathlib import Path
+
+import json_codec
+
+# ── Konstanta ───────────────────────────────────────────────────────
+FORMATS = ("json", "jsonl")
+COMPRESSION_SUFFIX = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+_CHUNK_SIZE = 1 << 16
+
+
+# ── Path helpers ───────────────────────────────────────────────────
+
+def _compression_of(path: Path) -> str:
+    for name, suffix in COMPRESSION_SUFFIX.items():
+        if suffix and path.name.endswith(suffix):
+            return name
+    return "none"
+
+
+def _strip_compression(path: Path) -> Path:
+    suffix = COMPRESSION_SUFFIX[_compression_of(path)]
+    return path.with_name(path.name[: -len(suffix)]) if suffix else path
+
+
+def format_of(path: Path) -> str:
+    """Return "json", "jsonl" atau "csv" berdasarkan suffix (abaikan kompresi)."""
+    suffix = _strip_compression(Path(path)).suffix.lower()
+    if suffix == ".jsonl":
+        return "jsonl"
+    if suffix == ".csv":
+        return "csv"
+    return "json"
+
+
+def with_format(path: Path, fmt: str = "json", compression: str = "none") -> Path:
+    """Ganti suffix path sesuai format + kompresi.
+
+    `with_format(Path("a_menus.json"), "jsonl", "gzip")` → `a_menus.jsonl.gz`.
+    Path CSV hanya menerima suffix kompresi (fmt diabaikan).
+    """
+    path = _strip_compression(Path(path))
+    if path.suffix.lower() != ".csv":
+        if fmt not in FORMATS:
+            raise ValueError(f"Format tidak dikenal: {fmt!r} (pilih: {', '.join(FORMATS)})")
+        path = path.with_suffix(f".{fmt}")
+    if compression not in COMPRESSION_SUFFIX:
+        raise ValueError(
+            f"Kompresi tidak dikenal: {compression!r} (pilih: {', '.join(COMPRESSION_SUFFIX)})"
+        )
+    return path.with_name(path.name + COMPRESSION_SUFFIX[compression])
+
+
+# ── Low-level open ─────────────────────────────────────────────────
+
+def _open_zstd(path: Path, mode: str):
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError(
+            f"File {path} butuh zstd; install dulu: pip install zstandard"
+        ) from exc
+    return zstandard.open(path, mode + "b")
+
+
+def open_text(path: Path, mode: str = "r", newline: str | None = None):
+    """Buka file teks UTF-8, transparan terhadap kompresi gzip/zstd."""
+    path = Path(path)
+    compression = _compression_of(path)
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8", newline=newline)
+    if compression == "zstd":
+        return io.TextIOWrapper(_open_zstd(path, mode), encoding="utf-8", newline=newline)
+    return path.open(mode, encoding="utf-8", newline=newline)
+
+
+@contextmanager
+def atomic_open_text(path: Path, newline: str | None = None):
+    """Tulis ke `<path>.tmp` lalu rename — file lama tetap utuh kalau gagal di tengah."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Suffix kompresi harus tetap di akhir supaya open_text memilih codec yang benar
+    suffix = COMPRESSION_SUFFIX[_compression_of(path)]
+    tmp = path.with_name(f"{_strip_compression(path).name}.tmp{suffix}")
+    try:
+        with open_text(tmp, "w", newline=newline) as f:
+            yield f
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    tmp.replace(path)
+
+
+# ── Byte-offset index ──────────────────────────────────────────────
+
+INDEX_SUFFIX = ".idx"
+
+
+def index_path(path: Path) -> Path:
+    """Path sidecar index untuk file data: `<nama file>.idx`."""
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def is_record_file(path: Path) -> bool:
+    """True untuk file JSON/JSONL (boleh terkompresi), bukan tmp/index/CSV."""
+    path = Path(path)
+    return (
+        _strip_compression(path).suffix.lower() in (".json", ".jsonl")
+        and ".tmp" not in path.name
+    )
+
+
+class _SpanRecorder:
+    """Kumpulkan span byte (offset, length) per key selama file ditulis."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.spans: dict[str, list[list[int]]] = {}
+        self._last_key = None
+
+    def add(self, key, offset: int, length: int) -> None:
+        if key in (None, ""):
+            self._last_key = None
+            return
+        key = str(key)
+        spans = self.spans.setdefault(key, [])
+        # Baris CSV berurutan untuk key yang sama digabung jadi satu span
+        if key == self._last_key and spans and spans[-1][0] + spans[-1][1] == offset:
+            spans[-1][1] += length
+        else:
+            spans.append([offset, length])
+        self._last_key = key
+
+    def save(self, data_path: Path, fmt: str, fieldnames: list[str] | None = None) -> Path:
+        meta = {
+            "version": 1,
+            "format": fmt,
+            "key": self.key,
+            "size": data_path.stat().st_size,
+            "fieldnames": fieldnames,
+            "spans": self.spans,
+        }
+        out = index_path(data_path)
+        tmp = out.with_name(out.name + ".tmp")
+        tmp.write_text(json_codec.dumps(meta), encoding="utf-8")
+        tmp.replace(out)
+        return out
+
+
+# ── Writers ────────────────────────────────────────────────────────
+
+class RecordWriter:
+    """Streaming writer untuk JSON array / JSONL, format dari suffix path.
+
+    Mode JSON default menghasilkan byte yang identik dengan
+    `json.dumps(records, ensure_ascii=False, indent=2) + "\\n"`.
+
+    Jika `index_key` diset dan file tidak terkompresi, sidecar `<file>.idx`
+    ditulis berisi span byte tiap record (lihat `record_index.py`).
+    """
+
+    def __init__(self, path: Path, compact: bool = False, index_key: str | None = None):
+        self.path = Path(path)
+        self.fmt = format_of(self.path)
+        if self.fmt == "csv":
+            raise ValueError(f"RecordWriter tidak untuk CSV: {self.path}")
+        self.compact = compact
+        self.count = 0
+        uncompressed = _compression_of(self.path) == "none"
+        self._index = _SpanRecorder(index_key) if index_key and uncompressed else None
+        self._pos = 0
+        self._cm = None
+        self._f = None
+
+    def __enter__(self) -> "RecordWriter":
+        self._cm = atomic_open_text(self.path, newline="\n")
+        self._f = self._cm.__enter__()
+        return self
+
+    def _emit(self, text: str) -> int:
+        self._f.write(text)
+        n = len(text.encode("utf-8")) if self._index is not None else 0
+        self._pos += n
+        return n
+
+    def write(self, record) -> None:
+        if self.fmt == "jsonl":
+            body = json_codec.dumps(record)
+            prefix, suffix = "", "\n"
+        elif self.compact:
+            body = json_codec.dumps(record)
+            prefix, suffix = ("[" if self.count == 0 else ","), ""
+        else:
+            # Indent 2 spasi tambahan per baris; indent baris pertama masuk prefix
+            raw = json_codec.dumps(record, indent=True)
+            body = "\n  ".join(raw.split("\n"))
+            prefix, suffix = ("[\n  " if self.count == 0 else ",\n  "), ""
+
+        self._emit(prefix)
+        offset = self._pos
+        length = self._emit(body)
+        self._emit(suffix)
+        if self._index is not None and isinstance(record, dict):
+            self._index.add(record.get(self._index.key), offset, length)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None and self.fmt == "json":
+            if self.count == 0:
+                self._f.write("[]\n")
+            else:
+                self._f.write("]\n" if self.compact else "\n]\n")
+        result = self._cm.__exit__(exc_type, exc, tb)
+        if exc_type is None and self._index is not None:
+            self._index.save(self.path, self.fmt)
+        return result
+
+
+def write_records(
+    path: Path, records, compact: bool = False, index_key: str | None = None,
+) -> int:
+    """Tulis iterable record ke JSON/JSONL (opsional terkompresi). Return jumlah record."""
+    with RecordWriter(path, compact=compact, index_key=index_key) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.count
+
+
+def write_csv(path: Path, rows, fieldnames: list[str], index_key: str | None = None) -> int:
+    """Tulis iterable baris dict ke CSV (opsional terkompresi). Return jumlah baris.
+
+    Dengan `index_key` (dan tanpa kompresi), blok baris per key di-index ke `<file>.idx`.
+    """
+    path = Path(path)
+    index = _SpanRecorder(index_key) if index_key and _compression_of(path) == "none" else None
+    count = 0
+    with atomic_open_text(path, newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        if index is None:
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        else:
+            # Tulis per baris lewat buffer supaya panjang byte tiap baris diketahui
+            buf = io.StringIO()
+            row_writer = csv.DictWriter(buf, fieldnames=fieldnames)
+            row_writer.writeheader()
+            header = buf.getvalue()
+            f.write(header)
+            pos = len(header.encode("utf-8"))
+            for row in rows:
+                buf.seek(0)
+                buf.truncate()
+                row_writer.writerow(row)
+                line = buf.getvalue()
+                f.write(line)
+                n = len(line.encode("utf-8"))
+                index.add(row.get(index_key), pos, n)
+                pos += n
+                count += 1
+    if index is not None:
+        index.save(path, "csv", fieldnames)
+    return count
+
+
+# ── Readers ────────────────────────────────────────────────────────
+
+def iter_json_array(f, chunk_size: int = _CHUNK_SIZE):
+    """Yield elemen top-level dari file-object JSON array satu per satu.
+
+    Hanya buffer satu elemen (plus sisa chunk) yang ditahan di memori,
+    jadi file multi-megabyte tidak perlu di-`json.loads` sekaligus.
+    """
+    decoder = json.JSONDecoder()
+    name = getattr(f, "name", "<stream>")
+    buf = ""
+    pos = 0
+    started = False
+    eof = False
+
+    while True:
+        # Lewati whitespace dan separator antar elemen
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            buf, pos = f.read(chunk_size), 0
+            eof = not buf
+
+        if pos >= len(buf):
+            if started:
+                raise ValueError(f"JSON array tidak tertutup: {name}")
+            return
+
+        if not started:
+            if buf[pos] != "[":
+                raise ValueError(f"Input bukan array JSON: {name}")
+            started = True
+            pos += 1
+            continue
+
+        if buf[pos] == "]":
+            return
+
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Elemen terpotong di batas chunk — tambah buffer lalu coba lagi
+            more = f.read(chunk_size)
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+
+        # Angka di ujung buffer bisa saja terpotong; pastikan ada delimiter
+        if end >= len(buf) and not eof:
+            more = f.read(chunk_size)
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+
+        yield obj
+        pos = end
+
+
+def iter_records(path: Path):
+    """Yield record dari file JSON array / JSONL / CSV (opsional terkompresi)."""
+    path = Path(path)
+    fmt = format_of(path)
+    if fmt == "csv":
+        yield from iter_csv_rows(path)
+        return
+    with open_text(path) as f:
+        if fmt == "jsonl":
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json_codec.loads(line)
+        else:
+            yield from iter_json_array(f)
+
+
+def iter_csv_rows(path: Path):
+    """Yield baris CSV sebagai dict (opsional terkompresi)."""
+    with open_text(Path(path), newline="") as f:
+        yield from csv.DictReader(f)
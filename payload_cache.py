@@ -0,0 +1,195 @@
+"""
+Payload Cache — arsip content-addressed untuk payload mentah
+============================================================
+Simpan raw `__NEXT_DATA__` (profil outlet & halaman near-me) dan body API
+yang di-intercept saat discovery, supaya output bisa dibangun ulang
+(`reparse.py`) setelah parser berubah tanpa scraping ulang.
+
+Layout di disk:
+  <cache_dir>/index.sqlite              — index entry + statistik blob
+  <cache_dir>/blobs/ab/<sha256>.json.gz — payload (gzip), nama = hash isi
+
+Entry di-key oleh (kind, key, fetched_at):
+  - kind "menu"          : key = outlet uid, payload = __NEXT_DATA__ profil
+  - kind "nearme"        : key = locality, payload = __NEXT_DATA__ near-me
+  - kind "api"           : key = locality, payload = body JSON API intercept
+
+Payload identik (hash sama) hanya disimpan sekali. Ukuran total blob
+dibatasi `max_bytes`; blob yang paling lama tidak diakses dibuang dulu (LRU).
+
+Koneksi SQLite dibuka `check_same_thread=False` dan operasi tulis dijaga
+lock, karena body API diarsipkan dari thread `InterceptWorker`.
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# ── Defaults ────────────────────────────────────────────────────────
+DEFAULT_CACHE_DIR = Path("output/cache")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GiB (ukuran terkompresi)
+
+KINDS = ("menu", "nearme", "api")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256      TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind         TEXT NOT NULL,
+    key          TEXT NOT NULL,
+    namespace    TEXT NOT NULL,
+    service_area TEXT NOT NULL,
+    url          TEXT NOT NULL,
+    fetched_at   TEXT NOT NULL,
+    sha256       TEXT NOT NULL REFERENCES blobs(sha256)
+);
+CREATE INDEX IF NOT EXISTS entries_ns ON entries(namespace, kind, fetched_at);
+CREATE INDEX IF NOT EXISTS entries_sha ON entries(sha256);
+CREATE INDEX IF NOT EXISTS blobs_lru ON blobs(last_access);
+"""
+
+
+class PayloadCache:
+    """Cache payload mentah dengan index SQLite dan eviction LRU berbasis ukuran."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.blob_dir = self.cache_dir / "blobs"
+        self.max_bytes = max_bytes
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        # timeout + WAL: aman dipakai bersama beberapa proses (runner sharded)
+        self._db = sqlite3.connect(self.cache_dir / "index.sqlite", timeout=30, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    # ── Blob helpers ───────────────────────────────────────────────
+
+    def _blob_path(self, sha: str) -> Path:
+        return self.blob_dir / sha[:2] / f"{sha}.json.gz"
+
+    def _write_blob(self, sha: str, data: bytes) -> int:
+        path = self._blob_path(sha)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(gzip.compress(data, compresslevel=6))
+        tmp.replace(path)
+        return path.stat().st_size
+
+    # ── Public API ─────────────────────────────────────────────────
+
+    def put(
+        self, kind: str, key: str, payload: str, namespace: str,
+        service_area: str = "", url: str = "", fetched_at: str = "",
+    ) -> str:
+        """Arsipkan satu payload. Return sha256 isi payload."""
+        if kind not in KINDS:
+            raise ValueError(f"Kind cache tidak dikenal: {kind!r}")
+        data = payload.encode("utf-8")
+        sha = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            return self._put(kind, key, data, sha, namespace, service_area, url, fetched_at)
+
+    def _put(
+        self, kind: str, key: str, data: bytes, sha: str, namespace: str,
+        service_area: str, url: str, fetched_at: str,
+    ) -> str:
+        now = time.time()
+        row = self._db.execute("SELECT size FROM blobs WHERE sha256 = ?", (sha,)).fetchone()
+        if row is None or not self._blob_path(sha).exists():
+            size = self._write_blob(sha, data)
+            self._db.execute(
+                "INSERT OR REPLACE INTO blobs(sha256, size, last_access) VALUES (?, ?, ?)",
+                (sha, size, now),
+            )
+            self._total += size - (row[0] if row else 0)
+        else:
+            self._db.execute("UPDATE blobs SET last_access = ? WHERE sha256 = ?", (now, sha))
+
+        self._db.execute(
+            "INSERT INTO entries(kind, key, namespace, service_area, url, fetched_at, sha256) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (kind, key, namespace, service_area, url, fetched_at, sha),
+        )
+        self._db.commit()
+
+        if self._total > self.max_bytes:
+            self.evict()
+        return sha
+
+    def get(self, sha: str) -> str | None:
+        """Baca payload by hash (update waktu akses LRU). None jika sudah di-evict."""
+        path = self._blob_path(sha)
+        try:
+            data = gzip.decompress(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._db.execute("UPDATE blobs SET last_access = ? WHERE sha256 = ?", (time.time(), sha))
+            self._db.commit()
+        return data.decode("utf-8")
+
+    def entries(self, namespace: str | None = None, kind: str | None = None) -> list[dict]:
+        """Daftar entry (urut fetched_at), opsional difilter namespace/kind."""
+        sql = ("SELECT kind, key, namespace, service_area, url, fetched_at, sha256 "
+               "FROM entries WHERE 1=1")
+        params: list = []
+        if namespace is not None:
+            sql += " AND namespace = ?"
+            params.append(namespace)
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        sql += " ORDER BY fetched_at, id"
+        cols = ("kind", "key", "namespace", "service_area", "url", "fetched_at", "sha256")
+        return [dict(zip(cols, row)) for row in self._db.execute(sql, params)]
+
+    def namespaces(self) -> list[str]:
+        return [r[0] for r in self._db.execute(
+            "SELECT DISTINCT namespace FROM entries ORDER BY namespace"
+        )]
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Buang blob least-recently-used sampai total <= max_bytes. Return jumlah blob dibuang."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            return self._evict(limit)
+
+    def _evict(self, limit: int) -> int:
+        # Hitung ulang dari index — proses lain mungkin ikut menulis
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        removed = 0
+        for sha, size in self._db.execute(
+            "SELECT sha256, size FROM blobs ORDER BY last_access"
+        ).fetchall():
+            if self._total <= limit:
+                break
+            self._blob_path(sha).unlink(missing_ok=True)
+            self._db.execute("DELETE FROM entries WHERE sha256 = ?", (sha,))
+            self._db.execute("DELETE FROM blobs WHERE sha256 = ?", (sha,))
+            self._total -= size
+            removed += 1
+        self._db.commit()
+        return removed
+
+    def stats(self) -> dict:
+        n_blobs = self._db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+        by_kind = dict(self._db.execute("SELECT kind, COUNT(*) FROM entries GROUP BY kind"))
+        return {
+            "blobs": n_blobs,
+            "bytes": self._total,
+            "max_bytes": self.max_bytes,
+            "entries": by_kind,
+        }
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,142 @@
+"""
+Rate Control — pacing adaptif AIMD antar request
+================================================
+Pengganti `random.uniform(delay_min, delay_max)`: jeda antar request diatur
+oleh controller additive-increase / multiplicative-decrease (seperti TCP).
+
+  - Respons sehat  → rate naik sedikit (additive increase)
+  - Sinyal tekanan → rate dipotong (multiplicative decrease)
+
+Sinyal tekanan: timeout goto, HTTP 429/5xx (atau 403 challenge), `__NEXT_DATA__`
+tidak ada di halaman, dan latency goto di atas `slow_latency` atau jauh di
+atas rata-rata (EWMA). Interval selalu dijepit ke [min_interval, max_interval]
+yang diset operator, dengan jitter kecil supaya tidak terlihat periodik.
+"""
+
+import random
+import time
+
+# ── Defaults ────────────────────────────────────────────────────────
+DEFAULT_INCREASE = 0.01        # +request/detik per respons sehat (sebelum dijepit)
+DEFAULT_DECREASE = 0.5         # rate dikali faktor ini saat ada sinyal tekanan
+DEFAULT_SLOW_LATENCY = 15.0    # detik; goto lebih lambat dari ini = tekanan
+DEFAULT_JITTER = 0.15          # ±15% dari interval
+EWMA_ALPHA = 0.2
+SLOW_FACTOR = 3.0              # latency > 3× EWMA juga dihitung tekanan
+
+PRESSURE_STATUSES = {403, 429, 500, 502, 503, 504}
+
+
+class RateController:
+    """Controller AIMD untuk interval antar request dalam batas [min, max] detik."""
+
+    def __init__(
+        self, min_interval: float, max_interval: float, initial: float | None = None,
+        increase: float = DEFAULT_INCREASE, decrease: float = DEFAULT_DECREASE,
+        slow_latency: float = DEFAULT_SLOW_LATENCY, jitter: float = DEFAULT_JITTER,
+        name: str = "rate",
+    ):
+        if min_interval > max_interval:
+            raise ValueError(f"min_interval {min_interval} > max_interval {max_interval}")
+        self.min_interval = max(min_interval, 0.0)
+        self.max_interval = max_interval
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_latency = slow_latency
+        self.jitter = jitter
+        self.name = name
+        start = initial if initial is not None else (self.min_interval + self.max_interval) / 2
+        self.interval = self._clamp(start)
+
+        self.latency_ewma: float | None = None
+        self.observations = 0
+        self.increases = 0
+        self.decreases = 0
+        self.signals: dict[str, int] = {}
+        self.slept = 0.0
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    @property
+    def rate(self) -> float:
+        """Request per detik saat ini (inf jika interval 0)."""
+        return 1.0 / self.interval if self.interval > 0 else float("inf")
+
+    # ── Feedback ───────────────────────────────────────────────────
+
+    def observe(
+        self, latency: float | None = None, status: int | None = None,
+        timeout: bool = False, payload_missing: bool = False, failed: bool = False,
+    ) -> str | None:
+        """Catat hasil satu request. Return nama sinyal tekanan (None jika sehat)."""
+        self.observations += 1
+        signal = None
+        if timeout:
+            signal = "timeout"
+        elif status in PRESSURE_STATUSES:
+            signal = f"http_{status}"
+        elif payload_missing:
+            signal = "payload_missing"
+        elif failed:
+            signal = "error"
+        elif latency is not None and (
+            latency > self.slow_latency
+            or (self.latency_ewma is not None and latency > SLOW_FACTOR * self.latency_ewma)
+        ):
+            signal = "slow"
+
+        if latency is not None:
+            self.latency_ewma = latency if self.latency_ewma is None else (
+                EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency_ewma
+            )
+
+        if signal is None:
+            # Additive increase pada rate: 1/interval + increase
+            new_rate = (1.0 / self.interval if self.interval > 0 else float("inf")) + self.increase
+            self.interval = self._clamp(1.0 / new_rate if new_rate != float("inf") else 0.0)
+            self.increases += 1
+        else:
+            # Multiplicative decrease pada rate = interval dibagi faktor
+            base = self.interval if self.interval > 0 else self.min_interval or 1.0
+            self.interval = self._clamp(base / self.decrease)
+            self.decreases += 1
+            self.signals[signal] = self.signals.get(signal, 0) + 1
+        return signal
+
+    # ── Pacing ─────────────────────────────────────────────────────
+
+    def next_delay(self) -> float:
+        delay = self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+        return self._clamp(delay)
+
+    def wait(self, label: str = "") -> float:
+        """Tidur sesuai interval saat ini (dengan jitter). Return detik tidur."""
+        delay = self.next_delay()
+        suffix = f" — {label}" if label else ""
+        print(f"    Waiting {delay:.1f}s (interval {self.interval:.1f}s){suffix}...")
+        time.sleep(delay)
+        self.slept += delay
+        return delay
+
+    def summary(self) -> dict:
+        """Ringkasan rate yang dicapai (untuk log & summary JSON)."""
+        return {
+            "interval_s": round(self.interval, 2),
+            "rate_per_min": round(60.0 / self.interval, 2) if self.interval > 0 else None,
+            "min_interval_s": self.min_interval,
+            "max_interval_s": self.max_interval,
+            "observations": self.observations,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "signals": dict(self.signals),
+            "latency_ewma_s": round(self.latency_ewma, 2) if self.latency_ewma is not None else None,
+            "slept_s": round(self.slept, 1),
+        }
+
+    def report(self) -> None:
+        s = self.summary()
+        signals = ", ".join(f"{k}={v}" for k, v in s["signals"].items()) or "-"
+        print(f"  [RATE] {self.name}: interval {s['interval_s']}s "
+              f"(~{s['rate_per_min']}/menit, batas {self.min_interval}-{self.max_interval}s) | "
+              f"+{s['increases']} / -{s['decreases']} | sinyal: {signals}")
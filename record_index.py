@@ -0,0 +1,164 @@
+"""
+Record Index — random access O(1) ke file output besar
+======================================================
+`save_outputs` menulis sidecar `<file>.idx` di samping file JSON/JSONL/CSV
+yang tidak terkompresi: key (restaurant_uid / uid) -> span byte
+[[offset, length], ...]. Reader di sini me-memory-map file data dan hanya
+men-decode byte milik record yang diminta — tanpa `json.loads` seluruh file.
+
+Usage:
+  python3 record_index.py lookup output/json/gofood_gubeng-restaurants_menus.json <restaurant_uid>
+  python3 record_index.py lookup output/csv/gofood_gubeng-restaurants_menus.csv <restaurant_uid>
+  python3 record_index.py build  output/json/gofood_gubeng-restaurants_menus.json
+"""
+
+import argparse
+import csv
+import io
+import json
+import mmap
+from pathlib import Path
+
+import json_codec
+from output_formats import _SpanRecorder, _compression_of, format_of, index_path
+
+
+class IndexedReader:
+    """Lookup record by key lewat sidecar index + mmap file data."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        idx_file = index_path(self.path)
+        if not idx_file.exists():
+            raise FileNotFoundError(
+                f"Index tidak ditemukan: {idx_file} (buat dengan: record_index.py build {self.path})"
+            )
+        meta = json.loads(idx_file.read_text(encoding="utf-8"))
+        size = self.path.stat().st_size
+        if meta.get("size") != size:
+            raise ValueError(f"Index basi untuk {self.path} (size {meta.get('size')} != {size})")
+
+        self.format = meta["format"]
+        self.key = meta["key"]
+        self.fieldnames = meta.get("fieldnames")
+        self._spans: dict[str, list[list[int]]] = meta["spans"]
+        self._f = self.path.open("rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._spans
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def keys(self):
+        return self._spans.keys()
+
+    def get(self, key: str):
+        """Record untuk key (dict untuk JSON/JSONL, list baris dict untuk CSV); None jika tidak ada.
+
+        Jika key muncul lebih dari sekali di file, record terakhir yang dikembalikan
+        (JSON/JSONL) atau semua baris digabung (CSV).
+        """
+        spans = self._spans.get(key)
+        if not spans:
+            return None
+        if self.format == "csv":
+            rows: list[dict] = []
+            for offset, length in spans:
+                text = self._mm[offset:offset + length].decode("utf-8")
+                rows.extend(csv.DictReader(io.StringIO(text, newline=""), fieldnames=self.fieldnames))
+            return rows
+        offset, length = spans[-1]
+        return json_codec.loads(self._mm[offset:offset + length])
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        self._f.close()
+
+    def __enter__(self) -> "IndexedReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def build_index(path: Path, key: str) -> Path:
+    """Bangun index untuk file JSON array / JSONL lama yang belum punya sidecar."""
+    path = Path(path)
+    fmt = format_of(path)
+    if fmt == "csv" or _compression_of(path) != "none":
+        raise ValueError(f"Build index hanya untuk JSON/JSONL tanpa kompresi: {path}")
+
+    recorder = _SpanRecorder(key)
+    if fmt == "jsonl":
+        offset = 0
+        with path.open("rb") as f:
+            for line in f:
+                body = line.rstrip(b"\r\n")
+                if body.strip():
+                    recorder.add(json_codec.loads(body).get(key), offset, len(body))
+                offset += len(line)
+    else:
+        data = path.read_bytes()
+        text = data.decode("utf-8")
+        decoder = json.JSONDecoder()
+        pos = text.index("[") + 1
+        byte_pos = len(text[:pos].encode("utf-8"))
+        while True:
+            start = pos
+            while text[pos] in " \t\r\n,":
+                pos += 1
+            byte_pos += len(text[start:pos].encode("utf-8"))
+            if text[pos] == "]":
+                break
+            obj, end = decoder.raw_decode(text, pos)
+            length = len(text[pos:end].encode("utf-8"))
+            if isinstance(obj, dict):
+                recorder.add(obj.get(key), byte_pos, length)
+            byte_pos += length
+            pos = end
+    return recorder.save(path, fmt)
+
+
+def _default_key(path: Path) -> str:
+    return "uid" if "_outlets" in path.name else "restaurant_uid"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Lookup/build byte-offset index file output.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_lookup = sub.add_parser("lookup", help="Ambil satu record by key.")
+    p_lookup.add_argument("path")
+    p_lookup.add_argument("key")
+
+    p_build = sub.add_parser("build", help="Bangun index untuk file JSON/JSONL lama.")
+    p_build.add_argument("path", nargs="+")
+    p_build.add_argument("--key", default=None,
+                         help="Field key (default: uid untuk *_outlets, restaurant_uid selain itu).")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        for p in map(Path, args.path):
+            out = build_index(p, args.key or _default_key(p))
+            print(f"[DONE] {out}")
+        return 0
+
+    try:
+        with IndexedReader(Path(args.path)) as reader:
+            record = reader.get(args.key)
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"[ERROR] {exc}")
+        return 1
+    if record is None:
+        print(f"[WARNING] Key tidak ditemukan: {args.key}")
+        return 1
+    print(json.dumps(record, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,161 @@
+"""
+Reparse — bangun ulang output JSON/CSV dari payload cache
+=========================================================
+Setelah `_parse_menu` / `_normalize_outlet` berubah, jalankan script ini
+untuk regenerate semua `gofood_<locality>_outlets/menus` dari payload mentah
+yang diarsipkan step 2 + step 3 (lihat `payload_cache.py`), tanpa scraping ulang.
+
+  - Outlet : replay body API + __NEXT_DATA__ near-me (urut waktu fetch),
+             dedup by uid, urut nama — sama seperti step 2.
+  - Menu   : payload profil terbaru per outlet uid, urut fetch pertama.
+
+Usage:
+  python3 reparse.py                           # semua locality di cache
+  python3 reparse.py --locality gubeng-restaurants
+  python3 reparse.py --output-dir /tmp/reparsed --format jsonl --compress gzip
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import json_codec
+from gofood_core import (
+    OUTPUT_DIR,
+    _extract_outlets_recursive,
+    _finalize_menu_record,
+    _normalize_outlet,
+    _origin,
+    _outlets_from_next_data,
+    _parse_menu_text,
+    add_output_format_args,
+    save_outputs,
+)
+from output_formats import iter_records, with_format
+from payload_cache import DEFAULT_CACHE_DIR, PayloadCache
+
+
+def rebuild_outlets(cache: PayloadCache, namespace: str) -> tuple[list[dict], int]:
+    """Replay payload discovery. Return (outlet_list, jumlah payload hilang/evicted)."""
+    outlets_by_uid: dict[str, dict] = {}
+    missing = 0
+    for entry in cache.entries(namespace):
+        if entry["kind"] not in ("api", "nearme"):
+            continue
+        text = cache.get(entry["sha256"])
+        if text is None:
+            missing += 1
+            continue
+        try:
+            body = json_codec.loads(text)
+        except json_codec.JSONDecodeError:
+            continue
+        found = (
+            _extract_outlets_recursive(body) if entry["kind"] == "api"
+            else _outlets_from_next_data(body)
+        )
+        for raw in found:
+            norm = _normalize_outlet(raw, entry["service_area"], _origin(entry["url"]))
+            if norm and norm["uid"] not in outlets_by_uid:
+                outlets_by_uid[norm["uid"]] = norm
+    return sorted(outlets_by_uid.values(), key=lambda o: o["name"]), missing
+
+
+def rebuild_menus(
+    cache: PayloadCache, namespace: str, outlets_by_uid: dict[str, dict],
+) -> tuple[list[dict], int]:
+    """Parse ulang payload profil terbaru per outlet. Return (records, jumlah hilang)."""
+    latest: dict[str, dict] = {}
+    for entry in cache.entries(namespace, kind="menu"):
+        latest[entry["key"]] = entry
+
+    results: list[dict] = []
+    missing = 0
+    for uid, entry in latest.items():
+        text = cache.get(entry["sha256"])
+        if text is None:
+            missing += 1
+            continue
+        name = outlets_by_uid.get(uid, {}).get("name", "")
+        results.append(_finalize_menu_record(
+            _parse_menu_text(text), uid, name, entry["url"], entry["fetched_at"],
+        ))
+    return results, missing
+
+
+def reparse_namespace(cache: PayloadCache, namespace: str, output_dir: Path, args) -> dict:
+    outlets_json = output_dir / "json" / f"gofood_{namespace}_outlets.json"
+    menus_json = output_dir / "json" / f"gofood_{namespace}_menus.json"
+    menus_csv = output_dir / "csv" / f"gofood_{namespace}_menus.csv"
+
+    outlets, missing_outlets = rebuild_outlets(cache, namespace)
+    if not outlets:
+        # Tidak ada payload discovery (mis. hanya step 3) — pertahankan snapshot lama
+        existing = with_format(outlets_json, args.format, args.compress)
+        if existing.exists():
+            outlets = list(iter_records(existing))
+            print(f"  [INFO] Tidak ada payload discovery, pakai outlet lama: {existing}")
+
+    menus, missing_menus = rebuild_menus(cache, namespace, {o["uid"]: o for o in outlets})
+    save_outputs(
+        outlets, menus, outlets_json, menus_json, menus_csv,
+        fmt=args.format, compression=args.compress, compact=args.compact_json,
+    )
+    return {
+        "namespace": namespace,
+        "outlets": len(outlets),
+        "menus": len(menus),
+        "success": sum(1 for r in menus if r.get("status") == "success"),
+        "missing_payloads": missing_outlets + missing_menus,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Bangun ulang output outlet/menu dari payload cache tanpa scraping ulang.",
+    )
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR),
+                        help=f"Direktori payload cache (default: {DEFAULT_CACHE_DIR}).")
+    parser.add_argument("--locality", action="append", default=None,
+                        help="Locality yang di-reparse; bisa diulang (default: semua di cache).")
+    parser.add_argument("--output-dir", default=str(OUTPUT_DIR),
+                        help=f"Root direktori output (default: {OUTPUT_DIR}).")
+    add_output_format_args(parser)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    cache_dir = Path(args.cache_dir)
+    if not (cache_dir / "index.sqlite").exists():
+        print(f"[ERROR] Cache tidak ditemukan: {cache_dir}")
+        return 1
+
+    # max_bytes tak terbatas: reparse tidak boleh memicu eviction
+    cache = PayloadCache(cache_dir, max_bytes=float("inf"))
+    namespaces = args.locality or cache.namespaces()
+    if not namespaces:
+        print("[WARNING] Cache kosong.")
+        return 0
+
+    started = time.perf_counter()
+    summaries = []
+    for ns in namespaces:
+        print(f"\n[REPARSE] {ns}")
+        summaries.append(reparse_namespace(cache, ns, Path(args.output_dir), args))
+    elapsed = time.perf_counter() - started
+    cache.close()
+
+    print(f"\n{'='*60}")
+    for s in summaries:
+        print(f"  {s['namespace']:30s} outlets={s['outlets']:4d} menus={s['menus']:4d} "
+              f"success={s['success']:4d} missing={s['missing_payloads']}")
+    total_menus = sum(s["menus"] for s in summaries)
+    rate = total_menus / elapsed if elapsed > 0 else 0.0
+    print(f"  Waktu: {elapsed:.2f}s ({rate:.1f} outlet/s)")
+    print(f"{'='*60}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
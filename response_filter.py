@@ -0,0 +1,151 @@
+"""
+Response Filter — pre-filter murah sebelum body respons diunduh & di-decode
+===========================================================================
+Interceptor step 2 dulu mengunduh (`response.text()`) dan men-decode setiap
+fetch/XHR yang URL-nya memuat salah satu `API_URL_HINTS` — termasuk endpoint
+tracking dan payload besar non-outlet yang kebetulan berisi "api". Filter
+ini menjalankan gate dari yang termurah, semuanya tanpa menyentuh body:
+
+  1. resource_type   hanya fetch/xhr
+  2. url_deny        host/path tracking & telemetry (analytics, sentry, ...)
+                     — path di-anchor per segmen: `/collect` menolak
+                     `.../g/collect?v=2`, `.../collect/x`, dan `.../collect`,
+                     tapi tidak `.../collections/promo?api=1` (feed koleksi bisa
+                     berisi outlet)
+  3. url_hint        URL harus memuat salah satu hint API
+  4. status          hanya 2xx selain 204 (redirect/error/no-content tidak punya body berguna)
+  5. content_type    jika header ada, harus JSON
+  6. content_length  jika header ada: kosong atau > batas → skip
+
+Matcher URL dikompilasi sekali jadi fungsi loop substring atas URL
+lowercase. Di CPython, `in` per hint (pencarian C) 3–15x lebih cepat
+daripada satu regex alternation (dengan/ tanpa IGNORECASE), jadi regex
+tidak dipakai. Hint yang cocok ikut dicatat, supaya terlihat hint mana yang
+benar-benar membawa outlet.
+
+Counter per rule (reject) dan per hint (lolos) dilaporkan di akhir step 2,
+beserta berapa unduhan body yang dihindari dibanding filter lama
+(resource type + hint saja) dan hasil decode (`record()`).
+"""
+
+import argparse
+import threading
+from collections import Counter
+from typing import Callable
+
+from gofood_core import API_URL_HINTS
+
+# ── Defaults ────────────────────────────────────────────────────────
+RESOURCE_TYPES = ("fetch", "xhr")
+DENY_SEGMENTS = ("collect", "track", "beacon", "telemetry")  # segmen path utuh
+DENY_HINTS = (
+    "analytics", "googletagmanager", "doubleclick", "facebook.com/tr", "clevertap",
+    "sentry", "newrelic", "nr-data.net", "hotjar", "mixpanel", "amplitude",
+    *(f"/{seg}{end}" for seg in DENY_SEGMENTS for end in ("/", "?")),
+)
+DEFAULT_MAX_MB = 5.0
+
+# Gate setelah url_hint = body yang dulu tetap diunduh
+_AVOIDED_RULES = ("url_deny", "status", "content_type", "content_length")
+
+
+def compile_url_matcher(hints: tuple[str, ...]) -> Callable[[str], str | None]:
+    """`fn(url_lowercase) -> hint pertama yang cocok | None`."""
+    hints = tuple(dict.fromkeys(h.lower() for h in hints if h))
+    lines = ["def match(url):"]
+    lines += [f"    if {h!r} in url:\n        return {h!r}" for h in hints]
+    lines.append("    return None")
+    namespace: dict = {}
+    exec(compile("\n".join(lines), "<response_filter:match>", "exec"), namespace)
+    return namespace["match"]
+
+
+class ResponseFilter:
+    """Gate respons interceptor + counter per rule. Aman dipanggil dari thread lain."""
+
+    def __init__(
+        self, hints: tuple[str, ...] = API_URL_HINTS, deny: tuple[str, ...] = DENY_HINTS,
+        max_bytes: int = int(DEFAULT_MAX_MB * 1e6), metrics=None,
+    ):
+        self._match_hint = compile_url_matcher(hints)
+        self._match_deny = compile_url_matcher(deny)
+        self.max_bytes = max_bytes
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self.rejected: Counter = Counter()
+        self.hints: Counter = Counter()
+        self.outcomes: Counter = Counter()
+        self.skipped_bytes = 0    # dari content-length yang diketahui
+
+    def _reject(self, rule: str, nbytes: int = 0) -> bool:
+        with self._lock:
+            self.rejected[rule] += 1
+            self.skipped_bytes += nbytes
+        if self.metrics is not None:
+            self.metrics.inc("responses_filtered_total", rule=rule)
+        return False
+
+    def accept(self, response) -> bool:
+        """True jika body respons layak diunduh & di-decode."""
+        if response.request.resource_type not in RESOURCE_TYPES:
+            return self._reject("resource_type")
+        url = response.url.lower()
+        # "?" sentinel: segmen deny di akhir path (tanpa query) ikut ter-anchor
+        if self._match_deny(url if "?" in url else url + "?") is not None:
+            return self._reject("url_deny")
+        hint = self._match_hint(url)
+        if hint is None:
+            return self._reject("url_hint")
+        status = response.status
+        if status < 200 or status >= 300 or status == 204:
+            return self._reject("status")
+        headers = response.headers
+        content_type = headers.get("content-type")
+        if content_type is not None and "json" not in content_type.lower():
+            return self._reject("content_type")
+        length = headers.get("content-length")
+        if length is not None and length.isdigit():
+            size = int(length)
+            if size == 0 or size > self.max_bytes:
+                return self._reject("content_length", size)
+        with self._lock:
+            self.hints[hint] += 1
+        if self.metrics is not None:
+            self.metrics.inc("responses_filtered_total", rule="accepted")
+        return True
+
+    def record(self, outcome: str) -> None:
+        """Hasil body yang lolos: `outlets`, `no_outlets`, `decode_error`."""
+        with self._lock:
+            self.outcomes[outcome] += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            accepted = sum(self.hints.values())
+            return {
+                "accepted": accepted,
+                "rejected": dict(self.rejected),
+                "accepted_by_hint": dict(self.hints.most_common()),
+                "outcomes": dict(self.outcomes),
+                "bodies_avoided": sum(self.rejected[r] for r in _AVOIDED_RULES),
+                "bytes_avoided_known": self.skipped_bytes,
+            }
+
+    def report(self) -> None:
+        s = self.summary()
+        rejected = ", ".join(f"{k}={v}" for k, v in sorted(s["rejected"].items())) or "-"
+        hints = ", ".join(f"{k}={v}" for k, v in s["accepted_by_hint"].items()) or "-"
+        outcomes = ", ".join(f"{k}={v}" for k, v in sorted(s["outcomes"].items())) or "-"
+        print(f"  [FILTER] lolos {s['accepted']} | ditolak: {rejected}")
+        print(f"  [FILTER] hint: {hints} | hasil decode: {outcomes}")
+        print(f"  [FILTER] unduh+decode body dihindari: {s['bodies_avoided']} respons "
+              f"({s['bytes_avoided_known'] / 1e6:.2f} MB dari content-length)")
+
+
+def add_response_filter_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--response-max-mb", type=float, default=DEFAULT_MAX_MB,
+                        help=f"Lewati respons API dengan content-length di atas batas ini (default: {DEFAULT_MAX_MB}).")
+
+
+def open_response_filter(args: argparse.Namespace, metrics=None) -> ResponseFilter:
+    return ResponseFilter(max_bytes=int(args.response_max_mb * 1e6), metrics=metrics)
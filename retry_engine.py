@@ -0,0 +1,170 @@
+"""
+Retry Engine — klasifikasi error, backoff, budget per outlet, circuit breaker
+============================================================================
+Dipakai step 3 supaya satu timeout tidak langsung jadi record error permanen,
+tapi juga supaya outlet lambat / blokir massal tidak menghabiskan antrian.
+
+Kelas error:
+  - timeout          : goto timeout atau budget waktu outlet habis
+  - navigation       : error navigasi lain (DNS, koneksi putus, crash page)
+  - missing_payload  : halaman terbuka tapi `__NEXT_DATA__` tidak ada / rusak
+  - challenge        : halaman anti-bot (captcha, WAF, HTTP 202/403/429)
+  - invalid          : data target tidak valid (mis. tanpa URL) — tidak di-retry
+  - lease_expired    : runner pemegang lease antrian mati/hilang sampai attempt habis
+                       (ditulis `work_queue.py`, bukan hasil scrape)
+
+`RetryPolicy` — jumlah attempt, exponential backoff + jitter, dan budget
+wall-clock per outlet (timeout goto/networkidle/wait dipotong ke sisa budget).
+
+`CircuitBreaker` — jendela geser hasil terakhir; kalau rasio gagal melewati
+threshold, runner berhenti sejenak (cooldown) sebelum mencoba lagi. Cooldown
+berlipat jika percobaan setelah jeda masih gagal.
+"""
+
+import argparse
+import random
+import time
+from collections import deque
+
+# ── Kelas error ─────────────────────────────────────────────────────
+ERROR_TIMEOUT = "timeout"
+ERROR_NAVIGATION = "navigation"
+ERROR_MISSING_PAYLOAD = "missing_payload"
+ERROR_CHALLENGE = "challenge"
+ERROR_INVALID = "invalid"
+ERROR_LEASE = "lease_expired"
+
+RETRYABLE = frozenset({ERROR_TIMEOUT, ERROR_NAVIGATION, ERROR_MISSING_PAYLOAD, ERROR_CHALLENGE})
+
+CHALLENGE_MARKERS = ("captcha", "cloudflare", "probe.js", "access denied")
+CHALLENGE_STATUSES = {202, 403, 429}
+
+# ── Defaults ────────────────────────────────────────────────────────
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 2.0
+DEFAULT_MAX_DELAY = 30.0
+DEFAULT_OUTLET_BUDGET = 90.0     # detik wall-clock per outlet (semua attempt)
+
+DEFAULT_BREAKER_WINDOW = 20
+DEFAULT_BREAKER_MIN_SAMPLES = 8
+DEFAULT_BREAKER_THRESHOLD = 0.5
+DEFAULT_BREAKER_COOLDOWN = 120.0
+DEFAULT_BREAKER_MAX_COOLDOWN = 900.0
+
+
+def is_challenge(html: str, status: int | None = None) -> bool:
+    """True jika halaman terlihat seperti challenge anti-bot."""
+    html_lower = html.lower()
+    return status in CHALLENGE_STATUSES or any(m in html_lower for m in CHALLENGE_MARKERS)
+
+
+class RetryPolicy:
+    """Batas attempt, backoff eksponensial + jitter, dan budget waktu per outlet."""
+
+    def __init__(
+        self, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = DEFAULT_BASE_DELAY, max_delay: float = DEFAULT_MAX_DELAY,
+        outlet_budget: float = DEFAULT_OUTLET_BUDGET, retry_on=RETRYABLE,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.outlet_budget = outlet_budget
+        self.retry_on = frozenset(retry_on)
+        self.retries = 0
+        self.recovered = 0
+        self.budget_exhausted = 0
+
+    def backoff(self, attempt: int) -> float:
+        """Delay sebelum attempt ke-(attempt+1): setengah tetap + setengah jitter."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def should_retry(self, error_class: str | None, attempt: int) -> bool:
+        return error_class in self.retry_on and attempt < self.max_attempts
+
+    def summary(self) -> dict:
+        return {
+            "max_attempts": self.max_attempts,
+            "outlet_budget_s": self.outlet_budget,
+            "retries": self.retries,
+            "recovered": self.recovered,
+            "budget_exhausted": self.budget_exhausted,
+        }
+
+
+class CircuitBreaker:
+    """Pause runner saat rasio gagal di jendela terakhir melewati threshold."""
+
+    def __init__(
+        self, window: int = DEFAULT_BREAKER_WINDOW, threshold: float = DEFAULT_BREAKER_THRESHOLD,
+        min_samples: int = DEFAULT_BREAKER_MIN_SAMPLES,
+        cooldown: float = DEFAULT_BREAKER_COOLDOWN, max_cooldown: float = DEFAULT_BREAKER_MAX_COOLDOWN,
+    ):
+        self.results: deque[bool] = deque(maxlen=window)
+        self.threshold = threshold
+        self.min_samples = min(min_samples, window)
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = "closed"   # closed → open → half_open → closed/open
+        self.trips = 0
+        self.paused = 0.0
+
+    @property
+    def failure_ratio(self) -> float:
+        return (self.results.count(False) / len(self.results)) if self.results else 0.0
+
+    def record(self, success: bool) -> None:
+        if self.state == "half_open":
+            if success:
+                print("  [BREAKER] Pulih — circuit ditutup kembali.")
+                self.state = "closed"
+                self.cooldown = self.base_cooldown
+                self.results.clear()
+            else:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._trip("percobaan setelah pause masih gagal")
+            return
+        self.results.append(success)
+        if len(self.results) >= self.min_samples and self.failure_ratio >= self.threshold:
+            self._trip(f"rasio gagal {self.failure_ratio:.0%} (>= {self.threshold:.0%})")
+
+    def _trip(self, reason: str) -> None:
+        self.state = "open"
+        self.trips += 1
+        print(f"  [BREAKER] Circuit terbuka: {reason} — runner pause {self.cooldown:.0f}s.")
+
+    def before_request(self) -> None:
+        """Blok selama circuit terbuka; setelah cooldown satu request percobaan (half-open)."""
+        if self.state != "open":
+            return
+        time.sleep(self.cooldown)
+        self.paused += self.cooldown
+        self.state = "half_open"
+
+    def summary(self) -> dict:
+        return {
+            "state": self.state,
+            "trips": self.trips,
+            "paused_s": round(self.paused, 1),
+            "failure_ratio": round(self.failure_ratio, 3),
+        }
+
+
+def add_retry_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help=f"Attempt per outlet dalam satu run (default: {DEFAULT_MAX_ATTEMPTS}).")
+    parser.add_argument("--outlet-budget", type=float, default=DEFAULT_OUTLET_BUDGET,
+                        help=f"Budget wall-clock per outlet, detik (default: {DEFAULT_OUTLET_BUDGET:.0f}).")
+    parser.add_argument("--breaker-threshold", type=float, default=DEFAULT_BREAKER_THRESHOLD,
+                        help="Rasio gagal yang membuka circuit breaker (default: 0.5).")
+    parser.add_argument("--breaker-cooldown", type=float, default=DEFAULT_BREAKER_COOLDOWN,
+                        help=f"Pause runner saat breaker terbuka, detik (default: {DEFAULT_BREAKER_COOLDOWN:.0f}).")
+
+
+def open_retry(args: argparse.Namespace) -> tuple[RetryPolicy, CircuitBreaker]:
+    return (
+        RetryPolicy(max_attempts=args.max_attempts, outlet_budget=args.outlet_budget),
+        CircuitBreaker(threshold=args.breaker_threshold, cooldown=args.breaker_cooldown),
+    )
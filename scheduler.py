@@ -0,0 +1,208 @@
+"""
+Priority Scheduler — urutan step 3 berdasarkan nilai & staleness outlet
+=======================================================================
+Step 2 mengembalikan outlet urut nama; dengan budget request terbatas,
+yang ter-scrape hanya outlet berawalan "A". Scheduler ini memberi skor tiap
+outlet lalu step 3 mengerjakan skor tertinggi dulu.
+
+Komponen skor (masing-masing 0..1, dikali bobot):
+  - rating  : log(1 + rating_total), dinormalisasi ke outlet terbanyak ulasan
+  - open    : 1 jika `status` outlet termasuk status buka, selain itu 0
+  - stale   : umur `scraped_at` terakhir / horizon (belum pernah = 1)
+  - change  : frekuensi menu berubah antar fetch (dari payload cache);
+              belum ada histori = CHANGE_PRIOR
+
+Histori `scraped_at` dibaca (streaming) dari output menu area sebelumnya,
+histori perubahan dari entry `menu` payload cache (hash berbeda = berubah).
+
+Usage (preview urutan tanpa scraping):
+  python3 scheduler.py --locality gubeng-restaurants --top 20
+"""
+
+import argparse
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from output_formats import COMPRESSION_SUFFIX, FORMATS, iter_records, with_format
+
+# ── Defaults ────────────────────────────────────────────────────────
+WIB = timezone(timedelta(hours=7))
+
+DEFAULT_WEIGHTS = {"rating": 1.0, "open": 2.0, "stale": 1.5, "change": 1.0}
+DEFAULT_STALE_HOURS = 7 * 24  # umur >= 1 minggu dianggap stale penuh
+OPEN_STATUSES = {1}           # core.status GoFood: 1 = outlet aktif/buka
+CHANGE_PRIOR = 0.5            # outlet tanpa histori: anggap perubahan sedang
+
+SCHEDULES = ("name", "priority")
+
+
+def parse_weights(text: str) -> dict[str, float]:
+    """Parse `rating=1,open=2` → dict bobot (komponen lain pakai default)."""
+    weights = dict(DEFAULT_WEIGHTS)
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, value = part.partition("=")
+        if name not in DEFAULT_WEIGHTS:
+            raise ValueError(
+                f"Komponen skor tidak dikenal: {name!r} (pilih: {', '.join(DEFAULT_WEIGHTS)})"
+            )
+        weights[name] = float(value)
+    return weights
+
+
+def _parse_time(value) -> datetime | None:
+    try:
+        ts = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return ts if ts.tzinfo else ts.replace(tzinfo=WIB)
+
+
+# ── Histori ────────────────────────────────────────────────────────
+
+def find_previous_output(path: Path) -> Path | None:
+    """Cari output menu sebelumnya dalam format/kompresi apa pun (yang terbaru)."""
+    candidates = [
+        with_format(path, fmt, comp)
+        for fmt in FORMATS for comp in COMPRESSION_SUFFIX
+    ]
+    existing = [p for p in candidates if p.exists()]
+    return max(existing, key=lambda p: p.stat().st_mtime) if existing else None
+
+
+def load_history(menus_path: Path | None = None, cache=None, namespace: str = "") -> dict[str, dict]:
+    """Histori per uid: {"scraped_at": datetime|None, "change_rate": float|None}."""
+    history: dict[str, dict] = defaultdict(lambda: {"scraped_at": None, "change_rate": None})
+
+    previous = find_previous_output(menus_path) if menus_path is not None else None
+    if previous is not None:
+        for record in iter_records(previous):
+            uid = record.get("restaurant_uid")
+            ts = _parse_time(record.get("scraped_at", ""))
+            if uid and ts and record.get("status") != "error":
+                last = history[uid]["scraped_at"]
+                if last is None or ts > last:
+                    history[uid]["scraped_at"] = ts
+
+    if cache is not None:
+        hashes: dict[str, list[str]] = defaultdict(list)
+        for entry in cache.entries(namespace or None, "menu"):
+            hashes[entry["key"]].append(entry["sha256"])
+            ts = _parse_time(entry["fetched_at"])
+            last = history[entry["key"]]["scraped_at"]
+            if ts and (last is None or ts > last):
+                history[entry["key"]]["scraped_at"] = ts
+        for uid, seq in hashes.items():
+            if len(seq) >= 2:
+                changes = sum(1 for a, b in zip(seq, seq[1:]) if a != b)
+                history[uid]["change_rate"] = changes / (len(seq) - 1)
+
+    return dict(history)
+
+
+# ── Skor ───────────────────────────────────────────────────────────
+
+def score_components(
+    outlet: dict, history: dict[str, dict], now: datetime,
+    max_log_rating: float, stale_hours: float = DEFAULT_STALE_HOURS,
+) -> dict[str, float]:
+    hist = history.get(outlet.get("uid"), {})
+    rating_total = outlet.get("rating_total") or 0
+    rating = math.log1p(rating_total) / max_log_rating if max_log_rating > 0 else 0.0
+
+    last = hist.get("scraped_at")
+    if last is None:
+        stale = 1.0
+    else:
+        stale = min(max((now - last).total_seconds() / 3600 / stale_hours, 0.0), 1.0)
+
+    change = hist.get("change_rate")
+    return {
+        "rating": rating,
+        "open": 1.0 if outlet.get("status") in OPEN_STATUSES else 0.0,
+        "stale": stale,
+        "change": CHANGE_PRIOR if change is None else change,
+    }
+
+
+def prioritize(
+    outlets: list[dict], history: dict[str, dict],
+    weights: dict[str, float] | None = None,
+    stale_hours: float = DEFAULT_STALE_HOURS, now: datetime | None = None,
+) -> list[tuple[float, dict]]:
+    """Return [(skor, outlet)] urut skor menurun (seri → urutan asal dipertahankan)."""
+    weights = weights or DEFAULT_WEIGHTS
+    now = now or datetime.now(WIB)
+    max_log_rating = max((math.log1p(o.get("rating_total") or 0) for o in outlets), default=0.0)
+    scored = []
+    for outlet in outlets:
+        comps = score_components(outlet, history, now, max_log_rating, stale_hours)
+        scored.append((sum(weights.get(k, 0.0) * v for k, v in comps.items()), outlet))
+    scored.sort(key=lambda pair: -pair[0])
+    return scored
+
+
+def schedule_outlets(
+    outlets: list[dict], args: argparse.Namespace,
+    menus_path: Path | None = None, cache=None, namespace: str = "",
+) -> list[dict]:
+    """Urutkan outlet untuk step 3 sesuai `--schedule` (dipanggil entry point)."""
+    if getattr(args, "schedule", "name") != "priority" or not outlets:
+        return outlets
+    history = load_history(menus_path, cache, namespace)
+    scored = prioritize(outlets, history, parse_weights(args.priority_weights), args.stale_hours)
+    seen = sum(1 for o in outlets if history.get(o.get("uid"), {}).get("scraped_at"))
+    print(f"  [SCHEDULE] priority: {len(outlets)} outlet, {seen} punya histori scrape")
+    for score, outlet in scored[:5]:
+        print(f"    {score:5.2f}  {outlet.get('name', '?')}")
+    return [outlet for _, outlet in scored]
+
+
+def add_schedule_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--schedule", choices=SCHEDULES, default="name",
+                        help="Urutan step 3: name (urut nama) atau priority (skor nilai & staleness).")
+    parser.add_argument("--priority-weights", default="",
+                        help="Bobot skor, mis. 'rating=1,open=2,stale=1.5,change=1'.")
+    parser.add_argument("--stale-hours", type=float, default=DEFAULT_STALE_HOURS,
+                        help=f"Umur scrape yang dianggap stale penuh (default: {DEFAULT_STALE_HOURS} jam).")
+
+
+# ── CLI ────────────────────────────────────────────────────────────
+
+def main() -> int:
+    from payload_cache import DEFAULT_CACHE_DIR, PayloadCache
+
+    parser = argparse.ArgumentParser(description="Preview urutan prioritas step 3 untuk satu locality.")
+    parser.add_argument("--locality", required=True, help="Locality (contoh: gubeng-restaurants).")
+    parser.add_argument("--output-dir", default="output", help="Root output (default: output).")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR),
+                        help=f"Payload cache untuk histori perubahan (default: {DEFAULT_CACHE_DIR}).")
+    parser.add_argument("--top", type=int, default=20, help="Jumlah outlet ditampilkan.")
+    add_schedule_args(parser)
+    args = parser.parse_args()
+
+    out = Path(args.output_dir)
+    outlets_path = find_previous_output(out / "json" / f"gofood_{args.locality}_outlets.json")
+    if outlets_path is None:
+        print(f"[ERROR] Output outlet {args.locality} tidak ditemukan.")
+        return 1
+    outlets = list(iter_records(outlets_path))
+
+    cache_dir = Path(args.cache_dir)
+    cache = PayloadCache(cache_dir) if (cache_dir / "index.sqlite").exists() else None
+    history = load_history(out / "json" / f"gofood_{args.locality}_menus.json", cache, args.locality)
+    scored = prioritize(outlets, history, parse_weights(args.priority_weights), args.stale_hours)
+
+    print(f"{'skor':>6}  {'rating':>6}  {'status':>6}  {'last scrape':25s}  nama")
+    for score, outlet in scored[:args.top]:
+        last = history.get(outlet["uid"], {}).get("scraped_at")
+        print(f"{score:6.2f}  {outlet.get('rating_total') or 0:6d}  {str(outlet.get('status')):>6}  "
+              f"{last.isoformat() if last else '-':25s}  {outlet.get('name', '?')}")
+    if cache is not None:
+        cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,6 +9,11 @@ Usage:
   python3 scrap_sby.py --headful          # kalau perlu solve captcha manual
   python3 scrap_sby.py --limit 10         # scrape 10 outlet per area
   python3 scrap_sby.py --start-from 3     # mulai dari area ke-3 (skip yg sudah)
+  python3 scrap_sby.py --schedule priority --budget 200   # outlet paling bernilai dulu
+
+Resume per outlet: antrian durable (output/session/gofood_queue.sqlite) menyimpan
+hasil tiap outlet. Jalankan ulang perintah yang sama setelah crash — area yang
+belum selesai lanjut dari outlet terakhir tanpa discovery ulang.
 """
 
 import argparse
@@ -19,22 +24,44 @@ import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from playwright.sync_api import sync_playwright
-
 from developer_test_scrapping import (
     BROWSER_ARGS,
+    DEFAULT_BASE_URL,
     OUTPUT_DIR,
     _context_kwargs,
+    add_base_url_args,
+    add_cache_args,
+    add_net_accounting_args,
+    add_output_format_args,
+    add_queue_args,
+    ensure_session,
     flatten_to_csv_rows,
+    open_cache,
+    open_queue,
+    resume_outlets,
     save_outputs,
-    step1_session_bootstrap,
     step2_outlet_discovery,
+    step23_stream,
     step3_batch_menu,
+    sync_playwright,
 )
+from discovery_checkpoint import add_checkpoint_args, open_checkpoint
+from intercept_worker import DEFAULT_WORKERS, add_intercept_worker_args
+from memory_profile import add_memory_args, open_memory_profiler
+from metrics import add_metrics_args, open_metrics
+from network_accounting import NetworkAccountant, merge_summaries
+from outlet_stream import DEFAULT_BUFFER, add_stream_args
+from rate_control import RateController
+from response_filter import add_response_filter_args, open_response_filter
+from retry_engine import add_retry_args, open_retry
+from session_check import add_session_args, open_session_guard
+from scheduler import add_schedule_args, schedule_outlets
+from warm_start import add_warm_start_args, open_warm_start
 
 # ── Konfigurasi ────────────────────────────────────────────────────
 WIB = timezone(timedelta(hours=7))
 CITY = "surabaya"
+AREA_ERROR_RATIO = 0.3  # area dengan >30% outlet error = sinyal tekanan untuk jeda antar area
 
 # Daftar lengkap kecamatan di Surabaya
 # Daftar lengkap 31 kecamatan di Surabaya
@@ -94,10 +121,38 @@ def run_pipeline_for_area(
     limit: int,
     wait_ms: int,
     headful: bool,
+    fmt: str = "json",
+    compression: str = "none",
+    compact: bool = False,
+    cache=None,
+    queue=None,
+    schedule_args=None,
+    rate=None,
+    retry=None,
+    breaker=None,
+    session_guard=None,
+    checkpoint=None,
+    warm=None,
+    base_url: str = DEFAULT_BASE_URL,
+    metrics=None,
+    net=None,
+    profiler=None,
+    rfilter=None,
+    workers: int = DEFAULT_WORKERS,
+    stream: bool = False,
+    stream_buffer: int = DEFAULT_BUFFER,
 ) -> dict:
-    """Jalankan pipeline lengkap (step 1-3) untuk satu area."""
+    """Jalankan pipeline lengkap (step 1-3) untuk satu area.
 
-    listing_url = f"https://gofood.co.id/{CITY}/{area}"
+    `schedule_args` (namespace argparse dengan opsi scheduler) menentukan
+    urutan outlet di step 3; None → urut nama seperti hasil step 2.
+    `profiler` (lihat `memory_profile.py`) mengambil checkpoint memori per step.
+    `rfilter`/`workers` diteruskan ke interceptor step 2. Dengan `stream`,
+    step 3 berjalan selama step 2 masih scroll (`step23_stream`, urutan
+    discovery); resume antrian mengulang discovery, outlet selesai dilewati.
+    """
+
+    listing_url = f"{base_url.rstrip('/')}/{CITY}/{area}"
     nearme_url = f"{listing_url}/near-me/"
 
     area_label = area.replace("-restaurants", "").replace("-", " ").title()
@@ -122,26 +177,87 @@ def run_pipeline_for_area(
     }
 
     # ── STEP 1: Session Bootstrap ──
-    ok = step1_session_bootstrap(browser, listing_url, storage_state, wait_ms)
+    saved_before = session_guard.saved_seconds if session_guard is not None else 0.0
+    ok, bootstrapped = ensure_session(browser, listing_url, storage_state, wait_ms, session_guard, net)
+    result["session_bootstrapped"] = bootstrapped
+    if session_guard is not None:
+        result["session_time_saved_s"] = round(session_guard.saved_seconds - saved_before, 1)
     if not ok:
         print(f"  [SKIP] Session bootstrap gagal untuk {area_label}.")
         result["status"] = "session_failed"
         return result
+    if profiler is not None:
+        profiler.checkpoint(f"{area} step1", browser)
 
     # Delay setelah bootstrap (manusiawi: orang baca dulu halamannya)
-    human_delay(5, 12, "Membaca halaman listing")
+    if bootstrapped:
+        human_delay(5, 12, "Membaca halaman listing")
+
+    menus_json = OUTPUT_DIR / "json" / f"gofood_{area}_menus.json"
+    scroll_delay = random.uniform(2.0, 4.0)  # variasi scroll speed
+    menu_results = None
+    resumed = False
+
+    # ── STEP 2 + 3: streaming (step 3 mulai selama discovery) ──
+    if stream:
+        outlets, menu_results = step23_stream(
+            browser, nearme_url, CITY, storage_state,
+            max_scrolls=500,
+            patience=8,
+            scroll_delay=scroll_delay,
+            limit=limit if limit > 0 else None,
+            wait_ms=wait_ms,
+            delay_min=4.0,
+            delay_max=10.0,
+            buffer=stream_buffer,
+            headless=not headful,
+            cache=cache,
+            namespace=area,
+            queue=queue,
+            rate=rate,
+            retry=retry,
+            breaker=breaker,
+            checkpoint=checkpoint,
+            warm=warm,
+            metrics=metrics,
+            net=net,
+            profiler=profiler,
+            rfilter=rfilter,
+            workers=workers,
+        )
+        if warm is not None:
+            result["warm_start"] = warm.summary()
 
     # ── STEP 2: Outlet Discovery (agresif: scroll lebih banyak, sabar lebih lama) ──
-    outlets = step2_outlet_discovery(
-        browser=browser,
-        nearme_url=nearme_url,
-        service_area=CITY,
-        storage_state=storage_state,
-        max_scrolls=500,
-        patience=8,
-        scroll_delay=random.uniform(2.0, 4.0),  # variasi scroll speed
-        wait_ms=wait_ms,
-    )
+    elif queue is not None and queue.has_open(area):
+        # Resume: target dari run yang crash masih ada di antrian; daftar outlet area utuh
+        outlets, targets = resume_outlets(queue, area, OUTPUT_DIR / "json" / f"gofood_{area}_outlets.json")
+        resumed = True
+    else:
+        outlets = step2_outlet_discovery(
+            browser=browser,
+            nearme_url=nearme_url,
+            service_area=CITY,
+            storage_state=storage_state,
+            max_scrolls=500,
+            patience=8,
+            scroll_delay=scroll_delay,
+            wait_ms=wait_ms,
+            cache=cache,
+            namespace=area,
+            checkpoint=checkpoint,
+            warm=warm,
+            metrics=metrics,
+            net=net,
+            rfilter=rfilter,
+            workers=workers,
+        )
+        if warm is not None:
+            result["warm_start"] = warm.summary()
+        if profiler is not None:
+            profiler.checkpoint(f"{area} step2", browser)
+        if queue is not None:
+            queue.set_discovered(area, outlets)
 
     result["outlets_found"] = len(outlets)
 
@@ -150,19 +266,36 @@ def run_pipeline_for_area(
         result["status"] = "no_outlets"
         return result
 
-    # Delay setelah discovery (manusiawi: scroll panjang lalu istirahat)
-    human_delay(8, 18, "Istirahat setelah scrolling")
-
-    # ── STEP 3: Batch Menu Extraction (agresif: scrape semua outlet) ──
-    menu_results = step3_batch_menu(
-        browser=browser,
-        outlets=outlets,
-        storage_state=storage_state,
-        limit=limit if limit > 0 else len(outlets),
-        wait_ms=wait_ms,
-        delay_min=4.0,
-        delay_max=10.0,
-    )
+    if menu_results is None:
+        # Delay setelah discovery (manusiawi: scroll panjang lalu istirahat)
+        human_delay(8, 18, "Istirahat setelah scrolling")
+
+        if not resumed:
+            targets = outlets
+            if schedule_args is not None:
+                targets = schedule_outlets(outlets, schedule_args, menus_json, cache, area)
+
+        # ── STEP 3: Batch Menu Extraction (agresif: scrape semua outlet) ──
+        menu_results = step3_batch_menu(
+            browser=browser,
+            outlets=targets,
+            storage_state=storage_state,
+            limit=limit if limit > 0 else len(targets),
+            wait_ms=wait_ms,
+            delay_min=4.0,
+            delay_max=10.0,
+            cache=cache,
+            namespace=area,
+            queue=queue,
+            rate=rate,
+            retry=retry,
+            breaker=breaker,
+            metrics=metrics,
+            net=net,
+            profiler=profiler,
+        )
+    if profiler is not None:
+        profiler.checkpoint(f"{area} step3", browser)
 
     result["outlets_scraped"] = len(menu_results)
     result["success"] = sum(1 for r in menu_results if r.get("status") == "success")
@@ -174,19 +307,29 @@ def run_pipeline_for_area(
     )
     result["status"] = "done"
     result["finished_at"] = datetime.now(WIB).isoformat()
+    if rate is not None:
+        result["rate"] = rate.summary()
+    if retry is not None:
+        result["retry"] = retry.summary()
+    if breaker is not None:
+        result["breaker"] = breaker.summary()
 
     # ── Simpan output per area ──
     outlets_json = OUTPUT_DIR / "json" / f"gofood_{area}_outlets.json"
-    menus_json = OUTPUT_DIR / "json" / f"gofood_{area}_menus.json"
     menus_csv = OUTPUT_DIR / "csv" / f"gofood_{area}_menus.csv"
 
     print(f"\n  💾 Menyimpan data {area_label}...")
-    save_outputs(outlets, menu_results, outlets_json, menus_json, menus_csv)
+    save_outputs(
+        outlets, menu_results, outlets_json, menus_json, menus_csv,
+        fmt=fmt, compression=compression, compact=compact,
+    )
+    if queue is not None:
+        queue.clear(area)
 
     return result
 
 
-def main() -> int:
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="GoFood Surabaya Multi-Area Scraper",
     )
@@ -206,47 +349,119 @@ def main() -> int:
         "--start-from", type=int, default=1,
         help="Mulai dari area ke-N (1-based). Berguna untuk resume. (default: 1)",
     )
-    args = parser.parse_args()
-
-    storage_state = OUTPUT_DIR / "session" / "gofood_storage_state.json"
-    storage_state.parent.mkdir(parents=True, exist_ok=True)
-
-    # Progress log — untuk resume jika gagal di tengah
-    progress_file = OUTPUT_DIR / "json" / "scrap_sby_progress.json"
+    add_output_format_args(parser)
+    add_base_url_args(parser)
+    add_net_accounting_args(parser)
+    add_cache_args(parser)
+    add_queue_args(parser)
+    add_schedule_args(parser)
+    add_retry_args(parser)
+    add_session_args(parser)
+    add_checkpoint_args(parser)
+    add_warm_start_args(parser)
+    add_metrics_args(parser)
+    add_memory_args(parser)
+    add_stream_args(parser)
+    add_response_filter_args(parser)
+    add_intercept_worker_args(parser)
+    parser.add_argument("--delay-min", type=float, default=4.0,
+                        help="Batas bawah jeda adaptif antar outlet (detik, default: 4).")
+    parser.add_argument("--delay-max", type=float, default=10.0,
+                        help="Batas atas jeda adaptif antar outlet (detik, default: 10).")
+    parser.add_argument("--area-delay-min", type=float, default=30.0,
+                        help="Batas bawah jeda adaptif antar area (detik, default: 30).")
+    parser.add_argument("--area-delay-max", type=float, default=90.0,
+                        help="Batas atas jeda adaptif antar area (detik, default: 90).")
+    parser.add_argument("--budget", type=int, default=0,
+                        help="Total request step 3 per run untuk semua area (0 = tanpa batas; "
+                             "per worker pada mode sharded).")
+    return parser
+
+
+def run_areas(
+    areas: list[str],
+    args: argparse.Namespace,
+    storage_state: Path,
+    progress_file: Path,
+    metrics=None,
+    profiler=None,
+) -> list[dict]:
+    """Satu browser, jalankan pipeline untuk tiap area berurutan. Return hasil per area.
+
+    Progress ditulis ke `progress_file` setiap selesai satu area; `metrics`
+    (lihat `metrics.py`) diperbarui live selama run; `profiler` mencatat
+    memori per step tiap area.
+    """
+    cache = open_cache(args)
+    queue = open_queue(args)
     progress_file.parent.mkdir(parents=True, exist_ok=True)
-
-    areas_to_scrape = LIST_AREA[args.start_from - 1:]
-    total_areas = len(areas_to_scrape)
-
-    print(f"\n{'='*60}")
-    print(f"  🚀 GoFood Surabaya Multi-Area Scraper")
-    print(f"  Total area   : {total_areas} kecamatan")
-    print(f"  Limit/area   : {args.limit} outlet")
-    print(f"  Headless     : {not args.headful}")
-    print(f"  Start from   : area ke-{args.start_from}")
-    print(f"  Waktu mulai  : {datetime.now(WIB).strftime('%Y-%m-%d %H:%M:%S WIB')}")
-    print(f"{'='*60}")
-
+    total_areas = len(areas)
     all_results = []
+    remaining = args.budget
+
+    # Pacing adaptif: rate step 3 terbawa antar area; jeda antar area ikut
+    # melebar kalau area sebelumnya banyak error dan menyempit kalau sehat.
+    rate = RateController(args.delay_min, args.delay_max, name="step3")
+    area_pacer = RateController(args.area_delay_min, args.area_delay_max, name="antar-area")
+    # Breaker dipakai bersama semua area: blokir massal mem-pause seluruh runner
+    retry, breaker = open_retry(args)
+    session_guard = open_session_guard(args)
+    stream = args.stream
+    if stream and args.schedule == "priority":
+        print("[WARN] --schedule priority butuh daftar outlet lengkap; --stream dimatikan.")
+        stream = False
 
     with sync_playwright() as pw:
         browser = pw.chromium.launch(headless=not args.headful, args=BROWSER_ARGS)
 
-        for idx, area in enumerate(areas_to_scrape, start=1):
+        for idx, area in enumerate(areas, start=1):
             area_label = area.replace("-restaurants", "").replace("-", " ").title()
 
             print(f"\n\n{'*'*60}")
             print(f"  📍 AREA {idx}/{total_areas}: {area_label}")
             print(f"{'*'*60}")
 
+            # Budget request step 3 per run: area berikutnya dapat sisa budget
+            area_limit = args.limit
+            if args.budget > 0:
+                if remaining <= 0:
+                    print(f"  [SKIP] Budget {args.budget} request habis.")
+                    all_results.append({"area": area, "area_label": area_label,
+                                        "status": "budget_exhausted"})
+                    continue
+                area_limit = min(args.limit, remaining) if args.limit > 0 else remaining
+
+            # Akuntansi traffic per area (step 1-3) → result["network"]
+            net = None if args.no_net_accounting else NetworkAccountant(area_label)
             try:
                 result = run_pipeline_for_area(
                     browser=browser,
                     area=area,
                     storage_state=storage_state,
-                    limit=args.limit,
+                    limit=area_limit,
                     wait_ms=args.wait_ms,
                     headful=args.headful,
+                    fmt=args.format,
+                    compression=args.compress,
+                    compact=args.compact_json,
+                    cache=cache,
+                    queue=queue,
+                    schedule_args=args,
+                    rate=rate,
+                    retry=retry,
+                    breaker=breaker,
+                    session_guard=session_guard,
+                    checkpoint=open_checkpoint(args, area),
+                    warm=open_warm_start(args, OUTPUT_DIR / "json" / f"gofood_{area}_outlets.json"),
+                    base_url=args.base_url,
+                    metrics=metrics,
+                    net=net,
+                    profiler=profiler,
+                    # Filter per area: report [FILTER] di akhir step 2 milik area itu saja
+                    rfilter=open_response_filter(args, metrics),
+                    workers=args.intercept_workers,
+                    stream=stream,
+                    stream_buffer=args.stream_buffer,
                 )
             except Exception as exc:
                 print(f"\n  ❌ ERROR pada {area_label}: {exc}")
@@ -257,7 +472,17 @@ def main() -> int:
                     "error": str(exc),
                 }
 
+            if net is not None:
+                result["network"] = net.summary()
+                net.report()
             all_results.append(result)
+            if metrics is not None:
+                metrics.inc("areas_total", status=result.get("status", "?"))
+            remaining -= result.get("outlets_scraped", 0)
+            scraped = result.get("outlets_scraped", 0)
+            area_pacer.observe(failed=result.get("status") not in ("done", "no_outlets") or (
+                scraped > 0 and result.get("errors", 0) / scraped > AREA_ERROR_RATIO
+            ))
 
             # Simpan progress setiap selesai 1 area
             progress_file.write_text(
@@ -268,14 +493,21 @@ def main() -> int:
 
             # Delay panjang antar area (manusiawi: pindah kecamatan)
             if idx < total_areas:
-                human_delay(
-                    30, 90,
-                    f"Jeda panjang sebelum area berikutnya ({idx}/{total_areas} selesai)",
-                )
+                print(f"\n  ⏳ Jeda sebelum area berikutnya ({idx}/{total_areas} selesai)")
+                if metrics is not None:
+                    metrics.set("delay_seconds", area_pacer.interval, controller=area_pacer.name)
+                area_pacer.wait()
 
         browser.close()
 
-    # ── RINGKASAN AKHIR ──
+    rate.report()
+    area_pacer.report()
+
+    return all_results
+
+
+def write_summary(all_results: list[dict], total_areas: int, summary_file: Path) -> dict:
+    """Cetak ringkasan akhir dan simpan ke `summary_file`."""
     print(f"\n\n{'='*60}")
     print(f"  📋 RINGKASAN AKHIR — Surabaya Scraping")
     print(f"{'='*60}")
@@ -285,6 +517,8 @@ def main() -> int:
     total_success = 0
     total_errors = 0
     total_items = 0
+    bootstraps_avoided = 0
+    session_saved = 0.0
 
     for r in all_results:
         status_icon = {
@@ -305,6 +539,8 @@ def main() -> int:
         total_success += r.get("success", 0)
         total_errors += r.get("errors", 0)
         total_items += r.get("total_items", 0)
+        bootstraps_avoided += r.get("session_bootstrapped") is False
+        session_saved += r.get("session_time_saved_s", 0.0)
 
     print(f"\n  {'─'*50}")
     print(f"  Total outlet ditemukan  : {total_outlets}")
@@ -312,11 +548,16 @@ def main() -> int:
     print(f"  Total success           : {total_success}")
     print(f"  Total error             : {total_errors}")
     print(f"  Total menu items        : {total_items}")
+    print(f"  Bootstrap dihindari     : {bootstraps_avoided} (~{session_saved:.0f}s dihemat)")
+    network = merge_summaries([r["network"] for r in all_results if r.get("network")])
+    if network["requests"]:
+        per_area = [r for r in all_results if r.get("network")]
+        print(f"  Traffic jaringan        : {network['mb']:.1f} MB, {network['requests']} request "
+              f"(~{network['mb'] / len(per_area):.1f} MB/area)")
     print(f"  Waktu selesai           : {datetime.now(WIB).strftime('%Y-%m-%d %H:%M:%S WIB')}")
     print(f"{'='*60}\n")
 
     # Simpan ringkasan akhir
-    summary_file = OUTPUT_DIR / "json" / "scrap_sby_summary.json"
     summary = {
         "city": CITY,
         "total_areas": total_areas,
@@ -325,14 +566,54 @@ def main() -> int:
         "total_success": total_success,
         "total_errors": total_errors,
         "total_menu_items": total_items,
+        "session_bootstraps_avoided": bootstraps_avoided,
+        "session_time_saved_s": round(session_saved, 1),
+        "network": network,
         "finished_at": datetime.now(WIB).isoformat(),
         "areas": all_results,
     }
+    summary_file.parent.mkdir(parents=True, exist_ok=True)
     summary_file.write_text(
         json.dumps(summary, ensure_ascii=False, indent=2) + "\n",
         encoding="utf-8",
     )
     print(f"  Summary: {summary_file}")
+    return summary
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+
+    storage_state = OUTPUT_DIR / "session" / "gofood_storage_state.json"
+    storage_state.parent.mkdir(parents=True, exist_ok=True)
+
+    # Progress log — untuk resume jika gagal di tengah
+    progress_file = OUTPUT_DIR / "json" / "scrap_sby_progress.json"
+
+    areas_to_scrape = LIST_AREA[args.start_from - 1:]
+    total_areas = len(areas_to_scrape)
+
+    print(f"\n{'='*60}")
+    print(f"  🚀 GoFood Surabaya Multi-Area Scraper")
+    print(f"  Total area   : {total_areas} kecamatan")
+    print(f"  Limit/area   : {args.limit} outlet")
+    print(f"  Headless     : {not args.headful}")
+    print(f"  Start from   : area ke-{args.start_from}")
+    print(f"  Waktu mulai  : {datetime.now(WIB).strftime('%Y-%m-%d %H:%M:%S WIB')}")
+    print(f"{'='*60}")
+
+    metrics = open_metrics(args)
+    profiler = open_memory_profiler(args, OUTPUT_DIR / "json" / "scrap_sby_memory.json")
+    try:
+        all_results = run_areas(areas_to_scrape, args, storage_state, progress_file, metrics, profiler)
+    finally:
+        if metrics is not None:
+            metrics.close()
+        if profiler is not None:
+            profiler.close()
+
+    # ── RINGKASAN AKHIR ──
+    write_summary(all_results, total_areas, OUTPUT_DIR / "json" / "scrap_sby_summary.json")
 
     return 0
 
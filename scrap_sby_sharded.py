@@ -0,0 +1,190 @@
+"""
+GoFood Surabaya Multi-Area Scraper — Sharded (multi-proses)
+===========================================================
+Bagi `LIST_AREA` ke N worker proses. Tiap worker punya browser sendiri,
+storage state sendiri, dan file progress sendiri; area dibagi round-robin
+sehingga tidak ada dua worker yang menulis output area yang sama.
+
+Proses parent memantau file progress semua shard dan menggabungkannya ke
+`scrap_sby_progress.json` (urut sesuai LIST_AREA), lalu menulis
+`scrap_sby_summary.json` setelah semua worker selesai.
+
+Layout per shard:
+  output/session/shards/gofood_storage_state_shard<k>.json
+  output/json/shards/scrap_sby_progress_shard<k>.json
+
+Usage:
+  python3 scrap_sby_sharded.py --workers 4
+  python3 scrap_sby_sharded.py --workers 2 --limit 10 --stagger 60
+"""
+
+import json
+import multiprocessing as mp
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+
+from developer_test_scrapping import OUTPUT_DIR
+from memory_profile import open_memory_profiler
+from metrics import open_metrics
+from scrap_sby import LIST_AREA, WIB, build_parser, run_areas, write_summary
+
+# ── Layout ──────────────────────────────────────────────────────────
+SHARED_STORAGE_STATE = OUTPUT_DIR / "session" / "gofood_storage_state.json"
+SHARD_SESSION_DIR = OUTPUT_DIR / "session" / "shards"
+SHARD_PROGRESS_DIR = OUTPUT_DIR / "json" / "shards"
+PROGRESS_FILE = OUTPUT_DIR / "json" / "scrap_sby_progress.json"
+SUMMARY_FILE = OUTPUT_DIR / "json" / "scrap_sby_summary.json"
+
+POLL_SECONDS = 5.0
+
+
+def shard_paths(shard: int) -> tuple[Path, Path]:
+    """Return (storage_state, progress_file) milik shard."""
+    return (
+        SHARD_SESSION_DIR / f"gofood_storage_state_shard{shard}.json",
+        SHARD_PROGRESS_DIR / f"scrap_sby_progress_shard{shard}.json",
+    )
+
+
+def split_areas(areas: list[str], workers: int) -> list[list[str]]:
+    """Bagi area round-robin supaya beban shard seimbang."""
+    return [areas[k::workers] for k in range(workers) if areas[k::workers]]
+
+
+def _worker(shard: int, areas: list[str], args, delay: float) -> None:
+    """Entry point proses worker: satu browser untuk semua area di shard ini."""
+    storage_state, progress_file = shard_paths(shard)
+    storage_state.parent.mkdir(parents=True, exist_ok=True)
+
+    # Mulai dari session bersama jika ada, lalu berjalan independen
+    if not storage_state.exists() and SHARED_STORAGE_STATE.exists():
+        shutil.copyfile(SHARED_STORAGE_STATE, storage_state)
+
+    if delay > 0:
+        time.sleep(delay)
+
+    print(f"[SHARD {shard}] pid={os.getpid()} areas={areas}", flush=True)
+    # Port/file metrik per shard: port + k, <nama>_shard<k>.prom
+    metrics = open_metrics(args, shard)
+    profiler = open_memory_profiler(args, OUTPUT_DIR / "json" / f"scrap_sby_memory_shard{shard}.json")
+    try:
+        run_areas(areas, args, storage_state, progress_file, metrics, profiler)
+    finally:
+        if metrics is not None:
+            metrics.close()
+        if profiler is not None:
+            profiler.close()
+
+
+def _read_progress(path: Path) -> list[dict]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        # Belum ada / sedang ditulis — pakai snapshot berikutnya
+        return []
+    return data if isinstance(data, list) else []
+
+
+def aggregate_progress(areas: list[str], shard_count: int) -> list[dict]:
+    """Gabungkan progress semua shard, urut sesuai daftar area."""
+    by_area: dict[str, dict] = {}
+    for shard in range(shard_count):
+        for result in _read_progress(shard_paths(shard)[1]):
+            result = {**result, "shard": shard}
+            by_area[result.get("area", "")] = result
+    return [by_area[a] for a in areas if a in by_area]
+
+
+def _write_progress(results: list[dict]) -> None:
+    PROGRESS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = PROGRESS_FILE.with_name(PROGRESS_FILE.name + ".tmp")
+    tmp.write_text(json.dumps(results, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    tmp.replace(PROGRESS_FILE)
+
+
+def main() -> int:
+    parser = build_parser()
+    parser.description = "GoFood Surabaya Multi-Area Scraper (sharded, multi-proses)"
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Jumlah worker proses (default: setengah jumlah core).")
+    parser.add_argument("--stagger", type=float, default=20.0,
+                        help="Jeda start antar worker dalam detik (default: 20).")
+    args = parser.parse_args()
+
+    areas = LIST_AREA[args.start_from - 1:]
+    shards = split_areas(areas, max(1, args.workers))
+
+    # Progress shard lama dari run sebelumnya tidak boleh ikut teragregasi
+    for shard in range(len(shards)):
+        shard_paths(shard)[1].unlink(missing_ok=True)
+
+    print(f"\n{'='*60}")
+    print(f"  🚀 GoFood Surabaya Multi-Area Scraper (sharded)")
+    print(f"  Total area   : {len(areas)} kecamatan")
+    print(f"  Worker       : {len(shards)} proses")
+    print(f"  Limit/area   : {args.limit} outlet")
+    print(f"  Waktu mulai  : {datetime.now(WIB).strftime('%Y-%m-%d %H:%M:%S WIB')}")
+    print(f"{'='*60}")
+    for shard, shard_areas in enumerate(shards):
+        print(f"  Shard {shard}: {', '.join(shard_areas)}")
+
+    # spawn: setiap worker mulai bersih (Playwright tidak fork-safe)
+    ctx = mp.get_context("spawn")
+    procs = []
+    for shard, shard_areas in enumerate(shards):
+        proc = ctx.Process(
+            target=_worker, args=(shard, shard_areas, args, shard * args.stagger),
+            name=f"scrap-sby-shard{shard}",
+        )
+        proc.start()
+        procs.append(proc)
+
+    last_done = -1
+    try:
+        while any(p.is_alive() for p in procs):
+            time.sleep(POLL_SECONDS)
+            results = aggregate_progress(areas, len(shards))
+            if len(results) != last_done:
+                _write_progress(results)
+                last_done = len(results)
+                print(f"\n  📊 Progress gabungan: {len(results)}/{len(areas)} area "
+                      f"({sum(p.is_alive() for p in procs)} worker aktif)", flush=True)
+    except KeyboardInterrupt:
+        print("\n  [ABORT] Menghentikan worker...")
+        for p in procs:
+            p.terminate()
+    for p in procs:
+        p.join()
+
+    results = aggregate_progress(areas, len(shards))
+
+    # Area milik worker yang mati sebelum sempat menulis progress
+    seen = {r.get("area") for r in results}
+    for shard, (proc, shard_areas) in enumerate(zip(procs, shards)):
+        for area in shard_areas:
+            if area not in seen:
+                results.append({
+                    "area": area,
+                    "area_label": area.replace("-restaurants", "").replace("-", " ").title(),
+                    "status": "exception",
+                    "error": f"worker shard {shard} berhenti (exitcode={proc.exitcode})",
+                    "shard": shard,
+                })
+    order = {a: i for i, a in enumerate(areas)}
+    results.sort(key=lambda r: order.get(r.get("area"), len(order)))
+
+    _write_progress(results)
+    write_summary(results, len(areas), SUMMARY_FILE)
+
+    failed_workers = [p.name for p in procs if p.exitcode != 0]
+    if failed_workers:
+        print(f"  [WARNING] Worker gagal: {', '.join(failed_workers)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,21 +6,29 @@ masing-masing restoran via Playwright, ekstrak __NEXT_DATA__,
 parse menu (catalog.sections), simpan ke JSON master.
 
 Micro-batching: gunakan --limit dan --offset untuk kontrol batch size.
-Polite scraping: jeda random antar outlet.
+Polite scraping: jeda adaptif (AIMD) antar outlet.
 """
 
 import argparse
 import csv
 import json
-import random
 import re
+import sys
 import time
 from datetime import datetime, timezone, timedelta
+from itertools import islice
 from pathlib import Path
 
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from playwright.sync_api import sync_playwright
 
+# Modul shared (output_formats, dst.) ada di root repo
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from output_formats import iter_records  # noqa: E402
+from rate_control import RateController  # noqa: E402
+from work_queue import DEFAULT_QUEUE_DB, OutletQueue, iter_leases  # noqa: E402
+
 # ── Defaults ────────────────────────────────────────────────────────
 DEFAULT_INPUT = Path("output/json/gofood_nearme_outlets.json")
 DEFAULT_OUTPUT = Path("output/json/gofood_menus_master.json")
@@ -244,13 +252,8 @@ def scrape_single_outlet(page, url: str, wait_ms: int) -> dict:
 # ── Target loader ──────────────────────────────────────────────────
 
 def load_targets(input_path: Path, offset: int, limit: int) -> list[dict]:
-    """Baca outlet JSON, slice sesuai offset+limit."""
-    data = json.loads(input_path.read_text(encoding="utf-8"))
-    if not isinstance(data, list):
-        raise ValueError(f"Input bukan array JSON: {input_path}")
-
-    sliced = data[offset : offset + limit]
-    return sliced
+    """Baca outlet JSON/JSONL (boleh .gz/.zst) secara streaming, slice sesuai offset+limit."""
+    return list(islice(iter_records(input_path), offset, offset + limit))
 
 
 # ── Main orchestration ─────────────────────────────────────────────
@@ -309,7 +312,23 @@ def run(args: argparse.Namespace) -> int:
         context = browser.new_context(**context_kwargs)
         page = context.new_page()
 
-        for i, outlet in enumerate(targets):
+        # Antrian durable: resume per outlet jika run sebelumnya crash
+        queue = None
+        namespace = f"batch:{input_path.stem}:{args.offset}:{args.limit}"
+        if not args.no_queue:
+            queue = OutletQueue(Path(args.queue_db))
+            added = queue.enqueue(namespace, targets)
+            c = queue.counts(namespace)
+            print(f"[QUEUE] +{added} baru | pending={c['pending']} done={c['done']} "
+                  f"failed={c['failed']}")
+            work = iter_leases(queue, namespace)
+        else:
+            work = iter(targets)
+
+        # Jeda adaptif (AIMD) dalam batas --delay-min..--delay-max
+        rate = RateController(args.delay_min, args.delay_max, name="batch")
+
+        for i, outlet in enumerate(work):
             idx = args.offset + i + 1
             name = outlet.get("name", "???")
             url = outlet.get("full_url", "")
@@ -317,7 +336,7 @@ def run(args: argparse.Namespace) -> int:
 
             if not url:
                 print(f"[{idx}] SKIP {name} -- no full_url")
-                results.append({
+                record = {
                     "restaurant_uid": uid,
                     "restaurant_name": name,
                     "restaurant_url": "",
@@ -325,13 +344,25 @@ def run(args: argparse.Namespace) -> int:
                     "status": "error",
                     "error": "no full_url in target data",
                     "menu_sections": [],
-                })
+                }
+                if queue is not None:
+                    queue.settle(namespace, uid, record, permanent=True)
+                else:
+                    results.append(record)
                 continue
 
             print(f"\n[{idx}/{args.offset + len(targets)}] Scraping: {name}")
             print(f"  URL: {url}")
 
+            t0 = time.monotonic()
             record = scrape_single_outlet(page, url, args.wait_ms)
+            error = record.get("error", "") or ""
+            rate.observe(
+                latency=time.monotonic() - t0,
+                timeout="timeout" in error.lower(),
+                payload_missing="__NEXT_DATA__" in error,
+                failed=record.get("status") == "error",
+            )
 
             # Isi metadata dari target data jika scraper gagal dapat dari halaman
             if not record.get("restaurant_uid"):
@@ -358,7 +389,10 @@ def run(args: argparse.Namespace) -> int:
             else:
                 print(f"  [ERROR] {record.get('error', 'unknown error')}")
 
-            results.append(record)
+            if queue is not None:
+                queue.settle(namespace, uid, record)
+            else:
+                results.append(record)
 
             # Persist session setelah tiap outlet
             try:
@@ -367,14 +401,17 @@ def run(args: argparse.Namespace) -> int:
                 pass
 
             # Polite delay (kecuali outlet terakhir)
-            if i < len(targets) - 1:
-                delay = random.uniform(args.delay_min, args.delay_max)
-                print(f"  Waiting {delay:.1f}s before next outlet...")
-                time.sleep(delay)
+            has_next = queue.has_open(namespace) if queue is not None else i < len(targets) - 1
+            if has_next:
+                rate.wait("before next outlet")
 
         context.close()
+        rate.report()
         browser.close()
 
+    if queue is not None:
+        results = queue.results(namespace)
+
     # ── Simpan output JSON ──
     output_path.write_text(
         json.dumps(results, ensure_ascii=False, indent=2) + "\n",
@@ -403,6 +440,10 @@ def run(args: argparse.Namespace) -> int:
     print(f"[STATS] Total menu items: {total_items}")
     print(f"{'='*60}")
 
+    if queue is not None:
+        queue.clear(namespace)
+        queue.close()
+
     return 0
 
 
@@ -411,7 +452,7 @@ def parse_args() -> argparse.Namespace:
         description="Batch scrape menu restoran GoFood dari daftar outlet."
     )
     parser.add_argument("--input", default=str(DEFAULT_INPUT),
-                        help="Path JSON daftar outlet target.")
+                        help="Path daftar outlet target (.json/.jsonl, boleh .gz/.zst).")
     parser.add_argument("--output", default=str(DEFAULT_OUTPUT),
                         help="Path output JSON menu master.")
     parser.add_argument("--output-csv", default=None,
@@ -430,6 +471,10 @@ def parse_args() -> argparse.Namespace:
                         help="Extra wait setelah page load (ms).")
     parser.add_argument("--headful", action="store_true",
                         help="Jalankan browser non-headless (visual).")
+    parser.add_argument("--queue-db", default=str(DEFAULT_QUEUE_DB),
+                        help="Path database antrian outlet (resume per outlet).")
+    parser.add_argument("--no-queue", action="store_true",
+                        help="Jangan pakai antrian; crash berarti ulang batch dari awal.")
     return parser.parse_args()
 
 
@@ -15,13 +15,18 @@ Strategi:
 import argparse
 import json
 import re
+import sys
 import time
-import unicodedata
 from pathlib import Path
 
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from playwright.sync_api import sync_playwright
 
+# Normalizer outlet shared (gofood_core + outlet_fields) ada di root repo
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from gofood_core import _normalize_outlet  # noqa: E402
+
 # ── Defaults ────────────────────────────────────────────────────────
 DEFAULT_URL = "https://gofood.co.id/surabaya/sukolilo-restaurants/near-me/"
 OUTPUT_FILE = Path("output/json/gofood_nearme_outlets.json")
@@ -44,17 +49,6 @@ outlets_by_uid: dict[str, dict] = {}
 
 # ── Data helpers ────────────────────────────────────────────────────
 
-def _slugify(text: str) -> str:
-    """Konversi display name ke URL slug GoFood-style."""
-    # Normalize unicode, lowercase
-    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
-    text = text.lower()
-    # Ganti non-alphanumeric dengan dash
-    text = re.sub(r"[^a-z0-9]+", "-", text)
-    # Trim leading/trailing dashes
-    return text.strip("-")
-
-
 def _is_outlet(obj: dict) -> bool:
     """Heuristic: objek punya 'uid' dan nama outlet."""
     if not isinstance(obj, dict):
@@ -65,23 +59,6 @@ def _is_outlet(obj: dict) -> bool:
     return has_uid and (has_core or has_name)
 
 
-def _is_real_outlet(uid: str, core: dict) -> bool:
-    """Filter out kategori CUISINE_* dan brand General tanpa data."""
-    # Skip kategori cuisine
-    if uid.startswith("CUISINE_"):
-        return False
-    # Skip entry tanpa core data (brand "General" placeholder)
-    if not core:
-        return False
-    # Harus punya location (lat/lng) sebagai indikator outlet fisik
-    location = core.get("location")
-    if not isinstance(location, dict):
-        return False
-    if location.get("latitude") is None or location.get("longitude") is None:
-        return False
-    return True
-
-
 def extract_outlets_from_api_response(body) -> list[dict]:
     """Recursive walk JSON response, cari objek outlet-shaped."""
     results = []
@@ -100,58 +77,9 @@ def extract_outlets_from_api_response(body) -> list[dict]:
     return results
 
 
-def _build_path(uid: str, display_name: str) -> str:
-    """Generate path restoran dari uid + nama, format: /{area}/restaurant/{slug}-{uid}."""
-    if not _service_area or not display_name:
-        return ""
-    slug = _slugify(display_name)
-    return f"/{_service_area}/restaurant/{slug}-{uid}"
-
-
 def normalize_outlet(raw: dict) -> dict | None:
-    """Flatten raw outlet dict ke format bersih. None jika invalid."""
-    uid = raw.get("uid")
-    if not uid:
-        return None
-
-    core = raw.get("core", {}) if isinstance(raw.get("core"), dict) else {}
-    delivery = raw.get("delivery", {}) if isinstance(raw.get("delivery"), dict) else {}
-    ratings = raw.get("ratings", {}) if isinstance(raw.get("ratings"), dict) else {}
-
-    # Filter: skip kategori dan brand placeholder
-    if not _is_real_outlet(uid, core):
-        return None
-
-    display_name = core.get("displayName") or raw.get("displayName") or ""
-    if not display_name:
-        return None
-
-    # Path: ambil dari data jika ada, generate jika tidak
-    path = raw.get("path", "") or _build_path(uid, display_name)
-    full_url = f"https://gofood.co.id{path}" if path else ""
-
-    return {
-        "uid": uid,
-        "name": display_name,
-        "path": path,
-        "full_url": full_url,
-        "short_link": core.get("shortLink", ""),
-        "latitude": core.get("location", {}).get("latitude") if isinstance(core.get("location"), dict) else None,
-        "longitude": core.get("location", {}).get("longitude") if isinstance(core.get("location"), dict) else None,
-        "status": core.get("status"),
-        "rating_average": ratings.get("average"),
-        "rating_total": ratings.get("total"),
-        "delivery_enabled": delivery.get("enabled"),
-        "delivery_max_radius_km": delivery.get("maxRadiusKm"),
-        "delivery_distance_km": delivery.get("distanceKm"),
-        "delivery_eta_minutes": delivery.get("eta", {}).get("minutes") if isinstance(delivery.get("eta"), dict) else None,
-        "price_level": raw.get("priceLevel"),
-        "image_url": (
-            raw.get("media", {}).get("logo", "")
-            if isinstance(raw.get("media"), dict) else
-            core.get("media", {}).get("logo", "") if isinstance(core.get("media"), dict) else ""
-        ),
-    }
+    """Flatten raw outlet dict ke format bersih (normalizer pipeline). None jika invalid."""
+    return _normalize_outlet(raw, _service_area)
 
 
 # ── __NEXT_DATA__ extraction ───────────────────────────────────────
@@ -0,0 +1,122 @@
+"""
+Session Check — validasi storage state sebelum session bootstrap
+================================================================
+Step 1 (buka listing + networkidle + wait) hanya perlu diulang kalau session
+di `gofood_storage_state.json` sudah basi. Validator ini memeriksa:
+
+  1. File storage state ada dan umurnya < `max_age` detik
+  2. Cookie ber-expiry (WAF/CSRF) masih berlaku minimal `min_ttl` detik lagi
+  3. (opsional) probe murah — GET listing via request context browser tanpa
+     render halaman; lolos jika `__NEXT_DATA__` ada dan bukan challenge
+
+`SessionGuard` mencatat berapa bootstrap dijalankan/dihindari dan estimasi
+waktu yang dihemat (rata-rata durasi bootstrap yang benar-benar dijalankan).
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+# ── Defaults ────────────────────────────────────────────────────────
+DEFAULT_MAX_AGE = 30 * 60      # detik sejak storage state terakhir ditulis
+DEFAULT_MIN_TTL = 5 * 60       # cookie harus masih hidup minimal selama ini
+BOOTSTRAP_OVERHEAD_S = 10.0    # estimasi goto + networkidle di luar wait_ms
+
+
+def check_storage_state(
+    path: Path, max_age: float = DEFAULT_MAX_AGE, min_ttl: float = DEFAULT_MIN_TTL,
+    now: float | None = None,
+) -> tuple[bool, str]:
+    """Return (fresh, alasan) berdasarkan umur file dan expiry cookie."""
+    now = time.time() if now is None else now
+    try:
+        age = now - path.stat().st_mtime
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return False, "storage state belum ada"
+    except (OSError, json.JSONDecodeError) as exc:
+        return False, f"storage state tidak terbaca ({exc})"
+
+    if age > max_age:
+        return False, f"storage state berumur {age / 60:.0f} menit (> {max_age / 60:.0f})"
+
+    cookies = state.get("cookies") or []
+    if not cookies:
+        return False, "storage state tanpa cookie"
+
+    # expires <= 0 = session cookie (hidup selama browser) — dinilai lewat umur file
+    expiring = [c for c in cookies if (c.get("expires") or -1) > 0]
+    if expiring:
+        soonest = min(expiring, key=lambda c: c["expires"])
+        ttl = soonest["expires"] - now
+        if ttl < min_ttl:
+            return False, f"cookie {soonest.get('name')} kadaluarsa dalam {max(ttl, 0):.0f}s"
+        return True, f"umur {age:.0f}s, cookie terdekat ({soonest.get('name')}) sisa {ttl / 60:.0f} menit"
+    return True, f"umur {age:.0f}s, hanya session cookie"
+
+
+class SessionGuard:
+    """Putuskan perlu bootstrap atau tidak, dan catat penghematannya."""
+
+    def __init__(
+        self, max_age: float = DEFAULT_MAX_AGE, min_ttl: float = DEFAULT_MIN_TTL,
+        probe: bool = False, force: bool = False,
+    ):
+        self.max_age = max_age
+        self.min_ttl = min_ttl
+        self.probe = probe
+        self.force = force
+        self.bootstraps = 0
+        self.avoided = 0
+        self.bootstrap_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def needs_bootstrap(self, storage_state: Path, probe_fn=None) -> tuple[bool, str]:
+        """`probe_fn()` → bool dipanggil hanya jika cek file lolos dan probe aktif."""
+        if self.force:
+            return True, "--force-bootstrap"
+        fresh, reason = check_storage_state(storage_state, self.max_age, self.min_ttl)
+        if not fresh:
+            return True, reason
+        if self.probe and probe_fn is not None and not probe_fn():
+            return True, "probe gagal"
+        return False, reason
+
+    def record_bootstrap(self, seconds: float) -> None:
+        self.bootstraps += 1
+        self.bootstrap_seconds += seconds
+
+    def record_skip(self, estimate: float) -> float:
+        """Catat bootstrap yang dihindari. Return detik yang dianggap dihemat."""
+        saved = self.bootstrap_seconds / self.bootstraps if self.bootstraps else estimate
+        self.avoided += 1
+        self.saved_seconds += saved
+        return saved
+
+    def summary(self) -> dict:
+        return {
+            "bootstraps_run": self.bootstraps,
+            "bootstraps_avoided": self.avoided,
+            "bootstrap_seconds": round(self.bootstrap_seconds, 1),
+            "time_saved_s": round(self.saved_seconds, 1),
+        }
+
+
+def add_session_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--session-max-age", type=float, default=DEFAULT_MAX_AGE,
+                        help=f"Umur maks storage state sebelum bootstrap ulang, detik "
+                             f"(default: {DEFAULT_MAX_AGE}).")
+    parser.add_argument("--session-min-ttl", type=float, default=DEFAULT_MIN_TTL,
+                        help=f"Sisa umur cookie minimal, detik (default: {DEFAULT_MIN_TTL}).")
+    parser.add_argument("--session-probe", action="store_true",
+                        help="Validasi session dengan probe GET ringan sebelum skip bootstrap.")
+    parser.add_argument("--force-bootstrap", action="store_true",
+                        help="Selalu jalankan step 1 (abaikan cek freshness).")
+
+
+def open_session_guard(args: argparse.Namespace) -> SessionGuard:
+    return SessionGuard(
+        max_age=args.session_max_age, min_ttl=args.session_min_ttl,
+        probe=args.session_probe, force=args.force_bootstrap,
+    )
@@ -0,0 +1,449 @@
+"""
+Synthetic Data — generator outlet/katalog GoFood + benchmark skala
+=================================================================
+File nyata terbesar baru ratusan outlet; target coverage nasional butuh
+ratusan ribu. Modul ini membangkitkan data sintetis dengan bentuk yang sama
+dengan payload GoFood (deterministik per `--seed`):
+
+  - feed outlet   : {"data": {"outlets": [...]}, "page", "nextPage"} seperti
+                    respons near-me, termasuk duplikat antar halaman dan entri
+                    noise (CUISINE_*, outlet tanpa lokasi) yang harus dibuang
+                    `_normalize_outlet`
+  - katalog menu  : __NEXT_DATA__ profil (template gofood_profile_mapan.json)
+                    dengan section/item/varian sintetis untuk `_parse_menu_text`
+
+Subcommand:
+  generate  tulis dataset ternormalisasi per locality (JSONL) + template ke
+            direktori fixture → bisa langsung disajikan `fixture_server.py`
+            atau dipakai `merge_outputs.py`/`record_index.py`
+  bench     ukur waktu (dan opsional peak memori) tiap tahap pipeline offline
+            — normalisasi, dedupe, parse menu, flatten CSV, tulis output —
+            untuk beberapa ukuran, lalu tandai tahap yang tidak lagi linear
+
+Usage:
+  python3 synthetic_data.py generate --outlets 100000 --out output/synthetic
+  python3 fixture_server.py --fixtures-dir output/synthetic
+  python3 synthetic_data.py bench --sizes 10000,100000,1000000 --trace-memory
+"""
+
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from gofood_core import (
+    OUTPUT_DIR,
+    _extract_outlets_recursive,
+    _finalize_menu_record,
+    _normalize_outlet,
+    _parse_menu_text,
+    _slugify,
+    flatten_to_csv_rows,
+    save_outputs,
+)
+from output_formats import atomic_open_text, write_records
+
+# ── Defaults ────────────────────────────────────────────────────────
+WIB = timezone(timedelta(hours=7))
+DEFAULT_SEED = 20240601
+DEFAULT_PAGE_SIZE = 12
+DEFAULT_DUP_RATE = 0.15       # fraksi outlet yang muncul lagi di halaman feed lain
+DEFAULT_NOISE_RATE = 0.05     # entri CUISINE_* / outlet tanpa lokasi per halaman
+DEFAULT_MENU_FRACTION = 0.1   # fraksi outlet yang dibangkitkan katalognya (bench)
+DEFAULT_ITEMS = 70            # rata-rata item per outlet (gubeng: ~71)
+DEFAULT_PER_LOCALITY = 5000
+DEFAULT_SIZES = "10000,100000"
+NONLINEAR_THRESHOLD = 1.25    # (rasio waktu / rasio ukuran) di atas ini = tidak linear
+PROFILE_TEMPLATE = OUTPUT_DIR / "json" / "gofood_profile_mapan.json"
+FIXTURE_TEMPLATES = (
+    "json/gofood_next_data.json",
+    "json/gofood_profile_mapan.json",
+    "html/gofood_playwright_output.html",
+    "html/gofood_raw_output.html",
+)
+
+# (service_area, lat, lon) — titik pusat kota; outlet disebar ±0.15 derajat
+SERVICE_AREAS = (
+    ("surabaya", -7.2575, 112.7521), ("jakarta", -6.2088, 106.8456), ("bandung", -6.9175, 107.6191),
+    ("medan", 3.5952, 98.6722), ("semarang", -6.9667, 110.4167), ("yogyakarta", -7.7956, 110.3695),
+    ("makassar", -5.1477, 119.4327), ("denpasar", -8.6705, 115.2126), ("malang", -7.9666, 112.6326),
+    ("palembang", -2.9761, 104.7754),
+)
+PREFIXES = ("Warung", "Depot", "Kedai", "Rumah Makan", "Dapur", "Kopi", "Bakmi", "Sate", "Mie", "Ayam")
+DISHES = (
+    "Nasi Goreng", "Mie Ayam", "Bakso", "Soto Ayam", "Rawon", "Ayam Geprek", "Pecel Lele", "Gado-Gado",
+    "Sate Ayam", "Nasi Padang", "Martabak", "Seblak", "Rujak Cingur", "Es Teh", "Kopi Susu", "Penyetan",
+)
+OWNERS = ("Pak Slamet", "Bu Tini", "Cak Har", "Mbak Yuni", "Haji Mamat", "Bang Oya", "Koh Ahong", "Mas Budi")
+STREETS = ("Jl. Raya Darmo", "Jl. Pemuda", "Jl. Diponegoro", "Jl. Ahmad Yani", "Jl. Sudirman", "Jl. Merdeka")
+SECTIONS = ("Makanan", "Paket Hemat", "Aneka Nasi", "Aneka Mie", "Snack Dan Gorengan", "Tambahan",
+            "Minuman Dingin", "Minuman Hangat")
+VARIANTS = ("Level Pedas", "Topping", "Ukuran", "Tambahan Nasi", "Gula")
+
+
+# ── Generator ──────────────────────────────────────────────────────
+
+def _uid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _outlet_name(rng: random.Random) -> str:
+    name = f"{rng.choice(PREFIXES)} {rng.choice(DISHES)} {rng.choice(OWNERS)}"
+    if rng.random() < 0.5:
+        name += f", {rng.choice(STREETS)}"
+    return name
+
+
+def raw_outlet(rng: random.Random, service_area: str | None = None) -> dict:
+    """Satu objek outlet mentah seperti di feed near-me (field non-pipeline ikut, supaya walk realistis)."""
+    area, lat, lon = next((a for a in SERVICE_AREAS if a[0] == service_area), None) or rng.choice(SERVICE_AREAS)
+    uid = _uid(rng)
+    name = _outlet_name(rng)
+    return {
+        "key": f"tenants/gofood/outlets/{uid}",
+        "uid": uid,
+        "path": f"/{area}/restaurant/{_slugify(name)}-{uid}",
+        "core": {
+            "key": f"tenants/gofood/outlets/{uid}",
+            "uid": uid,
+            "displayName": name,
+            "status": rng.choice((1, 1, 1, 2)),
+            "location": {"latitude": round(lat + rng.uniform(-0.15, 0.15), 7),
+                         "longitude": round(lon + rng.uniform(-0.15, 0.15), 7)},
+            "tags": [{"displayName": rng.choice(DISHES), "taxonomy": 2} for _ in range(rng.randint(1, 3))],
+        },
+        "ratings": {"average": round(rng.uniform(4.0, 5.0), 1), "total": rng.randint(0, 5000)},
+        "delivery": {"distanceKm": round(rng.uniform(0.2, 15.0), 2), "enabled": True},
+        "priceLevel": rng.randint(1, 4),
+        "media": {"coverImgUrl": f"https://i.gojekapi.com/darkroom/gofood-indonesia/v2/images/uploads/{uid}.jpg"},
+        "offers": {"items": [{"title": "Diskon s.d. 20rb", "type": "DISCOUNT"}] if rng.random() < 0.3 else []},
+    }
+
+
+def _noise(rng: random.Random) -> dict:
+    """Entri yang lolos `_is_outlet` tapi harus dibuang normalisasi."""
+    if rng.random() < 0.5:
+        return {"uid": f"CUISINE_{rng.choice(DISHES).upper().replace(' ', '_')}",
+                "core": {"displayName": rng.choice(DISHES)}}
+    outlet = raw_outlet(rng)
+    outlet["core"].pop("location")
+    return outlet
+
+
+def iter_feed_pages(
+    n_outlets: int, seed: int = DEFAULT_SEED, page_size: int = DEFAULT_PAGE_SIZE,
+    dup_rate: float = DEFAULT_DUP_RATE, noise_rate: float = DEFAULT_NOISE_RATE,
+    service_area: str | None = None,
+):
+    """Halaman feed near-me berisi `n_outlet` outlet unik (+ duplikat & noise), streaming."""
+    rng = random.Random(seed)
+    recent: list[dict] = []
+    produced = page = 0
+    while produced < n_outlets:
+        batch = []
+        while len(batch) < page_size and produced < n_outlets:
+            roll = rng.random()
+            if recent and roll < dup_rate:
+                batch.append(rng.choice(recent))
+            elif roll < dup_rate + noise_rate:
+                batch.append(_noise(rng))
+            else:
+                outlet = raw_outlet(rng, service_area)
+                batch.append(outlet)
+                recent.append(outlet)
+                if len(recent) > 500:
+                    recent.pop(0)
+                produced += 1
+        page += 1
+        yield {"data": {"outlets": batch}, "page": page, "nextPage": page + 1 if produced < n_outlets else None}
+
+
+def raw_catalog(rng: random.Random, outlet_uid: str, n_items: int) -> list[dict]:
+    """`outlet.catalog.sections` sintetis dengan ~`n_items` item (varian + opsi harga)."""
+    sections = [{"key": "", "uid": "", "outletUid": outlet_uid, "status": 1, "type": 4,
+                 "displayName": "Resto's top picks", "items": [], "categories": []}]
+    names = rng.sample(SECTIONS, k=min(len(SECTIONS), max(1, n_items // 10)))
+    per_section = max(1, n_items // len(names))
+    for section_name in names:
+        items = []
+        for _ in range(rng.randint(max(1, per_section // 2), per_section * 3 // 2 + 1)):
+            item_uid = _uid(rng)
+            variants = [
+                {
+                    "uid": _uid(rng), "outletUid": outlet_uid, "displayName": rng.choice(VARIANTS),
+                    "rules": {"selection": {"type": 2, "maxQuantity": rng.randint(1, 5), "required": False}},
+                    "options": [
+                        {"uid": _uid(rng), "displayName": f"Opsi {k + 1}", "status": 1,
+                         "price": {"currencyCode": "IDR", "units": rng.randrange(0, 10_000, 500), "nanos": 0}}
+                        for k in range(rng.randint(1, 4))
+                    ],
+                }
+                for _ in range(rng.choice((0, 0, 1, 2)))
+            ]
+            items.append({
+                "key": f"tenants/gofood/items/{item_uid}", "tenantUid": "gofood", "uid": item_uid,
+                "outletUid": outlet_uid, "displayName": f"{rng.choice(DISHES)} {rng.choice(('Spesial', 'Biasa', 'Jumbo', ''))}".strip(),
+                "description": rng.choice(("", "Pedas mantap", "Porsi besar, cocok berdua")),
+                "status": rng.choice((1, 1, 1, 2)),
+                "price": {"currencyCode": "IDR", "units": rng.randrange(5_000, 80_000, 100), "nanos": 0},
+                "imageUrl": f"https://i.gojekapi.com/darkroom/gofood-indonesia/v2/images/uploads/{item_uid}.jpg"
+                            if rng.random() < 0.7 else "",
+                "variantUids": [v["uid"] for v in variants],
+                "variants": variants,
+            })
+        sections.append({"key": "", "uid": _uid(rng), "outletUid": outlet_uid, "status": 1, "type": 1,
+                         "displayName": section_name.upper(), "items": items, "categories": []})
+    return sections
+
+
+class ProfileFactory:
+    """__NEXT_DATA__ profil sintetis berbasis template profil nyata (katalog diganti)."""
+
+    def __init__(self, template_path: Path = PROFILE_TEMPLATE):
+        self.template = json.loads(Path(template_path).read_text(encoding="utf-8"))
+
+    def payload(self, rng: random.Random, outlet: dict, items: int = DEFAULT_ITEMS) -> dict:
+        props = self.template["props"]["pageProps"]
+        base = props["outlet"]
+        n_items = max(0, int(rng.gauss(items, items / 3)))
+        page_props = {
+            **props,
+            "outlet": {**base, "uid": outlet["uid"],
+                       "core": {**base["core"], **outlet["core"]},
+                       "catalog": {"sections": raw_catalog(rng, outlet["uid"], n_items) if n_items else []}},
+            "outletUrl": outlet.get("path", ""),
+        }
+        return {**self.template, "props": {**self.template["props"], "pageProps": page_props}}
+
+    def text(self, rng: random.Random, outlet: dict, items: int = DEFAULT_ITEMS) -> str:
+        return json.dumps(self.payload(rng, outlet, items), ensure_ascii=False)
+
+
+def normalize_pages(pages, service_area: str = "") -> dict[str, dict]:
+    """Jalur step 2 tanpa browser: walk rekursif + normalisasi + dedupe per UID."""
+    outlets_by_uid: dict[str, dict] = {}
+    for body in pages:
+        for raw in _extract_outlets_recursive(body):
+            norm = _normalize_outlet(raw, service_area)
+            if norm and norm["uid"] not in outlets_by_uid:
+                outlets_by_uid[norm["uid"]] = norm
+    return outlets_by_uid
+
+
+# ── generate ───────────────────────────────────────────────────────
+
+def generate(args: argparse.Namespace) -> int:
+    out = Path(args.out)
+    json_dir = out / "json"
+    json_dir.mkdir(parents=True, exist_ok=True)
+    for rel in FIXTURE_TEMPLATES:
+        target = out / rel
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(OUTPUT_DIR / rel, target)
+
+    factory = ProfileFactory()
+    rng = random.Random(args.seed + 1)
+    scraped_at = datetime.now(WIB).isoformat()
+    t0 = time.monotonic()
+    remaining, k = args.outlets, 0
+    while remaining > 0:
+        k += 1
+        n = min(args.per_locality, remaining)
+        remaining -= n
+        locality = f"synthetic-{k:03d}-restaurants"
+        pages = iter_feed_pages(n, seed=args.seed + k, page_size=args.page_size, service_area=args.area)
+        # Simpan raw terakhir per UID supaya katalog memakai core yang sama
+        raws: dict[str, dict] = {}
+        outlets_by_uid: dict[str, dict] = {}
+        for body in pages:
+            for raw in _extract_outlets_recursive(body):
+                norm = _normalize_outlet(raw, args.area)
+                if norm and norm["uid"] not in outlets_by_uid:
+                    outlets_by_uid[norm["uid"]] = norm
+                    raws[norm["uid"]] = raw
+        outlets = sorted(outlets_by_uid.values(), key=lambda o: o["name"])
+        write_records(json_dir / f"gofood_{locality}_outlets.jsonl", outlets, index_key="uid")
+
+        def menus():
+            for outlet in outlets:
+                record = _parse_menu_text(factory.text(rng, raws[outlet["uid"]], args.items))
+                yield _finalize_menu_record(record, outlet["uid"], outlet["name"], outlet["full_url"], scraped_at)
+
+        write_records(json_dir / f"gofood_{locality}_menus.jsonl", menus(), index_key="restaurant_uid")
+        print(f"  [GEN] {locality}: {len(outlets)} outlet ({time.monotonic() - t0:.1f}s)")
+
+    print(f"[INFO] {args.outlets} outlet sintetis di {k} locality → {out}")
+    print(f"[INFO] Sajikan: python3 fixture_server.py --fixtures-dir {out}")
+    return 0
+
+
+# ── bench ──────────────────────────────────────────────────────────
+
+def _measure(fn, trace: bool):
+    """Jalankan `fn()`; return (hasil, detik, peak_mb | None)."""
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    peak = None
+    if trace:
+        peak = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def bench_size(n: int, args: argparse.Namespace, factory: ProfileFactory, workdir: Path) -> dict:
+    """Ukur tiap tahap untuk `n` outlet. Input dibangkitkan di luar waktu ukur."""
+    pages = list(iter_feed_pages(n, seed=args.seed, page_size=args.page_size))
+    n_menus = max(1, int(n * args.menu_fraction))
+    stages: dict[str, dict] = {}
+
+    outlets_by_uid, secs, peak = _measure(lambda: normalize_pages(pages, "surabaya"), args.trace_memory)
+    stages["normalize"] = {"items": sum(len(p["data"]["outlets"]) for p in pages), "seconds": secs, "peak_mb": peak}
+
+    outlets, secs, peak = _measure(lambda: sorted(outlets_by_uid.values(), key=lambda o: o["name"]),
+                                   args.trace_memory)
+    stages["dedupe_sort"] = {"items": len(outlets), "seconds": secs, "peak_mb": peak}
+
+    # Parse menu: payload dibangkitkan per outlet, hanya json.loads + parse yang diukur
+    rng = random.Random(args.seed + 1)
+    raws = {}
+    for body in pages:
+        for raw in body["data"]["outlets"]:
+            raws.setdefault(raw["uid"], raw)
+    del pages
+    menu_results: list[dict] = []
+    parse_s = 0.0
+    payload_bytes = 0
+    if args.trace_memory:
+        tracemalloc.start()
+    for outlet in outlets[:n_menus]:
+        text = factory.text(rng, raws[outlet["uid"]], args.items)
+        payload_bytes += len(text)
+        t0 = time.perf_counter()
+        record = _parse_menu_text(text)
+        menu_results.append(_finalize_menu_record(record, outlet["uid"], outlet["name"], outlet["full_url"], ""))
+        parse_s += time.perf_counter() - t0
+    peak = None
+    if args.trace_memory:
+        peak = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+        tracemalloc.stop()
+    stages["parse_menu"] = {"items": len(menu_results), "seconds": parse_s, "peak_mb": peak,
+                            "payload_mb": round(payload_bytes / 1e6, 1)}
+    del raws
+
+    rows, secs, peak = _measure(lambda: flatten_to_csv_rows(menu_results), args.trace_memory)
+    stages["flatten"] = {"items": len(rows), "seconds": secs, "peak_mb": peak}
+
+    def write_all():
+        paths = save_outputs(outlets, menu_results, workdir / f"bench_{n}_outlets.json",
+                             workdir / f"bench_{n}_menus.json", workdir / f"bench_{n}_menus.csv",
+                             fmt=args.format, compact=args.compact_json)
+        return sum(p.stat().st_size for p in paths.values())
+
+    written, secs, peak = _measure(write_all, args.trace_memory)
+    stages["write"] = {"items": len(outlets) + len(menu_results), "seconds": secs, "peak_mb": peak,
+                       "output_mb": round(written / 1e6, 1)}
+
+    for stage in stages.values():
+        stage["us_per_item"] = round(stage["seconds"] / max(1, stage["items"]) * 1e6, 2)
+        stage["seconds"] = round(stage["seconds"], 3)
+    return {"outlets": n, "menus": len(menu_results), "csv_rows": len(rows), "stages": stages}
+
+
+def _scaling(results: list[dict]) -> None:
+    """Tambahkan faktor skala antar ukuran berurutan: 1.0 = linear."""
+    for prev, cur in zip(results, results[1:]):
+        for name, stage in cur["stages"].items():
+            before = prev["stages"][name]
+            if before["seconds"] <= 0 or before["items"] <= 0:
+                continue
+            factor = (stage["seconds"] / before["seconds"]) / (stage["items"] / before["items"])
+            stage["scaling"] = round(factor, 2)
+            if before.get("peak_mb") and stage.get("peak_mb"):
+                stage["memory_scaling"] = round(
+                    (stage["peak_mb"] / before["peak_mb"]) / (stage["items"] / before["items"]), 2)
+
+
+def bench(args: argparse.Namespace) -> int:
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    factory = ProfileFactory()
+    results = []
+    with tempfile.TemporaryDirectory(prefix="gofood_bench_") as tmp:
+        for n in sizes:
+            print(f"\n[BENCH] {n} outlet (menu {args.menu_fraction:.0%}, ~{args.items} item/outlet)")
+            results.append(bench_size(n, args, factory, Path(tmp)))
+            for f in Path(tmp).iterdir():
+                f.unlink()
+
+    _scaling(results)
+    print(f"\n{'tahap':12s} {'ukuran':>9s} {'item':>10s} {'detik':>9s} {'µs/item':>9s} {'peak MB':>8s} {'skala':>6s}")
+    for r in results:
+        for name, s in r["stages"].items():
+            factor = s.get("scaling")
+            flag = " ⚠" if factor is not None and factor > NONLINEAR_THRESHOLD else ""
+            print(f"{name:12s} {r['outlets']:9d} {s['items']:10d} {s['seconds']:9.3f} {s['us_per_item']:9.2f} "
+                  f"{s['peak_mb'] if s['peak_mb'] is not None else '-':>8} "
+                  f"{factor if factor is not None else '-':>6}{flag}")
+
+    report = {
+        "generated_at": datetime.now(WIB).isoformat(),
+        "seed": args.seed,
+        "menu_fraction": args.menu_fraction,
+        "items_per_outlet": args.items,
+        "format": args.format,
+        "trace_memory": args.trace_memory,
+        "nonlinear_threshold": NONLINEAR_THRESHOLD,
+        "results": results,
+    }
+    report_path = Path(args.report)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_open_text(report_path) as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n[INFO] Report: {report_path}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generator data sintetis GoFood + benchmark skala.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed RNG (hasil deterministik).")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Outlet per halaman feed.")
+    parser.add_argument("--items", type=int, default=DEFAULT_ITEMS,
+                        help=f"Rata-rata item menu per outlet (default: {DEFAULT_ITEMS}).")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Tulis dataset sintetis ternormalisasi (JSONL) + template fixture.")
+    gen.add_argument("--outlets", type=int, required=True, help="Jumlah outlet unik.")
+    gen.add_argument("--out", default=str(OUTPUT_DIR / "synthetic"),
+                     help="Direktori fixture tujuan (default: output/synthetic).")
+    gen.add_argument("--per-locality", type=int, default=DEFAULT_PER_LOCALITY,
+                     help=f"Outlet per locality sintetis (default: {DEFAULT_PER_LOCALITY}).")
+    gen.add_argument("--area", default="surabaya", help="Service area outlet (default: surabaya).")
+
+    bench_parser = sub.add_parser("bench", help="Benchmark skala tahap offline pipeline.")
+    bench_parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                              help=f"Daftar jumlah outlet, pisah koma (default: {DEFAULT_SIZES}).")
+    bench_parser.add_argument("--menu-fraction", type=float, default=DEFAULT_MENU_FRACTION,
+                              help=f"Fraksi outlet yang katalognya di-parse (default: {DEFAULT_MENU_FRACTION}).")
+    bench_parser.add_argument("--format", choices=("json", "jsonl"), default="json",
+                              help="Format output tahap write (default: json).")
+    bench_parser.add_argument("--compact-json", action="store_true", help="Tulis JSON tanpa indent.")
+    bench_parser.add_argument("--trace-memory", action="store_true",
+                              help="Ukur peak memori per tahap via tracemalloc (waktu jadi lebih lambat).")
+    bench_parser.add_argument("--report", default=str(OUTPUT_DIR / "json" / "synthetic_bench.json"),
+                              help="Path report JSON.")
+
+    args = parser.parse_args()
+    return generate(args) if args.command == "generate" else bench(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+"""
+Warm Start — discovery step 2 di-seed dari snapshot outlet run sebelumnya
+=========================================================================
+`gofood_<locality>_outlets.json` dari run terakhir biasanya sudah berisi
+sebagian besar outlet area. Warm start memuat snapshot itu sebagai seed:
+
+  - seed TIDAK langsung dianggap ditemukan; tiap UID seed yang terlihat lagi
+    di scroll dihitung sebagai "re-observed" (coverage = re-observed / seed)
+  - UID di luar seed dihitung sebagai outlet baru
+  - scroll boleh berhenti lebih awal jika coverage >= `min_coverage` DAN rata-rata
+    outlet baru per scroll di `window` scroll terakhir <= `max_new_rate`
+
+Klasifikasi hasil (field `discovery` tiap outlet + report diff):
+  - new          : tidak ada di seed
+  - present      : ada di seed dan terlihat lagi
+  - unconfirmed  : ada di seed, belum terlihat saat scroll terpotong (early stop
+                   atau batas `max_scrolls`) → tetap dibawa
+  - vanished     : ada di seed, tidak terlihat walau scroll habis (patience) → dibuang
+
+Report: output/json/gofood_<locality>_outlets_diff.json
+"""
+
+import argparse
+import json
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from output_formats import atomic_open_text, iter_records
+from scheduler import find_previous_output
+
+# ── Defaults ────────────────────────────────────────────────────────
+WIB = timezone(timedelta(hours=7))
+DEFAULT_MIN_COVERAGE = 0.9     # fraksi seed yang harus terlihat lagi
+DEFAULT_MAX_NEW_RATE = 0.5     # outlet baru per scroll (rata-rata jendela)
+DEFAULT_WINDOW = 3             # scroll terakhir yang dinilai
+
+STATE_NEW = "new"
+STATE_PRESENT = "present"
+STATE_UNCONFIRMED = "unconfirmed"
+STATE_VANISHED = "vanished"
+
+# Alasan scroll loop step 2 berhenti (`WarmStart.stop_reason`)
+STOP_EARLY = "early_stop"          # coverage seed cukup
+STOP_MAX_SCROLLS = "max_scrolls"   # batas scroll tercapai, outlet mungkin masih mengalir
+STOP_EXHAUSTED = "exhausted"       # `patience` scroll tanpa data baru — daftar habis
+
+
+def load_seed(outlets_path: Path) -> dict[str, dict]:
+    """Muat snapshot outlet sebelumnya (format/kompresi apa pun) → {uid: outlet}."""
+    previous = find_previous_output(outlets_path)
+    if previous is None:
+        return {}
+    return {o["uid"]: o for o in iter_records(previous) if o.get("uid")}
+
+
+class WarmStart:
+    """Lacak coverage seed dan laju outlet baru selama scroll step 2."""
+
+    def __init__(
+        self, seed: dict[str, dict], report_path: Path | None = None,
+        min_coverage: float = DEFAULT_MIN_COVERAGE, max_new_rate: float = DEFAULT_MAX_NEW_RATE,
+        window: int = DEFAULT_WINDOW,
+    ):
+        self.seed = seed
+        self.report_path = report_path
+        self.min_coverage = min_coverage
+        self.max_new_rate = max_new_rate
+        self.recent: deque[int] = deque(maxlen=max(1, window))
+        self.reobserved: set[str] = set()
+        self.new: set[str] = set()
+        self._new_before = 0
+        self.early_stopped = False
+        self.stop_reason: str | None = None
+        self.counts: dict[str, int] = {}
+
+    @property
+    def coverage(self) -> float:
+        return len(self.reobserved) / len(self.seed) if self.seed else 0.0
+
+    def observe(self, uid: str) -> bool:
+        """Catat satu UID yang terlihat. Return True jika UID di luar seed."""
+        if uid in self.seed:
+            self.reobserved.add(uid)
+            return False
+        self.new.add(uid)
+        return True
+
+    def record_scroll(self) -> None:
+        """Dipanggil sekali per scroll, setelah semua respons scroll itu diproses."""
+        self.recent.append(len(self.new) - self._new_before)
+        self._new_before = len(self.new)
+
+    def should_stop(self) -> bool:
+        """True jika coverage seed cukup dan outlet baru sudah jarang."""
+        if not self.seed or self.min_coverage <= 0 or len(self.recent) < self.recent.maxlen:
+            return False
+        new_rate = sum(self.recent) / len(self.recent)
+        if self.coverage >= self.min_coverage and new_rate <= self.max_new_rate:
+            self.early_stopped = True
+            self.stop_reason = STOP_EARLY
+            print(f"  [WARM] Early stop: coverage seed {self.coverage:.0%} "
+                  f"(>= {self.min_coverage:.0%}), outlet baru {new_rate:.1f}/scroll")
+            return True
+        return False
+
+    def record_stop(self, reason: str) -> None:
+        """Catat alasan scroll loop berhenti (early stop sudah dicatat `should_stop`)."""
+        if self.stop_reason is None:
+            self.stop_reason = reason
+
+    @property
+    def truncated(self) -> bool:
+        """True jika scroll berhenti sebelum daftar habis — seed yang belum terlihat belum tentu hilang."""
+        return self.stop_reason != STOP_EXHAUSTED
+
+    def finish(self, outlets_by_uid: dict[str, dict]) -> dict[str, dict]:
+        """Tandai field `discovery`, bawa seed unconfirmed (scroll terpotong), tulis report diff."""
+        missing = [uid for uid in self.seed if uid not in self.reobserved]
+        for uid, outlet in outlets_by_uid.items():
+            outlet["discovery"] = STATE_PRESENT if uid in self.reobserved else STATE_NEW
+        if self.truncated:
+            for uid in missing:
+                outlets_by_uid[uid] = {**self.seed[uid], "discovery": STATE_UNCONFIRMED}
+        vanished_state = STATE_UNCONFIRMED if self.truncated else STATE_VANISHED
+
+        groups: dict[str, list[dict]] = {
+            STATE_NEW: [], STATE_PRESENT: [], STATE_UNCONFIRMED: [], STATE_VANISHED: [],
+        }
+        for outlet in outlets_by_uid.values():
+            groups[outlet["discovery"]].append(outlet)
+        if not self.truncated:
+            groups[STATE_VANISHED] = [self.seed[uid] for uid in missing]
+        self.counts = {state: len(items) for state, items in groups.items()}
+
+        print(f"  [WARM] seed {len(self.seed)} | baru {self.counts[STATE_NEW]} | "
+              f"masih ada {self.counts[STATE_PRESENT]} | {vanished_state} {len(missing)}")
+        if self.report_path is not None:
+            self._write_report(groups)
+        return outlets_by_uid
+
+    def _write_report(self, groups: dict[str, list[dict]]) -> None:
+        report = {
+            "generated_at": datetime.now(WIB).isoformat(),
+            **self.summary(),
+            "outlets": {
+                state: [{"uid": o["uid"], "name": o.get("name"), "full_url": o.get("full_url")} for o in items]
+                for state, items in groups.items()
+            },
+        }
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_open_text(self.report_path) as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"  [WARM] Report diff: {self.report_path}")
+
+    def summary(self) -> dict:
+        return {
+            "seeded": len(self.seed),
+            "reobserved": len(self.reobserved),
+            "coverage": round(self.coverage, 3),
+            "early_stopped": self.early_stopped,
+            "stop_reason": self.stop_reason,
+            "counts": dict(self.counts),
+        }
+
+
+def add_warm_start_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--warm-start", action="store_true",
+                        help="Seed step 2 dari snapshot outlet run sebelumnya (early stop + report diff).")
+    parser.add_argument("--warm-coverage", type=float, default=DEFAULT_MIN_COVERAGE,
+                        help=f"Coverage seed minimal untuk early stop (default: {DEFAULT_MIN_COVERAGE}, "
+                             f"0 = tanpa early stop).")
+    parser.add_argument("--warm-new-rate", type=float, default=DEFAULT_MAX_NEW_RATE,
+                        help=f"Outlet baru per scroll maksimal untuk early stop "
+                             f"(default: {DEFAULT_MAX_NEW_RATE}).")
+
+
+def open_warm_start(args: argparse.Namespace, outlets_path: Path) -> WarmStart | None:
+    """WarmStart untuk output outlet `outlets_path`; None jika nonaktif/tanpa snapshot."""
+    if not getattr(args, "warm_start", False):
+        return None
+    seed = load_seed(outlets_path)
+    if not seed:
+        print(f"  [WARM] Snapshot {outlets_path.name} belum ada — discovery dari nol.")
+        return None
+    print(f"  [WARM] Seed {len(seed)} outlet dari snapshot sebelumnya")
+    return WarmStart(
+        seed, report_path=outlets_path.with_name(f"{outlets_path.stem}_diff.json"),
+        min_coverage=args.warm_coverage, max_new_rate=args.warm_new_rate,
+    )
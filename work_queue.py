@@ -0,0 +1,465 @@
+"""
+Outlet Work Queue — antrian durable (SQLite) untuk step 3
+=========================================================
+Daftar outlet hasil step 2 dimasukkan ke antrian per namespace (locality).
+Runner step 3 mengambil outlet lewat *lease*; hasil (record menu) disimpan
+langsung di antrian begitu selesai. Kalau proses crash di outlet ke-250,
+run berikutnya lanjut persis dari outlet yang belum selesai.
+
+State per outlet:
+  pending → leased → done
+                   ↘ pending (error, attempts < max_attempts)
+                   ↘ failed  (error, attempts habis / error permanen)
+
+Lease yang kadaluarsa (runner mati) otomatis bisa diambil lagi, sampai
+`max_attempts`; setelah itu job `failed` dengan record error `lease_expired`
+supaya outlet tetap muncul di output menu (bukan hilang tanpa jejak). Setelah
+output area tersimpan, job namespace itu dihapus sehingga run berikutnya
+mulai segar.
+
+Usage (inspeksi):
+  python3 work_queue.py status
+  python3 work_queue.py retry-failed --namespace gubeng-restaurants
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import time
+from pathlib import Path
+
+from gofood_core import _error_record
+from retry_engine import ERROR_LEASE
+
+# ── Defaults ────────────────────────────────────────────────────────
+DEFAULT_QUEUE_DB = Path("output/session/gofood_queue.sqlite")
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 3
+
+STATES = ("pending", "leased", "done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    namespace     TEXT NOT NULL,
+    uid           TEXT NOT NULL,
+    position      INTEGER NOT NULL,
+    outlet        TEXT NOT NULL,
+    state         TEXT NOT NULL DEFAULT 'pending',
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    last_error    TEXT,
+    result        TEXT,
+    updated_at    REAL NOT NULL,
+    PRIMARY KEY (namespace, uid)
+);
+CREATE INDEX IF NOT EXISTS jobs_pick ON jobs(namespace, state, attempts, position);
+CREATE TABLE IF NOT EXISTS discovered (
+    namespace  TEXT PRIMARY KEY,
+    outlets    TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def _uid_filter(uids: list[str] | None) -> tuple[str, tuple]:
+    """Potongan WHERE `AND uid IN (...)` via json_each (tanpa batas jumlah parameter SQLite)."""
+    if uids is None:
+        return "", ()
+    return " AND uid IN (SELECT value FROM json_each(?))", (json.dumps(list(uids)),)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class OutletQueue:
+    """Antrian outlet per namespace dengan lease, retry, dan hasil tersimpan."""
+
+    def __init__(
+        self, db_path: Path = DEFAULT_QUEUE_DB,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        worker_id: str | None = None,
+    ):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = worker_id or default_worker_id()
+        # isolation_level=None → autocommit; transaksi eksplisit via BEGIN IMMEDIATE
+        self._db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._reclaim_dead_local_leases()
+
+    def _reclaim_dead_local_leases(self) -> None:
+        """Lease milik proses di host ini yang sudah mati langsung dikembalikan ke pending.
+
+        Tanpa ini, restart setelah crash harus menunggu lease kadaluarsa dulu.
+        """
+        host = socket.gethostname()
+        owners = [r[0] for r in self._db.execute(
+            "SELECT DISTINCT lease_owner FROM jobs WHERE state = 'leased' AND lease_owner LIKE ?",
+            (f"{host}:%",),
+        )]
+        for owner in owners:
+            try:
+                pid = int(owner.rsplit(":", 1)[1])
+                os.kill(pid, 0)
+                continue  # proses masih hidup
+            except ProcessLookupError:
+                pass
+            except (ValueError, PermissionError):
+                continue
+            # Outlet yang membuat runner crash tiap attempt tidak boleh diulang selamanya
+            self.release(owner, error="runner mati (lease direklaim)")
+
+    def _fail_exhausted(self, where: str, params: tuple, error: str) -> int:
+        """Job leased yang cocok `where` dan attempts-nya habis → failed + record error.
+
+        Record ditulis ke `result` supaya `results()` tetap mengembalikan outlet
+        itu (status error) dan hitungan success/error output benar.
+        """
+        now = time.time()
+        rows = self._db.execute(
+            "SELECT namespace, uid, outlet FROM jobs WHERE state = 'leased' AND attempts >= ? AND " + where,
+            (self.max_attempts, *params),
+        ).fetchall()
+        for namespace, uid, outlet_json in rows:
+            outlet = json.loads(outlet_json)
+            record = _error_record(uid, outlet.get("name", ""), outlet.get("full_url", ""), error, ERROR_LEASE)
+            self._db.execute(
+                "UPDATE jobs SET state = 'failed', last_error = ?, result = ?, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE namespace = ? AND uid = ?",
+                (error, json.dumps(record, ensure_ascii=False), now, namespace, uid),
+            )
+        return len(rows)
+
+    # ── Producer ───────────────────────────────────────────────────
+
+    def enqueue(self, namespace: str, outlets: list[dict]) -> int:
+        """Masukkan outlet (by uid) ke antrian. Outlet yang sudah ada tidak diubah.
+
+        Return jumlah outlet baru.
+        """
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            added = self._insert_jobs(namespace, outlets)
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return added
+
+    def _insert_jobs(self, namespace: str, outlets: list[dict]) -> int:
+        """INSERT job baru di akhir antrian namespace (caller memegang transaksi)."""
+        now = time.time()
+        start = self._db.execute(
+            "SELECT COALESCE(MAX(position) + 1, 0) FROM jobs WHERE namespace = ?",
+            (namespace,),
+        ).fetchone()[0]
+        added = 0
+        for outlet in outlets:
+            uid = outlet.get("uid")
+            if not uid:
+                continue
+            cur = self._db.execute(
+                "INSERT OR IGNORE INTO jobs(namespace, uid, position, outlet, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (namespace, uid, start + added, json.dumps(outlet, ensure_ascii=False), now),
+            )
+            added += cur.rowcount
+        return added
+
+    def set_discovered(self, namespace: str, outlets: list[dict]) -> None:
+        """Simpan daftar outlet lengkap hasil step 2 (antrian hanya berisi target step 3).
+
+        Dipakai saat resume supaya snapshot outlet area tidak menyusut jadi
+        daftar target `--limit`.
+        """
+        self._db.execute(
+            "INSERT OR REPLACE INTO discovered(namespace, outlets, updated_at) VALUES (?, ?, ?)",
+            (namespace, json.dumps(outlets, ensure_ascii=False), time.time()),
+        )
+
+    def discovered(self, namespace: str) -> list[dict] | None:
+        """Daftar outlet lengkap dari `set_discovered`, None jika belum ada."""
+        row = self._db.execute(
+            "SELECT outlets FROM discovered WHERE namespace = ?", (namespace,),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # ── Consumer ───────────────────────────────────────────────────
+
+    def lease(
+        self, namespace: str, owner: str | None = None, uids: list[str] | None = None,
+    ) -> dict | None:
+        """Klaim satu outlet (pending atau lease kadaluarsa). None jika antrian habis.
+
+        Outlet yang sudah pernah gagal diambil belakangan (urut attempts, lalu posisi).
+        `owner` dipakai coordinator untuk lease atas nama worker remote.
+        `uids` membatasi lease ke outlet target run ini (job lain di namespace,
+        mis. sisa run sebelumnya dengan `--limit` lebih besar, tidak disentuh).
+        """
+        owner = owner or self.worker_id
+        uid_sql, uid_params = _uid_filter(uids)
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            # Lease kadaluarsa yang jatah attempt-nya sudah habis → failed
+            self._fail_exhausted("namespace = ? AND lease_expires < ?", (namespace, now), "lease expired")
+            row = self._db.execute(
+                "SELECT uid, outlet FROM jobs WHERE namespace = ? AND "
+                "(state = 'pending' OR (state = 'leased' AND lease_expires < ?))" + uid_sql +
+                " ORDER BY attempts, position LIMIT 1",
+                (namespace, now, *uid_params),
+            ).fetchone()
+            if row is None:
+                self._db.execute("COMMIT")
+                return None
+            self._db.execute(
+                "UPDATE jobs SET state = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE namespace = ? AND uid = ?",
+                (owner, now + self.lease_seconds, now, namespace, row[0]),
+            )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return json.loads(row[1])
+
+    def complete(self, namespace: str, uid: str, record: dict, owner: str | None = None) -> bool:
+        """Tandai selesai. Hanya berlaku jika job masih di-lease `owner` (default: worker ini).
+
+        Return False jika lease sudah pindah tangan (kadaluarsa lalu di-lease
+        ulang, atau di-release coordinator) — hasil pemilik baru tidak ditimpa.
+        """
+        return self._db.execute(
+            "UPDATE jobs SET state = 'done', result = ?, last_error = NULL, lease_owner = NULL, "
+            "lease_expires = NULL, updated_at = ? "
+            "WHERE namespace = ? AND uid = ? AND state = 'leased' AND lease_owner = ?",
+            (json.dumps(record, ensure_ascii=False), time.time(), namespace, uid,
+             owner or self.worker_id),
+        ).rowcount > 0
+
+    def complete_and_enqueue(
+        self, namespace: str, uid: str, record: dict,
+        jobs_namespace: str, outlets: list[dict], owner: str | None = None,
+    ) -> int | None:
+        """`complete()` + `enqueue(jobs_namespace, outlets)` dalam satu transaksi.
+
+        Dipakai coordinator: area job selesai dan outlet job-nya masuk antrian
+        bersamaan, jadi crash di antaranya tidak meninggalkan area "done" tanpa
+        job. Return jumlah job baru, None jika lease bukan milik `owner`.
+        """
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            if not self.complete(namespace, uid, record, owner):
+                self._db.execute("ROLLBACK")
+                return None
+            added = self._insert_jobs(jobs_namespace, outlets)
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return added
+
+    def fail(
+        self, namespace: str, uid: str, error: str,
+        record: dict | None = None, permanent: bool = False, owner: str | None = None,
+    ) -> str | None:
+        """Tandai gagal. Kembali ke pending selama attempts < max_attempts.
+
+        Return state baru, atau None jika job tidak lagi di-lease `owner`
+        (lihat `complete`).
+        """
+        owner = owner or self.worker_id
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute(
+                "SELECT attempts FROM jobs WHERE namespace = ? AND uid = ? "
+                "AND state = 'leased' AND lease_owner = ?",
+                (namespace, uid, owner),
+            ).fetchone()
+            if row is None:
+                self._db.execute("COMMIT")
+                return None
+            state = "failed" if permanent or row[0] >= self.max_attempts else "pending"
+            self._db.execute(
+                "UPDATE jobs SET state = ?, last_error = ?, result = ?, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE namespace = ? AND uid = ?",
+                (state, error, json.dumps(record, ensure_ascii=False) if record else None,
+                 time.time(), namespace, uid),
+            )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return state
+
+    def settle(
+        self, namespace: str, uid: str, record: dict,
+        permanent: bool = False, owner: str | None = None,
+    ) -> str | None:
+        """Simpan hasil step 3: record error → fail(), selain itu → complete().
+
+        Return state baru, None jika lease sudah bukan milik `owner` (hasil dibuang).
+        """
+        if record.get("status") == "error":
+            return self.fail(namespace, uid, record.get("error", ""), record, permanent, owner)
+        return "done" if self.complete(namespace, uid, record, owner) else None
+
+    def update_result(self, namespace: str, uid: str, record: dict) -> None:
+        """Ganti record hasil job tanpa mengubah state/lease (bookkeeping coordinator)."""
+        self._db.execute(
+            "UPDATE jobs SET result = ?, updated_at = ? WHERE namespace = ? AND uid = ?",
+            (json.dumps(record, ensure_ascii=False), time.time(), namespace, uid),
+        )
+
+    def extend_lease(self, namespace: str, uid: str) -> None:
+        self._db.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE namespace = ? AND uid = ? AND lease_owner = ?",
+            (time.time() + self.lease_seconds, namespace, uid, self.worker_id),
+        )
+
+    def touch(self, owner: str) -> int:
+        """Perpanjang semua lease milik `owner` (heartbeat). Return jumlah lease."""
+        return self._db.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE state = 'leased' AND lease_owner = ?",
+            (time.time() + self.lease_seconds, owner),
+        ).rowcount
+
+    def release(self, owner: str, error: str = "lease expired") -> int:
+        """Kembalikan semua lease milik `owner` ke pending (worker dianggap mati).
+
+        Job yang attempts-nya sudah habis jadi failed (record error `lease_expired`).
+        Return jumlah lease yang dilepas.
+        """
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            failed = self._fail_exhausted("lease_owner = ?", (owner,), error)
+            requeued = self._db.execute(
+                "UPDATE jobs SET state = 'pending', lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE state = 'leased' AND lease_owner = ?",
+                (time.time(), owner),
+            ).rowcount
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return failed + requeued
+
+    def result(self, namespace: str, uid: str) -> dict | None:
+        """Record hasil satu job (None jika belum ada)."""
+        row = self._db.execute(
+            "SELECT result FROM jobs WHERE namespace = ? AND uid = ?", (namespace, uid),
+        ).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    # ── Inspeksi ───────────────────────────────────────────────────
+
+    def counts(self, namespace: str | None = None, uids: list[str] | None = None) -> dict[str, int]:
+        sql = "SELECT state, COUNT(*) FROM jobs WHERE 1=1"
+        params: tuple = ()
+        if namespace is not None:
+            sql += " AND namespace = ?"
+            params = (namespace,)
+        uid_sql, uid_params = _uid_filter(uids)
+        sql += uid_sql
+        params += uid_params
+        counts = {s: 0 for s in STATES}
+        counts.update(dict(self._db.execute(sql + " GROUP BY state", params)))
+        return counts
+
+    def has_open(self, namespace: str, uids: list[str] | None = None) -> bool:
+        """True jika masih ada outlet pending/leased di namespace (opsional: hanya `uids`)."""
+        c = self.counts(namespace, uids)
+        return c["pending"] + c["leased"] > 0
+
+    def outlets(self, namespace: str) -> list[dict]:
+        """Semua outlet di antrian (urut posisi enqueue)."""
+        return [json.loads(r[0]) for r in self._db.execute(
+            "SELECT outlet FROM jobs WHERE namespace = ? ORDER BY position", (namespace,),
+        )]
+
+    def results(self, namespace: str, uids: list[str] | None = None) -> list[dict]:
+        """Record hasil (done + failed) urut posisi, opsional dibatasi ke uid tertentu."""
+        rows = self._db.execute(
+            "SELECT uid, result FROM jobs WHERE namespace = ? AND result IS NOT NULL "
+            "AND state IN ('done', 'failed') ORDER BY position",
+            (namespace,),
+        ).fetchall()
+        wanted = set(uids) if uids is not None else None
+        return [json.loads(r) for uid, r in rows if wanted is None or uid in wanted]
+
+    def namespaces(self) -> list[str]:
+        return [r[0] for r in self._db.execute(
+            "SELECT DISTINCT namespace FROM jobs ORDER BY namespace"
+        )]
+
+    def retry_failed(self, namespace: str) -> int:
+        """Kembalikan outlet failed ke pending dengan attempts di-reset."""
+        cur = self._db.execute(
+            "UPDATE jobs SET state = 'pending', attempts = 0, updated_at = ? "
+            "WHERE namespace = ? AND state = 'failed'",
+            (time.time(), namespace),
+        )
+        return cur.rowcount
+
+    def clear(self, namespace: str) -> int:
+        """Hapus semua job namespace (dipanggil setelah output area tersimpan)."""
+        self._db.execute("DELETE FROM discovered WHERE namespace = ?", (namespace,))
+        return self._db.execute("DELETE FROM jobs WHERE namespace = ?", (namespace,)).rowcount
+
+    def reopen(self) -> "OutletQueue":
+        """Koneksi baru ke DB yang sama dengan owner lease yang sama, untuk thread lain.
+
+        Koneksi sqlite3 hanya boleh dipakai thread yang membukanya.
+        """
+        return OutletQueue(self.db_path, self.lease_seconds, self.max_attempts, self.worker_id)
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def iter_leases(queue: OutletQueue, namespace: str, uids: list[str] | None = None):
+    """Yield outlet hasil lease satu per satu sampai antrian namespace (atau `uids`) habis."""
+    while True:
+        outlet = queue.lease(namespace, uids=uids)
+        if outlet is None:
+            return
+        yield outlet
+
+
+# ── CLI ────────────────────────────────────────────────────────────
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Inspeksi antrian outlet step 3.")
+    parser.add_argument("--db", default=str(DEFAULT_QUEUE_DB),
+                        help=f"Path database antrian (default: {DEFAULT_QUEUE_DB}).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="Jumlah outlet per state per namespace.")
+    p_retry = sub.add_parser("retry-failed", help="Kembalikan outlet failed ke pending.")
+    p_retry.add_argument("--namespace", required=True)
+    args = parser.parse_args()
+
+    queue = OutletQueue(Path(args.db))
+    if args.command == "retry-failed":
+        n = queue.retry_failed(args.namespace)
+        print(f"[DONE] {n} outlet dikembalikan ke pending ({args.namespace}).")
+    else:
+        namespaces = queue.namespaces()
+        if not namespaces:
+            print("[INFO] Antrian kosong.")
+        for ns in namespaces:
+            c = queue.counts(ns)
+            print(f"  {ns:30s} " + "  ".join(f"{s}={c[s]:4d}" for s in STATES))
+    queue.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())